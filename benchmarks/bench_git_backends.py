@@ -0,0 +1,82 @@
+"""Compare the cost of Git operations across Git backends.
+
+Copier runs the same few Git operations over and over when updating many
+projects. This benchmark clones the test bundle once, then times each
+operation with every available backend, and counts the `git` processes they
+spawn. Backends whose dependencies are missing are reported and skipped.
+
+Usage:
+
+```sh
+python benchmarks/bench_git_backends.py [--repeat 50]
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Callable
+
+from copier.errors import UserMessageError
+from copier.vcs import GIT_BACKENDS, GitBackend, count_git_processes, get_git
+
+BUNDLE = Path(__file__).parent.parent / "tests" / "demo_updatediff_repo.bundle"
+
+
+def operations(backend: GitBackend, repo: Path) -> dict[str, Callable[[], object]]:
+    """Get the operations to time, by name."""
+    return {
+        "tags": lambda: backend.tags(repo),
+        "describe": lambda: backend.describe(repo),
+        "rev-parse": lambda: backend.rev_parse(repo),
+        "write-tree": lambda: backend.write_tree(repo),
+        "diff-tree": lambda: backend.diff_tree(repo, "v0.0.1", "HEAD", "--unified=1"),
+        "status": lambda: backend.status(repo),
+    }
+
+
+def bench(operation: Callable[[], object], repeat: int) -> tuple[float, float]:
+    """Run an operation `repeat` times.
+
+    Returns:
+        Average time and processes spawned per run.
+    """
+    with count_git_processes() as processes:
+        start = perf_counter()
+        for _ in range(repeat):
+            operation()
+        elapsed = perf_counter() - start
+    return elapsed / repeat, sum(processes.values()) / repeat
+
+
+def main() -> None:
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    with TemporaryDirectory() as tmp:
+        repo = Path(tmp, "repo")
+        get_git()("clone", "--quiet", BUNDLE, repo)
+        for name, backend_class in GIT_BACKENDS.items():
+            try:
+                backend = backend_class()
+            except UserMessageError:
+                print(f"{name}: unavailable")
+                continue
+            print(f"{name}:")
+            for operation, run in operations(backend, repo).items():
+                elapsed, processes = bench(run, args.repeat)
+                print(
+                    f"  {operation:<12}{elapsed * 1e3:8.2f}ms{processes:6.1f} processes"
+                )
+            clone_location = Path(tmp, f"clone-{name}")
+            start = perf_counter()
+            backend.clone(str(BUNDLE), clone_location, "--no-checkout")
+            print(f"  {'clone':<12}{(perf_counter() - start) * 1e3:8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
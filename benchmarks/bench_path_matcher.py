@@ -0,0 +1,57 @@
+"""Compare matching paths with PathSpec and with Copier's own matcher.
+
+Updates exclude every file that was deleted from the project with a literal
+pattern, so this benchmark matches many paths against a few wildcard patterns
+and many literal ones.
+
+Usage:
+
+```sh
+python benchmarks/bench_path_matcher.py [--files 10000] [--deleted 1000]
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+from time import perf_counter
+from typing import Callable
+
+from pathspec import PathSpec
+
+from copier.template import DEFAULT_EXCLUDE
+from copier.tools import PathMatcher, escape_git_path
+
+
+def bench(match: Callable[[str], bool], paths: list[str]) -> float:
+    """Match all paths, and return how long it took."""
+    start = perf_counter()
+    for path in paths:
+        match(path)
+    return perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=10_000)
+    parser.add_argument("--deleted", type=int, default=1000)
+    args = parser.parse_args()
+    paths = [
+        f"pkg{index % 100}/mod{index % 7}/file{index}.py" for index in range(args.files)
+    ]
+    patterns = [
+        *DEFAULT_EXCLUDE,
+        *(escape_git_path(path) for path in paths[: args.deleted]),
+    ]
+    pathspec = bench(PathSpec.from_lines("gitwildmatch", patterns).match_file, paths)
+    matcher = bench(PathMatcher(patterns).match_file, paths)
+    print(f"files:       {args.files}")
+    print(f"patterns:    {len(patterns)}")
+    print(f"PathSpec:    {pathspec:.2f}s")
+    print(f"PathMatcher: {matcher:.2f}s")
+    print(f"speedup:     {pathspec / matcher:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
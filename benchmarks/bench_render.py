@@ -0,0 +1,62 @@
+"""Compare sequential and parallel rendering of a big template.
+
+Usage:
+
+```sh
+python benchmarks/bench_render.py [--files 10000] [--jobs 8]
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from copier import run_copy
+
+
+def build_template(root: Path, files: int) -> None:
+    """Build a synthetic template with templated and vendored files."""
+    (root / "copier.yml").write_text("project_name: demo\n")
+    for index in range(files):
+        folder = root / f"pkg{index % 100}" / f"mod{index % 7}"
+        folder.mkdir(parents=True, exist_ok=True)
+        if index % 2:
+            (folder / f"file{index}.py.jinja").write_text(
+                "# {{ project_name }}\n"
+                "{% for i in range(20) %}VALUE_{{ i }} = '{{ project_name }}'\n"
+                "{% endfor %}"
+            )
+        else:
+            (folder / f"asset{index}.bin").write_bytes(os.urandom(1024))
+
+
+def bench(template: Path, jobs: int) -> float:
+    """Copy the template once, and return how long it took."""
+    with TemporaryDirectory() as dst:
+        start = perf_counter()
+        run_copy(str(template), dst, defaults=True, quiet=True, render_jobs=jobs)
+        return perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=10_000)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    with TemporaryDirectory() as template:
+        build_template(Path(template), args.files)
+        sequential = bench(Path(template), 1)
+        parallel = bench(Path(template), args.jobs)
+    print(f"files:      {args.files}")
+    print(f"sequential: {sequential:.2f}s")
+    print(f"parallel:   {parallel:.2f}s ({args.jobs} jobs)")
+    print(f"speedup:    {sequential / parallel:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
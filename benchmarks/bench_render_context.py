@@ -0,0 +1,66 @@
+"""Measure the per-file cost of rendering a template with many answers.
+
+The render context used to be rebuilt for every rendered file and string, so
+its cost grew with the number of answers. Now, a snapshot is reused until
+answers change. Run this benchmark on both revisions to compare them.
+
+The per-file cost is the time difference between copying the template with
+many templated files and with only one, divided by the extra files, so the
+fixed cost of loading the template and asking questions is left out.
+
+Usage:
+
+```sh
+python benchmarks/bench_render_context.py [--answers 200] [--files 2000]
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import yaml
+
+from copier import run_copy
+
+
+def build_template(root: Path, answers: int, files: int) -> None:
+    """Build a template with many questions and templated files."""
+    questions = {
+        f"question_{index}": {"type": "str", "default": "x" * 100}
+        for index in range(answers)
+    }
+    (root / "copier.yml").write_text(yaml.safe_dump(questions))
+    for index in range(files):
+        (root / f"file{index}.txt.jinja").write_text("{{ question_0 }}\n")
+
+
+def bench(answers: int, files: int) -> float:
+    """Copy a template with `files` templated files, and return how long it took."""
+    with TemporaryDirectory() as src, TemporaryDirectory() as dst:
+        build_template(Path(src), answers, files)
+        start = perf_counter()
+        run_copy(src, dst, defaults=True, quiet=True)
+        return perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--answers", type=int, default=200)
+    parser.add_argument("--files", type=int, default=2000)
+    args = parser.parse_args()
+    baseline = bench(args.answers, 1)
+    total = bench(args.answers, args.files)
+    per_file = (total - baseline) / (args.files - 1)
+    print(f"answers:      {args.answers}")
+    print(f"files:        {args.files}")
+    print(f"total:        {total:.2f}s")
+    print(f"per file:     {per_file * 1e6:.1f}µs")
+
+
+if __name__ == "__main__":
+    main()
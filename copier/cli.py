@@ -1,6 +1,6 @@
 """Command line entrypoint. This module declares the Copier CLI applications.
 
-Basically, there are 3 different commands you can run:
+Basically, there are 4 different commands you can run:
 
 -   [`copier`][copier.cli.CopierApp], the main app, which is a shortcut for the
     `copy` and `update` subapps.
@@ -39,6 +39,15 @@ Basically, there are 3 different commands you can run:
         copier update
         ```
 
+-   [`copier update-many`][copier.cli.CopierUpdateManySubApp] to update several
+    preexisting projects at once, in parallel.
+
+    !!! example
+
+        ```sh
+        copier update-many projects/*
+        ```
+
 Below are the docs of each one of those.
 
 CLI help generated from `copier --help-all`:
@@ -58,7 +67,7 @@ import yaml
 from plumbum import cli, colors
 
 from .errors import UnsafeTemplateError, UserMessageError
-from .main import Worker
+from .main import Worker, run_update_many
 from .tools import copier_version
 from .types import AnyByStrDict
 
@@ -159,6 +168,16 @@ class _Subcommand(cli.Application):  # type: ignore[misc]
         default=False,
         help="Skip template tasks execution",
     )
+    render_jobs = cli.SwitchAttr(
+        ["--render-jobs"],
+        cli.Range(1, 1024),
+        default=1,
+        help="Threads used to render files in parallel",
+    )
+    incremental = cli.Flag(
+        ["--incremental"],
+        help="Keep a manifest of rendered files, and update only those that changed",
+    )
 
     @cli.switch(  # type: ignore[misc]
         ["-d", "--data"],
@@ -211,21 +230,29 @@ class _Subcommand(cli.Application):  # type: ignore[misc]
             **kwargs: Arguments passed to [Worker][copier.main.Worker].
         """
         return Worker(
-            data=self.data,
-            dst_path=Path(dst_path),
-            answers_file=self.answers_file,
-            exclude=self.exclude,
-            pretend=self.pretend,
-            skip_if_exists=self.skip,
-            quiet=self.quiet,
             src_path=src_path,
-            vcs_ref=self.vcs_ref,
-            use_prereleases=self.prereleases,
-            unsafe=self.unsafe,
-            skip_tasks=self.skip_tasks,
+            dst_path=Path(dst_path),
+            **self._worker_kwargs(),
             **kwargs,
         )
 
+    def _worker_kwargs(self) -> AnyByStrDict:
+        """Get [Worker][copier.main.Worker] arguments from CLI switches."""
+        return {
+            "data": self.data,
+            "answers_file": self.answers_file,
+            "exclude": self.exclude,
+            "pretend": self.pretend,
+            "skip_if_exists": self.skip,
+            "quiet": self.quiet,
+            "vcs_ref": self.vcs_ref,
+            "use_prereleases": self.prereleases,
+            "unsafe": self.unsafe,
+            "skip_tasks": self.skip_tasks,
+            "render_jobs": self.render_jobs,
+            "incremental": self.incremental,
+        }
+
 
 @CopierApp.subcommand("copy")
 class CopierCopySubApp(_Subcommand):
@@ -423,3 +450,66 @@ class CopierUpdateSubApp(_Subcommand):
                 worker.run_update()
 
         return _handle_exceptions(inner)
+
+
+@CopierApp.subcommand("update-many")
+class CopierUpdateManySubApp(_Subcommand):
+    """The `copier update-many` subcommand.
+
+    Use this subcommand to update several existing subprojects at once, each one
+    from its original template, like `copier update` does.
+    """
+
+    DESCRIPTION = "Update several subprojects from their original templates"
+    DESCRIPTION_MORE = dedent(
+        """\
+        Each template version is cloned and parsed only once, no matter how many
+        subprojects use it, and subprojects are updated in parallel.
+
+        Questions are never asked: new questions get their default answers.
+        A failure in one subproject does not stop the others; a report is
+        printed at the end.
+        """
+    )
+
+    conflict = CopierUpdateSubApp.conflict
+    context_lines = CopierUpdateSubApp.context_lines
+    skip_answered = CopierUpdateSubApp.skip_answered
+    jobs = cli.SwitchAttr(
+        ["-j", "--jobs"],
+        cli.Range(1, 1024),
+        default=None,
+        help="Subprojects to update in parallel. Defaults to the number of CPUs.",
+    )
+
+    def main(self, *destination_paths: cli.ExistingDirectory) -> int:
+        """Call [run_update_many][copier.main.run_update_many].
+
+        Parameters:
+            destination_paths:
+                The subprojects to update. If none is specified, the currently
+                working directory is used.
+        """
+
+        def inner() -> None:
+            results = run_update_many(
+                destination_paths or ["."],
+                jobs=self.jobs,
+                conflict=self.conflict,
+                context_lines=self.context_lines,
+                skip_answered=self.skip_answered,
+                **self._worker_kwargs(),
+            )
+            for result in results:
+                if result.ok:
+                    versions = f"{result.old_version} -> {result.new_version}"
+                    print(colors.green | f"{result.dst_path}: {versions}")
+                else:
+                    print(colors.red | f"{result.dst_path}: {result.error}")
+            failed = sum(not result.ok for result in results)
+            if failed:
+                raise UserMessageError(
+                    f"{failed} of {len(results)} subprojects could not be updated"
+                )
+
+        return _handle_exceptions(inner)
@@ -131,3 +131,7 @@ class DirtyLocalWarning(UserWarning, CopierWarning):
 
 class ShallowCloneWarning(UserWarning, CopierWarning):
     """The template repository is a shallow clone."""
+
+
+class CloneCacheWarning(UserWarning, CopierWarning):
+    """The persistent clone cache could not be refreshed."""
@@ -0,0 +1,292 @@
+"""Jinja environment used to render templates."""
+
+from __future__ import annotations
+
+import os
+import time
+from contextlib import suppress
+from functools import lru_cache
+from hashlib import sha256
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Callable, MutableMapping
+
+from jinja2 import (
+    Environment,
+    FileSystemLoader,
+    Template,
+    TemplateNotFound,
+    __version__ as jinja_version,
+    meta,
+    nodes,
+)
+from jinja2.bccache import Bucket, FileSystemBytecodeCache
+from jinja2.sandbox import SandboxedEnvironment
+
+if TYPE_CHECKING:  # always false
+    from functools import _CacheInfo
+
+DEFAULT_STRING_CACHE_SIZE = 4096
+
+
+class CachedSandboxedEnvironment(SandboxedEnvironment):
+    """Sandboxed Jinja environment that reuses compiled string templates.
+
+    Copier renders the same short strings over and over: path segments, task
+    commands, messages, skip patterns and question settings. Instead of
+    compiling them each time, [from_string][copier.jinja.CachedSandboxedEnvironment.from_string]
+    keeps the most recently used ones in a bounded LRU cache, keyed by source.
+
+    Since the cache belongs to the environment, it is shared by everything that
+    renders with it: workers and questions.
+
+    Strings without template syntax don't need Jinja at all. Callers check
+    them with [is_literal][copier.jinja.CachedSandboxedEnvironment.is_literal]
+    and use them as they are.
+
+    Attributes:
+        string_cache_size:
+            Maximum amount of compiled string templates to keep.
+        literal_renders:
+            Amount of renders skipped so far, because the source string was
+            literal.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        string_cache_size: int = DEFAULT_STRING_CACHE_SIZE,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.string_cache_size = string_cache_size
+        self._compile_string_cached = lru_cache(maxsize=string_cache_size)(
+            self._compile_string
+        )
+        self._dependencies: dict[str, tuple[frozenset[str], frozenset[str]] | None] = {}
+        self.literal_renders = 0
+        self._literal_renders_lock = Lock()
+
+    def _compile_string(self, source: str) -> Template:
+        return super().from_string(source)
+
+    def from_string(
+        self,
+        source: str | nodes.Template,
+        globals: MutableMapping[str, Any] | None = None,
+        template_class: type[Template] | None = None,
+    ) -> Template:
+        """Load a template from a source string, reusing it if possible.
+
+        Only plain strings, without extra globals or template class, are cached.
+        Anything else is compiled as usual.
+        """
+        if isinstance(source, str) and globals is None and template_class is None:
+            return self._compile_string_cached(source)
+        return super().from_string(source, globals, template_class)
+
+    def is_literal(self, source: str) -> bool:
+        """Tell if a source string renders to itself, without parsing it.
+
+        That happens when it contains none of the delimiters configured for
+        this environment, and no newlines that rendering would change. Callers
+        use literals as they are, so each one found counts as a skipped render.
+
+        Args:
+            source: The template source string.
+        """
+        markers = (
+            self.block_start_string,
+            self.variable_start_string,
+            self.comment_start_string,
+            self.line_statement_prefix,
+            self.line_comment_prefix,
+            "\r",
+        )
+        if any(marker and marker in source for marker in markers):
+            return False
+        if "\n" in source and (
+            self.newline_sequence != "\n"
+            or (source.endswith("\n") and not self.keep_trailing_newline)
+        ):
+            return False
+        with self._literal_renders_lock:
+            self.literal_renders += 1
+        return True
+
+    def string_cache_info(self) -> _CacheInfo:
+        """Get hits, misses, maximum and current size of the string templates cache."""
+        return self._compile_string_cached.cache_info()
+
+    def string_cache_clear(self) -> None:
+        """Forget all cached string templates, and reset their statistics."""
+        self._compile_string_cached.cache_clear()
+
+    def template_dependencies(
+        self, name: str
+    ) -> tuple[frozenset[str], frozenset[str]] | None:
+        """Find what a template file may read when rendered, without rendering it.
+
+        Its source is parsed, as well as the sources of templates it extends,
+        includes or imports, recursively. Results are cached.
+
+        Args:
+            name: Name of the template file.
+
+        Returns:
+            Names of all template files involved, including itself, and names
+            of all context variables they may reference. `None` when that
+            cannot be known, because some template names are dynamic.
+        """
+        with suppress(KeyError):
+            return self._dependencies[name]
+        assert self.loader
+        templates: set[str] = set()
+        variables: set[str] = set()
+        result: tuple[frozenset[str], frozenset[str]] | None = None
+        pending = [name]
+        while pending:
+            current = pending.pop()
+            if current in templates:
+                continue
+            templates.add(current)
+            source, _, _ = self.loader.get_source(self, current)
+            ast = self.parse(source, current)
+            variables.update(meta.find_undeclared_variables(ast))
+            references = list(meta.find_referenced_templates(ast))
+            if None in references:
+                break
+            pending.extend(filter(None, references))
+        else:
+            result = frozenset(templates), frozenset(variables)
+        self._dependencies[name] = result
+        return result
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """Persistent cache of compiled template files, shared between runs.
+
+    Jinja's own cache keys depend on the absolute path of each template file,
+    which changes every time a template is cloned. Instead, this cache keys
+    compiled files by their name, their source checksum and a namespace that
+    identifies the template version and the environment settings. This way,
+    any later run rendering the same template version skips compilation.
+
+    Cache files are written atomically, so it is safe to share it between
+    several processes.
+
+    Each template version adds new cache files, so the cache is
+    [pruned][copier.jinja.TemplateBytecodeCache.prune] once a day.
+
+    Attributes:
+        namespace:
+            Digest of everything that affects compilation, other than sources.
+    """
+
+    def __init__(self, directory: Path, *namespace: object) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        super().__init__(str(directory))
+        self.namespace = sha256(repr((jinja_version, *namespace)).encode()).hexdigest()
+        with suppress(OSError):
+            self._prune_if_due()
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        """Load a compiled template, and mark its cache file as recently used."""
+        super().load_bytecode(bucket)
+        if bucket.code is not None:
+            with suppress(OSError):
+                os.utime(self._get_cache_filename(bucket))
+
+    def prune(self, max_age: float | None = None, max_size: int | None = None) -> None:
+        """Evict compiled templates from the cache.
+
+        Files unused for longer than `max_age` are removed. Then, the least
+        recently used files are removed until the cache fits in `max_size`.
+
+        Args:
+            max_age:
+                Seconds since the last use. Defaults to the value of the
+                `COPIER_BYTECODE_CACHE_MAX_AGE` environment variable (in days),
+                or 30 days.
+            max_size:
+                Bytes used by the whole cache. Defaults to the value of the
+                `COPIER_BYTECODE_CACHE_MAX_SIZE` environment variable (in MiB),
+                or 256 MiB.
+        """
+        if max_age is None:
+            max_age = (
+                float(os.environ.get("COPIER_BYTECODE_CACHE_MAX_AGE", "30")) * 86400
+            )
+        if max_size is None:
+            max_size = int(
+                float(os.environ.get("COPIER_BYTECODE_CACHE_MAX_SIZE", "256")) * 1024**2
+            )
+        files = []
+        for path in Path(self.directory).glob(self.pattern % "*"):
+            with suppress(OSError):
+                stat = path.stat()
+                files.append((stat.st_mtime, stat.st_size, path))
+        now = time.time()
+        total_size = 0
+        # Most recently used files go first, so they are the last ones evicted
+        for last_used, size, path in sorted(files, reverse=True):
+            total_size += size
+            if now - last_used <= max_age and total_size <= max_size:
+                continue
+            # Another process may be reading or removing it
+            with suppress(OSError):
+                path.unlink()
+                total_size -= size
+
+    def _prune_if_due(self, interval: float = 86400) -> None:
+        """Prune the cache, unless it was pruned less than `interval` ago.
+
+        The last pruning time is the modification time of a stamp file.
+        """
+        stamp = Path(self.directory, "last-prune")
+        with suppress(OSError):
+            if time.time() - stamp.stat().st_mtime < interval:
+                return
+        stamp.touch()
+        self.prune()
+
+    def get_bucket(
+        self,
+        environment: Environment,
+        name: str,
+        filename: str | None,  # noqa: ARG002
+        source: str,
+    ) -> Bucket:
+        """Return the cache bucket for a template source."""
+        checksum = self.get_source_checksum(source)
+        key = sha256(f"{self.namespace}\0{name}\0{checksum}".encode()).hexdigest()
+        bucket = Bucket(environment, key, checksum)
+        self.load_bytecode(bucket)
+        return bucket
+
+
+class LazyFileSystemLoader(FileSystemLoader):
+    """Load templates from the file system, fetching missing ones on demand.
+
+    Attributes:
+        fetch:
+            Called with the name of a template that was not found. It returns
+            whether it fetched anything, so loading it again is worth a try.
+    """
+
+    def __init__(
+        self, searchpath: str | Path, fetch: Callable[[str], bool], **kwargs: Any
+    ) -> None:
+        super().__init__(searchpath, **kwargs)
+        self.fetch = fetch
+
+    def get_source(
+        self, environment: Environment, template: str
+    ) -> tuple[str, str, Callable[[], bool]]:
+        """Get the source of a template, fetching it if missing."""
+        try:
+            return super().get_source(environment, template)
+        except TemplateNotFound:
+            if not self.fetch(template):
+                raise
+        return super().get_source(environment, template)
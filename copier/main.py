@@ -4,21 +4,25 @@ from __future__ import annotations
 
 import os
 import platform
+import stat
 import subprocess
 import sys
-from contextlib import suppress
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack, suppress
 from dataclasses import asdict, field, replace
-from filecmp import dircmp
 from functools import cached_property, partial
-from itertools import chain
-from pathlib import Path
+from itertools import chain, islice
+from pathlib import Path, PurePosixPath
 from shutil import rmtree
 from tempfile import TemporaryDirectory
-from types import TracebackType
+from types import MappingProxyType, TracebackType
 from typing import (
+    AbstractSet,
     Any,
     Callable,
     Iterable,
+    Iterator,
     Literal,
     Mapping,
     Sequence,
@@ -26,11 +30,8 @@ from typing import (
     get_args,
     overload,
 )
-from unicodedata import normalize
 
-from jinja2.loaders import FileSystemLoader
-from jinja2.sandbox import SandboxedEnvironment
-from pathspec import PathSpec
+from jinja2 import __version__ as jinja_version
 from plumbum import ProcessExecutionError, colors
 from plumbum.cli.terminal import ask
 from plumbum.machines import local
@@ -45,16 +46,33 @@ from .errors import (
     UnsafeTemplateError,
     UserMessageError,
 )
+from .jinja import (
+    CachedSandboxedEnvironment,
+    LazyFileSystemLoader,
+    TemplateBytecodeCache,
+)
+from .manifest import (
+    IncrementalRender,
+    RenderedFile,
+    RenderManifest,
+    fingerprint,
+    git_blob_hash,
+    git_file_hash,
+)
+from .sinks import DirectorySink, GitTreeSink, Manifest, RenderSink, WriteBackSink
 from .subproject import Subproject
-from .template import Task, Template
+from .template import Task, Template, TemplateKey, TemplateRegistry
 from .tools import (
     OS,
+    PathMatcher,
     Style,
+    cache_dir,
     cast_to_bool,
+    copier_version,
     escape_git_path,
     normalize_git_path,
     printf,
-    scantree,
+    same_contents,
     set_git_alternates,
 )
 from .types import (
@@ -65,12 +83,13 @@ from .types import (
     StrOrPath,
 )
 from .user_data import DEFAULT_DATA, AnswersMap, Question
-from .vcs import get_git
+from .vcs import GitObjects, get_git, get_git_backend
 
 _T = TypeVar("_T")
+_RenderKind = Literal["file", "folder", "symlink"]
 
 
-@dataclass(config=ConfigDict(extra="forbid"))
+@dataclass(config=ConfigDict(extra="forbid", arbitrary_types_allowed=True))
 class Worker:
     """Copier process state manager.
 
@@ -184,6 +203,40 @@ class Worker:
 
         skip_tasks:
             When `True`, skip template tasks execution.
+
+        render_jobs:
+            Number of threads used to render and write files in parallel.
+
+            With `1` (the default), files are rendered sequentially. Either
+            way, conflicts are solved and reported in the same order.
+
+        bytecode_cache:
+            When `True`, keep compiled template files in a persistent cache,
+            so later runs with the same template version skip compilation.
+
+            See [bytecode_cache][].
+
+        reflink:
+            When `True`, template files that are copied without rendering
+            share their data with the template clone, on filesystems that
+            support copy-on-write.
+
+            See [reflink][].
+
+        sink:
+            Where to write rendered files. When `None` (the default), they are
+            written to `dst_path`.
+
+            Other sinks are always fresh destinations: their contents are
+            never compared nor overwritten interactively. Tasks and migrations
+            still run in `dst_path`, though.
+
+        incremental:
+            When `True`, keep a manifest of rendered files next to the answers
+            file. Then, updates only render files whose template sources or
+            referenced answers changed.
+
+            See [incremental][].
     """
 
     src_path: str | None = None
@@ -205,9 +258,18 @@ class Worker:
     unsafe: bool = False
     skip_answered: bool = False
     skip_tasks: bool = False
+    render_jobs: PositiveInt = 1
+    bytecode_cache: bool = False
+    reflink: bool = False
+    sink: RenderSink | None = None
+    incremental: bool = False
 
     answers: AnswersMap = field(default_factory=AnswersMap, init=False)
     _cleanup_hooks: list[Callable[[], None]] = field(default_factory=list, init=False)
+    # When not `None`, everything rendered is written here too
+    _recorder: RenderSink | None = field(default=None, init=False)
+    # When not `None`, files are fingerprinted and maybe skipped
+    _incremental: IncrementalRender | None = field(default=None, init=False)
 
     def __enter__(self) -> Worker:
         """Allow using worker as a context manager."""
@@ -320,6 +382,9 @@ class Worker:
             if self.pretend:
                 continue
 
+            # Tasks may use any file from the template, even from submodules
+            # that were not needed to render it
+            self.template.init_submodules(self.template.submodules)
             working_directory = (
                 # We can't use _render_path here, as that function has special handling for files in the template
                 self.subproject.local_abspath
@@ -331,11 +396,36 @@ class Worker:
                 subprocess.run(task_cmd, shell=use_shell, check=True, env=local.env)
 
     def _render_context(self) -> Mapping[str, Any]:
-        """Produce render context for Jinja."""
+        """Produce render context for Jinja.
+
+        It is built once, as an immutable snapshot, and reused for every
+        rendered file and string until answers change. Each render gets its
+        own copy of `_copier_answers` and `_copier_conf`, so templates that
+        modify them don't leak into other renders; values nested deeper are
+        shared and must not be modified in place.
+        """
+        snapshot = self._render_context_snapshot
+        return dict(
+            snapshot,
+            _copier_answers=dict(snapshot["_copier_answers"]),
+            _copier_conf=dict(snapshot["_copier_conf"]),
+        )
+
+    def _invalidate_render_context(self) -> None:
+        """Forget the render context snapshot, after answers change."""
+        with suppress(AttributeError):
+            del self._render_context_snapshot
+
+    @cached_property
+    def _render_context_snapshot(self) -> Mapping[str, Any]:
+        """Build the render context for Jinja."""
         # Backwards compatibility
         # FIXME Remove it?
         conf = asdict(self)
         conf.pop("_cleanup_hooks")
+        conf.pop("_recorder")
+        conf.pop("_incremental")
+        conf.pop("sink")
         conf.update(
             {
                 "answers_file": self.answers_relpath,
@@ -346,21 +436,20 @@ class Worker:
             }
         )
 
-        return dict(
-            DEFAULT_DATA,
-            **self.answers.combined,
-            _copier_answers=self._answers_to_remember(),
-            _copier_conf=conf,
-            _folder_name=self.subproject.local_abspath.name,
-            _copier_python=sys.executable,
+        return MappingProxyType(
+            dict(
+                DEFAULT_DATA,
+                **self.answers.combined,
+                _copier_answers=self._answers_to_remember(),
+                _copier_conf=conf,
+                _folder_name=self.subproject.local_abspath.name,
+                _copier_python=sys.executable,
+            )
         )
 
-    def _path_matcher(self, patterns: Iterable[str]) -> Callable[[Path], bool]:
+    def _path_matcher(self, patterns: Iterable[str]) -> Callable[[StrOrPath], bool]:
         """Produce a function that matches against specified patterns."""
-        # TODO Is normalization really needed?
-        normalized_patterns = (normalize("NFD", pattern) for pattern in patterns)
-        spec = PathSpec.from_lines("gitwildmatch", normalized_patterns)
-        return spec.match_file
+        return PathMatcher(patterns).match_file
 
     def _solve_render_conflict(self, dst_relpath: Path) -> bool:
         """Properly solve render conflicts.
@@ -401,6 +490,8 @@ class Worker:
         is_dir: bool = False,
         is_symlink: bool = False,
         expected_contents: bytes | Path = b"",
+        expected_file: Path | None = None,
+        expected_sha: str = "",
     ) -> bool:
         """Determine if a file or directory can be rendered.
 
@@ -414,17 +505,41 @@ class Worker:
             expected_contents:
                 Used to compare existing file contents with them. Allows to know if
                 rendering is needed.
+            expected_file:
+                Used instead of `expected_contents`, to compare existing file
+                contents with those of this file, without loading them whole.
+            expected_sha:
+                Git object hash of `expected_file`, if known. Then, only the
+                existing file is read to compare them.
         """
         assert not dst_relpath.is_absolute()
         assert not expected_contents or not is_dir, "Dirs cannot have expected content"
+        if self.sink is not None:
+            # Sinks are fresh destinations, so there's nothing to conflict with
+            return True
         dst_abspath = Path(self.subproject.local_abspath, dst_relpath)
         previous_is_symlink = dst_abspath.is_symlink()
+        identical = False
         try:
-            previous_content: bytes | Path
             if previous_is_symlink:
-                previous_content = dst_abspath.readlink()
+                identical = dst_abspath.readlink() == expected_contents
+            elif expected_sha:
+                assert expected_file is not None
+                size = expected_file.stat().st_size
+                identical = (
+                    dst_abspath.stat().st_size == size
+                    and git_file_hash(dst_abspath) == expected_sha
+                )
+            elif expected_file is not None:
+                identical = same_contents(dst_abspath, expected_file)
             else:
-                previous_content = dst_abspath.read_bytes()
+                # Files with a different size are told apart without reading
+                size = dst_abspath.stat().st_size
+                identical = (
+                    isinstance(expected_contents, bytes)
+                    and size == len(expected_contents)
+                    and dst_abspath.read_bytes() == expected_contents
+                )
         except FileNotFoundError:
             printf(
                 "create",
@@ -440,9 +555,7 @@ class Worker:
                 raise
         except IsADirectoryError:
             assert is_dir
-        if is_dir or (
-            previous_content == expected_contents and previous_is_symlink == is_symlink
-        ):
+        if is_dir or (identical and previous_is_symlink == is_symlink):
             printf(
                 "identical",
                 dst_relpath,
@@ -520,6 +633,7 @@ class Worker:
             result.user[var_name] = new_answer
 
         self.answers = result
+        self._invalidate_render_context()
 
     @property
     def answers_relpath(self) -> Path:
@@ -531,8 +645,10 @@ class Worker:
         2. Template default.
         3. Copier default.
         """
-        path = self.answers_file or self.template.answers_relpath
-        template = self.jinja_env.from_string(str(path))
+        path = str(self.answers_file or self.template.answers_relpath)
+        if self.jinja_env.is_literal(path):
+            return Path(path)
+        template = self.jinja_env.from_string(path)
         return Path(template.render(**self.answers.combined))
 
     @cached_property
@@ -541,13 +657,30 @@ class Worker:
         return self.template.exclude + tuple(self.exclude)
 
     @cached_property
-    def jinja_env(self) -> SandboxedEnvironment:
+    def jinja_env(self) -> CachedSandboxedEnvironment:
         """Return a pre-configured Jinja environment.
 
         Respects template settings.
+
+        While a [template registry][copier.template.TemplateRegistry] is
+        active, the environment is shared by all workers using the same template.
         """
-        paths = [str(self.template.local_abspath)]
-        loader = FileSystemLoader(paths)
+        registry = TemplateRegistry.active()
+        if registry and (key := registry.key_of(self.template)):
+            try:
+                return registry.jinja_envs[key]
+            except KeyError:
+                env = registry.jinja_envs[key] = self._build_jinja_env()
+                return env
+        return self._build_jinja_env()
+
+    def _build_jinja_env(self) -> CachedSandboxedEnvironment:
+        """Build a new Jinja environment for the template."""
+        # Templates may include files from submodules that are not rendered
+        loader = LazyFileSystemLoader(
+            self.template.local_abspath,
+            lambda name: self.template.init_submodules([PurePosixPath(name)]),
+        )
         default_extensions = [
             "jinja2_ansible_filters.AnsibleCoreFiltersExtension",
         ]
@@ -557,8 +690,20 @@ class Worker:
         # Of course we still have the post-copy tasks to worry about, but at least
         # they are more visible to the final user.
         try:
-            env = SandboxedEnvironment(
-                loader=loader, extensions=extensions, **self.template.envops
+            env = CachedSandboxedEnvironment(
+                loader=loader,
+                extensions=extensions,
+                bytecode_cache=(
+                    TemplateBytecodeCache(
+                        cache_dir() / "bytecode",
+                        self.template.commit_hash,
+                        extensions,
+                        sorted(self.template.envops.items()),
+                    )
+                    if self.bytecode_cache
+                    else None
+                ),
+                **self.template.envops,
             )
         except ModuleNotFoundError as error:
             raise ExtensionNotFoundError(
@@ -587,12 +732,21 @@ class Worker:
         return env
 
     @cached_property
-    def match_exclude(self) -> Callable[[Path], bool]:
+    def match_exclude(self) -> Callable[[StrOrPath], bool]:
         """Get a callable to match paths against all exclusions."""
         return self._path_matcher(self.all_exclusions)
 
     @cached_property
-    def match_skip(self) -> Callable[[Path], bool]:
+    def _exclusions_prune_folders(self) -> bool:
+        """Tell if excluding a folder always excludes everything inside it.
+
+        Exclusion patterns match everything inside the folders they match, but
+        negated patterns could include something inside them again.
+        """
+        return not any(pattern.startswith("!") for pattern in self.all_exclusions)
+
+    @cached_property
+    def match_skip(self) -> Callable[[StrOrPath], bool]:
         """Get a callable to match paths against all skip-if-exists patterns."""
         return self._path_matcher(
             map(
@@ -601,38 +755,240 @@ class Worker:
             )
         )
 
-    def _render_template(self) -> None:
-        """Render the template in the subproject root."""
-        follow_symlinks = not self.template.preserve_symlinks
-        for src in scantree(str(self.template_copy_root), follow_symlinks):
-            src_abspath = Path(src.path)
-            src_relpath = Path(src_abspath).relative_to(self.template.local_abspath)
-            dst_relpath = self._render_path(
-                Path(src_abspath).relative_to(self.template_copy_root)
-            )
+    def _render_plan(self) -> Iterator[tuple[_RenderKind, Path, Path]]:
+        """Plan which template entries must be rendered, and where.
+
+        The plan is produced while walking the template, so it can be consumed
+        before the walk is over.
+
+        Yields:
+            The kind of entry, its path relative to the template root, and its
+            rendered path relative to the subproject root, in walking order.
+        """
+        self._init_submodules()
+        for kind, src_relpath, dst_relpath in self._scan_template(
+            self.template_copy_root,
+            self.template_copy_root.relative_to(self.template.local_abspath),
+            not self.template.preserve_symlinks,
+        ):
             if dst_relpath is None or self.match_exclude(dst_relpath):
                 continue
-            if src.is_symlink() and self.template.preserve_symlinks:
-                self._render_symlink(src_relpath, dst_relpath)
-            elif src.is_dir(follow_symlinks=follow_symlinks):
-                self._render_folder(dst_relpath)
+            if kind != "file" or self._incremental is None:
+                yield kind, src_relpath, dst_relpath
+            elif not self._skip_file(src_relpath, dst_relpath):
+                yield kind, src_relpath, dst_relpath
+
+    def _scan_template(
+        self,
+        src_abspath: Path,
+        src_relpath: Path,
+        follow_symlinks: bool,
+    ) -> Iterator[tuple[_RenderKind, Path, Path | None]]:
+        """Walk a template directory, rendering each path.
+
+        The walk is iterative, so it is not limited by the recursion depth.
+        Entries are sorted by name in each directory, so the order does not
+        depend on the filesystem. Entry types come from the directory listing,
+        which usually avoids a `stat` call for each of them.
+
+        Args:
+            src_abspath: The directory to walk.
+            src_relpath: The same directory, relative to the template root.
+            follow_symlinks: Walk into symlinks to directories too, instead of
+                reporting them as symlinks.
+
+        Yields:
+            The kind of each entry, its path relative to the template root, and
+            its rendered path relative to the subproject root, or `None` if it
+            must not be rendered. Entries go before their contents.
+        """
+        submodules = set(self.template.submodules)
+        pending = [self._scan_folder(src_abspath, src_relpath, Path(), follow_symlinks)]
+        while pending:
+            folder = pending[-1]
+            for kind, abspath, entry_src_relpath, entry_dst_relpath, walk in folder:
+                yield kind, entry_src_relpath, entry_dst_relpath
+                if walk:
+                    assert entry_dst_relpath is not None
+                    # Submodules are only fetched when the walk enters them
+                    if PurePosixPath(entry_src_relpath.as_posix()) in submodules:
+                        self.template.init_submodules([entry_src_relpath])
+                    # Walk its contents before its next siblings
+                    pending.append(
+                        self._scan_folder(
+                            abspath,
+                            entry_src_relpath,
+                            entry_dst_relpath,
+                            follow_symlinks,
+                        )
+                    )
+                    break
             else:
-                self._render_file(src_relpath, dst_relpath)
+                pending.pop()
 
-    def _render_file(self, src_relpath: Path, dst_relpath: Path) -> None:
-        """Render one file.
+    def _scan_folder(
+        self,
+        src_abspath: Path,
+        src_relpath: Path,
+        dst_relpath: Path,
+        follow_symlinks: bool,
+    ) -> Iterator[tuple[_RenderKind, Path, Path, Path | None, bool]]:
+        """Render the paths of the entries of one template directory.
+
+        Each directory name is rendered once, and its rendered path is reused
+        for everything inside it. Templated siblings are found in the directory
+        listing, without checking the filesystem. Excluded folders are not
+        entered, unless negated exclusions could include something inside them.
+
+        Args:
+            src_abspath: The directory to list.
+            src_relpath: The same directory, relative to the template root.
+            dst_relpath: Its rendered path, relative to the subproject root.
+            follow_symlinks: Treat symlinks to directories as directories.
+
+        Yields:
+            The kind of each entry, its absolute path, its path relative to the
+            template root, its rendered path relative to the subproject root or
+            `None`, and whether its contents must be walked too.
+        """
+        with os.scandir(src_abspath) as iterator:
+            entries = sorted(iterator, key=lambda entry: entry.name)
+        names = {entry.name for entry in entries}
+        suffix = self.template.templates_suffix
+        for entry in entries:
+            kind: _RenderKind
+            if not follow_symlinks and entry.is_symlink():
+                kind = "symlink"
+            elif entry.is_dir(follow_symlinks=follow_symlinks):
+                kind = "folder"
+            else:
+                kind = "file"
+            entry_abspath = Path(entry.path)
+            entry_src_relpath = src_relpath / entry.name
+            # With an empty suffix, the templated sibling always exists
+            has_templated_sibling = bool(suffix) and f"{entry.name}{suffix}" in names
+            if has_templated_sibling and kind != "folder":
+                yield kind, entry_abspath, entry_src_relpath, None, False
+                continue
+            is_template = entry.name.endswith(suffix)
+            name = entry.name
+            if suffix and is_template:
+                name = str(Path(name).with_suffix(""))
+            rendered = self._render_path_part(name)
+            entry_dst_relpath = dst_relpath / rendered if rendered else None
+            if not is_template and f"{rendered}{suffix}" in names:
+                has_templated_sibling = True
+            # Everything inside a folder rendered as an empty string is skipped,
+            # as well as everything inside an excluded folder, if possible
+            walk = (
+                entry_dst_relpath is not None
+                and kind == "folder"
+                and not (
+                    self._exclusions_prune_folders
+                    and self.match_exclude(entry_dst_relpath)
+                )
+            )
+            yield (
+                kind,
+                entry_abspath,
+                entry_src_relpath,
+                None if has_templated_sibling else entry_dst_relpath,
+                walk,
+            )
+
+    def _init_submodules(self) -> None:
+        """Initialize the template submodule that contains the copy root, if any.
+
+        Submodules inside the copy root are initialized while walking it, only
+        if their folders are entered. See `_scan_template`.
+        """
+        self.template.init_submodules(
+            submodule
+            for submodule in self.template.submodules
+            if self.template_copy_root.is_relative_to(
+                self.template.local_abspath / submodule
+            )
+        )
+
+    def _render_template(self) -> None:
+        """Render the template in the subproject root."""
+        if self._incremental is None and self._records_manifest:
+            self._incremental = IncrementalRender()
+        try:
+            if self.render_jobs > 1:
+                self._render_template_parallel()
+            else:
+                for kind, src_relpath, dst_relpath in self._render_plan():
+                    if kind == "symlink":
+                        self._render_symlink(src_relpath, dst_relpath)
+                    elif kind == "folder":
+                        self._render_folder(dst_relpath)
+                    else:
+                        self._render_file(src_relpath, dst_relpath)
+        except BaseException:
+            # Let queued writes end before the destination is cleaned up
+            with suppress(Exception):
+                self._sink.flush()
+            raise
+        self._sink.flush()
+        if self._records_manifest:
+            assert self._incremental
+            RenderManifest(
+                commit=self.template.commit_hash,
+                config=self._config_fingerprint(),
+                sources=self._incremental.sources,
+                context=self._incremental.context,
+                files=self._incremental.files,
+            ).dump(self.subproject.local_abspath / self._manifest_relpath)
+
+    def _render_template_parallel(self) -> None:
+        """Render the template in the subproject root, using a pool of threads.
+
+        The plan is streamed from the template walk. File contents are rendered
+        in the pool, while conflicts are solved and reported in the main
+        thread, in the same order as when rendering sequentially.
+        """
+        upcoming = self._render_plan()
+        planned: deque[tuple[_RenderKind, Path, Path, Future[bytes] | None]] = deque()
+        with ThreadPoolExecutor(self.render_jobs) as pool:
+
+            def render_ahead() -> None:
+                for kind, src_relpath, dst_relpath in islice(upcoming, 1):
+                    planned.append(
+                        (
+                            kind,
+                            src_relpath,
+                            dst_relpath,
+                            pool.submit(self._render_file_content, src_relpath)
+                            if kind == "file" and not self._copies_as_is(src_relpath)
+                            else None,
+                        )
+                    )
+
+            # Keep a bounded window of files rendering ahead of the main thread
+            for _ in range(self.render_jobs * 4):
+                render_ahead()
+            while planned:
+                kind, src_relpath, dst_relpath, content = planned.popleft()
+                render_ahead()
+                if kind == "symlink":
+                    self._render_symlink(src_relpath, dst_relpath)
+                elif kind == "folder":
+                    self._render_folder(dst_relpath)
+                else:
+                    new_content = None if content is None else content.result()
+                    if self._file_allowed(src_relpath, dst_relpath, new_content):
+                        self._write_file(src_relpath, dst_relpath, new_content)
+
+    def _render_file_content(self, src_relpath: Path) -> bytes:
+        """Render the contents of one file.
 
         Args:
             src_relpath:
                 File to be rendered. It must be a path relative to the template
                 root.
-            dst_relpath:
-                File to be created. It must be a path relative to the subproject
-                root.
         """
-        # TODO Get from main.render_file()
         assert not src_relpath.is_absolute()
-        assert not dst_relpath.is_absolute()
         src_abspath = self.template.local_abspath / src_relpath
         if src_relpath.name.endswith(self.template.templates_suffix):
             try:
@@ -642,23 +998,229 @@ class Worker:
                     # suffix is not empty, re-raise
                     raise
                 # suffix is empty, fallback to copy
-                new_content = src_abspath.read_bytes()
-            else:
-                new_content = tpl.render(**self._render_context()).encode()
+                return src_abspath.read_bytes()
+            return tpl.render(**self._render_context()).encode()
+        return src_abspath.read_bytes()
+
+    def _copies_as_is(self, src_relpath: Path) -> bool:
+        """Tell if a template file is copied as it is, without rendering it."""
+        return not src_relpath.name.endswith(self.template.templates_suffix)
+
+    def _write_file(
+        self, src_relpath: Path, dst_relpath: Path, content: bytes | None = None
+    ) -> None:
+        """Write one rendered file, with the same mode as its source.
+
+        Args:
+            src_relpath:
+                Rendered file. It must be a path relative to the template root.
+            dst_relpath:
+                File to be written. It must be a path relative to the subproject
+                root.
+            content:
+                Rendered contents, or `None` to copy the template file as it is.
+        """
+        if self.pretend:
+            return
+        mode = self._src_mode(src_relpath)
+        if content is None:
+            src_abspath = self.template.local_abspath / src_relpath
+            self._sink.copy_file(dst_relpath, src_abspath, mode)
         else:
-            new_content = src_abspath.read_bytes()
-        dst_abspath = self.subproject.local_abspath / dst_relpath
-        src_mode = src_abspath.stat().st_mode
-        if not self._render_allowed(dst_relpath, expected_contents=new_content):
+            self._sink.write_file(dst_relpath, content, mode)
+
+    def _file_allowed(
+        self, src_relpath: Path, dst_relpath: Path, content: bytes | None
+    ) -> bool:
+        """Record one rendered file, and tell if it must be written.
+
+        Files copied as they are get compared and hashed in chunks, so big
+        files are never loaded whole into memory.
+
+        Args:
+            src_relpath:
+                Rendered file. It must be a path relative to the template root.
+            dst_relpath:
+                Where it is rendered, relative to the subproject root.
+            content:
+                Rendered contents, or `None` to copy the template file as it is.
+        """
+        self._record_file(src_relpath, dst_relpath, content)
+        if content is None:
+            return self._render_allowed(
+                dst_relpath,
+                expected_file=self.template.local_abspath / src_relpath,
+                # Already hashed for the manifest, so it needn't be read again
+                expected_sha=self._source_hash(src_relpath.as_posix())
+                if self._records_manifest
+                else "",
+            )
+        return self._render_allowed(dst_relpath, expected_contents=content)
+
+    def _render_file(self, src_relpath: Path, dst_relpath: Path) -> None:
+        """Render one file.
+
+        Args:
+            src_relpath:
+                File to be rendered. It must be a path relative to the template
+                root.
+            dst_relpath:
+                File to be created. It must be a path relative to the subproject
+                root.
+        """
+        # TODO Get from main.render_file()
+        assert not src_relpath.is_absolute()
+        assert not dst_relpath.is_absolute()
+        new_content = (
+            None
+            if self._copies_as_is(src_relpath)
+            else self._render_file_content(src_relpath)
+        )
+        if self._file_allowed(src_relpath, dst_relpath, new_content):
+            self._write_file(src_relpath, dst_relpath, new_content)
+
+    def _src_mode(self, src_relpath: Path) -> int:
+        """Get the mode of a template file."""
+        return (self.template.local_abspath / src_relpath).stat().st_mode
+
+    def _record_file(
+        self, src_relpath: Path, dst_relpath: Path, content: bytes | None = None
+    ) -> None:
+        """Keep track of a rendered file, for the recorder and the manifest.
+
+        Args:
+            src_relpath:
+                Rendered file. It must be a path relative to the template root.
+            dst_relpath:
+                Where it is rendered, relative to the subproject root.
+            content:
+                Rendered contents, or `None` if the template file is copied as
+                it is.
+        """
+        if self._recorder is None and not self._records_manifest:
             return
-        if not self.pretend:
-            dst_abspath.parent.mkdir(parents=True, exist_ok=True)
-            if dst_abspath.is_symlink():
-                # Writing to a symlink just writes to its target, so if we want to
-                # replace a symlink with a file we have to unlink it first
-                dst_abspath.unlink()
-            dst_abspath.write_bytes(new_content)
-            dst_abspath.chmod(src_mode)
+        mode = self._src_mode(src_relpath)
+        if self._recorder is not None:
+            if content is None:
+                src_abspath = self.template.local_abspath / src_relpath
+                self._recorder.copy_file(dst_relpath, src_abspath, mode)
+            else:
+                self._recorder.write_file(dst_relpath, content, mode)
+        if not self._records_manifest:
+            return
+        assert self._incremental
+        name = src_relpath.as_posix()
+        dependencies: tuple[frozenset[str], frozenset[str]] | None = (
+            frozenset({name}),
+            frozenset(),
+        )
+        if name.endswith(self.template.templates_suffix):
+            # Binary files are copied as they are, when the suffix is empty
+            with suppress(UnicodeDecodeError):
+                dependencies = self.jinja_env.template_dependencies(name)
+        templates: tuple[str, ...] | None = None
+        variables: tuple[str, ...] = ()
+        if dependencies is not None:
+            templates = tuple(sorted(dependencies[0]))
+            variables = tuple(sorted(dependencies[1]))
+            for template in templates:
+                self._source_hash(template)
+            for variable in variables:
+                self._context_hash(variable)
+        self._incremental.files[dst_relpath.as_posix()] = RenderedFile(
+            src=name,
+            mode=mode,
+            sha=self._source_hash(name) if content is None else git_blob_hash(content),
+            templates=templates,
+            variables=variables,
+        )
+
+    @cached_property
+    def _records_manifest(self) -> bool:
+        """Tell if a render manifest must be kept in the subproject."""
+        return self.incremental and self.sink is None and not self.pretend
+
+    @property
+    def _manifest_relpath(self) -> Path:
+        """Get the render manifest path, relative to the subproject root."""
+        return self.answers_relpath.with_suffix(".manifest.json")
+
+    def _config_fingerprint(self) -> str:
+        """Fingerprint everything that affects how any template file renders."""
+        return fingerprint(
+            (str(copier_version()), jinja_version, self.template.config_data)
+        )
+
+    def _source_hash(self, name: str) -> str:
+        """Get the Git object hash of a template source, or `""` if missing."""
+        assert self._incremental
+        sources = self._incremental.sources
+        if name not in sources:
+            try:
+                sources[name] = git_file_hash(self.template.local_abspath / name)
+            except OSError:
+                sources[name] = ""
+        return sources[name]
+
+    def _context_hash(self, name: str) -> str:
+        """Get the fingerprint of a render context variable."""
+        assert self._incremental
+        context = self._incremental.context
+        if name not in context:
+            context[name] = fingerprint(self._render_context().get(name))
+        return context[name]
+
+    def _skip_file(self, src_relpath: Path, dst_relpath: Path) -> bool:
+        """Tell if an incremental render can leave a file alone.
+
+        That happens when it would render exactly like last time, or when
+        asked to skip it anyway.
+
+        Args:
+            src_relpath:
+                File to be rendered. It must be a path relative to the template
+                root.
+            dst_relpath:
+                Where it would be rendered, relative to the subproject root.
+        """
+        assert self._incremental
+        path = PurePosixPath(dst_relpath.as_posix())
+        previous = self._incremental.previous
+        entry = previous and previous.files.get(str(path))
+        if path not in self._incremental.skip and not (
+            previous
+            and entry
+            and entry.templates is not None
+            and entry.src == src_relpath.as_posix()
+            and entry.mode == self._src_mode(src_relpath)
+            and all(
+                self._source_hash(name) == previous.sources.get(name)
+                for name in entry.templates
+            )
+            and all(
+                self._context_hash(name) == previous.context.get(name)
+                for name in entry.variables
+            )
+        ):
+            return False
+        self._incremental.skipped.add(path)
+        if entry:
+            self._incremental.files[str(path)] = entry
+        return True
+
+    @cached_property
+    def _sink(self) -> RenderSink:
+        """Get where rendered files are written.
+
+        Files written to the destination directory are queued, so the next
+        ones render meanwhile.
+        """
+        if self.sink is not None:
+            return self.sink
+        return WriteBackSink(
+            DirectorySink(self.subproject.local_abspath, reflink=self.reflink),
+            self.render_jobs,
+        )
 
     def _render_symlink(self, src_relpath: Path, dst_relpath: Path) -> None:
         """Render one symlink.
@@ -682,6 +1244,17 @@ class Worker:
             dst_target = Path(self._render_string(str(src_target)))
         else:
             dst_target = src_target
+        src_mode = src_abspath.lstat().st_mode
+        if self._recorder is not None:
+            self._recorder.write_symlink(dst_relpath, dst_target, src_mode)
+        if self._records_manifest:
+            assert self._incremental
+            # Symlinks are cheap, so they are always rendered again
+            self._incremental.files[dst_relpath.as_posix()] = RenderedFile(
+                src=src_relpath.as_posix(),
+                mode=src_mode,
+                sha=git_blob_hash(str(dst_target).encode()),
+            )
 
         if not self._render_allowed(
             dst_relpath,
@@ -691,17 +1264,7 @@ class Worker:
             return
 
         if not self.pretend:
-            dst_abspath = self.subproject.local_abspath / dst_relpath
-            # symlink_to doesn't overwrite existing files, so delete it first
-            if dst_abspath.is_symlink() or dst_abspath.exists():
-                dst_abspath.unlink()
-            dst_abspath.parent.mkdir(parents=True, exist_ok=True)
-            dst_abspath.symlink_to(dst_target)
-            if sys.platform == "darwin":
-                # Only macOS supports permissions on symlinks.
-                # Other platforms just copy the permission of the target
-                src_mode = src_abspath.lstat().st_mode
-                dst_abspath.lchmod(src_mode)
+            self._sink.write_symlink(dst_relpath, dst_target, src_mode)
 
     def _render_folder(self, dst_relpath: Path) -> None:
         """Create one folder (without content).
@@ -712,46 +1275,25 @@ class Worker:
                 subproject root.
         """
         assert not dst_relpath.is_absolute()
+        if self._recorder is not None:
+            self._recorder.make_dir(dst_relpath)
         if not self.pretend and self._render_allowed(dst_relpath, is_dir=True):
-            dst_abspath = self.subproject.local_abspath / dst_relpath
-            dst_abspath.mkdir(parents=True, exist_ok=True)
+            self._sink.make_dir(dst_relpath)
 
-    def _render_path(self, relpath: Path) -> Path | None:
-        """Render one relative path.
+    def _render_path_part(self, part: str) -> str:
+        """Render one part of a relative path.
 
         Args:
-            relpath:
-                The relative path to be rendered. Obviously, it can be templated.
+            part: The part to render. Parts without template syntax are kept.
         """
-        is_template = relpath.name.endswith(self.template.templates_suffix)
-        templated_sibling = (
-            self.template.local_abspath / f"{relpath}{self.template.templates_suffix}"
-        )
-        # With an empty suffix, the templated sibling always exists.
-        if templated_sibling.exists() and self.template.templates_suffix:
-            return None
-        if self.template.templates_suffix and is_template:
-            relpath = relpath.with_suffix("")
-        rendered_parts = []
-        for part in relpath.parts:
-            # Skip folder if any part is rendered as an empty string
-            part = self._render_string(part)
-            if not part:
-                return None
-            # {{ _copier_conf.answers_file }} becomes the full path; in that case,
-            # restore part to be just the end leaf
-            if str(self.answers_relpath) == part:
-                part = Path(part).name
-            rendered_parts.append(part)
-        result = Path(*rendered_parts)
-        if not is_template:
-            templated_sibling = (
-                self.template.local_abspath
-                / f"{result}{self.template.templates_suffix}"
-            )
-            if templated_sibling.exists():
-                return None
-        return result
+        if self.jinja_env.is_literal(part):
+            return part
+        part = self._render_string(part)
+        # {{ _copier_conf.answers_file }} becomes the full path; in that case,
+        # restore part to be just the end leaf
+        if str(self.answers_relpath) == part:
+            part = Path(part).name
+        return part
 
     def _render_string(
         self, string: str, extra_context: AnyByStrDict | None = None
@@ -765,6 +1307,8 @@ class Worker:
             extra_context:
                 Additional variables to use for rendering the template.
         """
+        if isinstance(string, str) and self.jinja_env.is_literal(string):
+            return string
         tpl = self.jinja_env.from_string(string)
         return tpl.render(**self._render_context(), **(extra_context or {}))
 
@@ -803,6 +1347,8 @@ class Worker:
             if self.subproject.template is None:
                 raise TypeError("Template not found")
             url = str(self.subproject.template.url)
+        if registry := TemplateRegistry.active():
+            return registry.get(url, self.vcs_ref, self.use_prereleases)
         result = Template(
             url=url, ref=self.vcs_ref, use_prereleases=self.use_prereleases
         )
@@ -847,7 +1393,7 @@ class Worker:
             if not self.skip_tasks:
                 self._execute_tasks(self.template.tasks)
         except Exception:
-            if not was_existing and self.cleanup_on_error:
+            if not was_existing and self.cleanup_on_error and self.sink is None:
                 rmtree(self.subproject.local_abspath)
             raise
         self._print_message(self.template.message_after_copy)
@@ -931,60 +1477,86 @@ class Worker:
             prefix=f"{__name__}.old_copy.",
         ) as old_copy, TemporaryDirectory(
             prefix=f"{__name__}.new_copy.",
-        ) as new_copy:
-            # Copy old template into a temporary destination
-            with replace(
-                self,
-                dst_path=old_copy / subproject_subdir,
-                data=self.subproject.last_answers,
-                defaults=True,
-                quiet=True,
-                src_path=self.subproject.template.url,  # type: ignore[union-attr]
-                vcs_ref=self.subproject.template.commit,  # type: ignore[union-attr]
-            ) as old_worker:
-                old_worker.run_copy()
+        ) as new_copy, ExitStack() as sinks:
+            git("init", old_copy)
+            # Without tasks, the old template only produces files, so render
+            # them straight into Git objects
+            old_sink = None
+            if self.skip_tasks or not self.subproject.template.tasks:  # type: ignore[union-attr]
+                old_sink = sinks.enter_context(
+                    GitTreeSink(old_copy, "refs/copier/old", subproject_subdir)
+                )
+            # Incremental updates render the old template later, only where
+            # the new template changes
+            previous = None
+            if (
+                old_sink
+                and self.incremental
+                and (self.skip_tasks or not self.template.tasks)
+            ):
+                previous = self._previous_manifest()
+            last_answers = self.subproject.last_answers
+            if previous is None:
+                # Copy old template into a temporary destination
+                self._copy_old_template(
+                    old_copy / subproject_subdir, last_answers, old_sink
+                )
             # Run pre-migration tasks
             self._execute_tasks(
                 self.template.migration_tasks("before", self.subproject.template)  # type: ignore[arg-type]
             )
             # Create a Git tree object from the current (possibly dirty) index
             # and keep the object reference.
-            with local.cwd(subproject_top):
-                subproject_head = git("write-tree").strip()
+            backend = get_git_backend()
+            subproject_head = backend.write_tree(subproject_top)
             with local.cwd(old_copy):
-                self._git_initialize_repo()
                 # Configure borrowing Git objects from the real destination.
                 set_git_alternates(subproject_top)
                 # Save a list of files that were intentionally removed in the generated
                 # project to avoid recreating them during the update.
                 # Files listed in `skip_if_exists` should only be skipped if they exist.
                 # They should even be recreated if deleted intentionally.
-                files_removed = git(
-                    "diff-tree",
-                    "-r",
-                    "--diff-filter=D",
-                    "--name-only",
-                    "HEAD",
-                    subproject_head,
-                ).splitlines()
-                exclude_plus_removed = list(
-                    set(self.exclude).union(
-                        map(
-                            escape_git_path,
-                            map(
-                                normalize_git_path,
-                                (
-                                    path
-                                    for path in files_removed
-                                    if not self.match_skip(path)
-                                ),
-                            ),
+                if previous is not None:
+                    subproject_tree = _tree_blobs(subproject_top, subproject_head)
+                    files_removed = [
+                        path
+                        for path in _removed_paths(
+                            subproject_top, subproject_subdir, previous, subproject_tree
                         )
-                    )
+                        if not self.match_skip(Path(path))
+                    ]
+                    # Files missing in the project must be rendered again
+                    previous.files = {
+                        path: entry
+                        for path, entry in previous.files.items()
+                        if (old_sink.prefix / path).as_posix() in subproject_tree  # type: ignore[union-attr]
+                    }
+                else:
+                    if old_sink is None:
+                        self._git_initialize_repo()
+                        old_paths = _walk_paths(Path(old_copy))
+                    else:
+                        old_paths = old_sink.manifest
+                        _commit_unignored(old_sink)
+                    files_removed = [
+                        normalize_git_path(path)
+                        for path in backend.diff_tree(
+                            old_copy,
+                            "HEAD",
+                            subproject_head,
+                            "-r",
+                            "--diff-filter=D",
+                            "--name-only",
+                        ).splitlines()
+                        if not self.match_skip(path)
+                    ]
+                exclude_plus_removed = list(
+                    set(self.exclude).union(map(escape_git_path, files_removed))
                 )
             # Clear last answers cache to load possible answers migration, if skip_answered flag is not set
             if self.skip_answered is False:
                 self.answers = AnswersMap()
+                self._invalidate_render_context()
                 with suppress(AttributeError):
                     del self.subproject.last_answers
             # Do a normal update in final destination
@@ -998,33 +1570,79 @@ class Worker:
                 # TODO
                 quiet=True,
             ) as current_worker:
+                # Without tasks, the final destination gets exactly what a new
+                # copy would get, so record it instead of rendering it again
+                new_sink = None
+                if self.skip_tasks or not self.template.tasks:
+                    new_sink = sinks.enter_context(
+                        GitTreeSink(old_copy, "refs/copier/new", subproject_subdir)
+                    )
+                    current_worker._recorder = new_sink
+                if previous is not None:
+                    current_worker._incremental = IncrementalRender(previous)
                 current_worker.run_copy()
                 self.answers = current_worker.answers
-            # Render with the same answers in an empty dir to avoid pollution
-            with replace(
-                self,
-                dst_path=new_copy / subproject_subdir,
-                data={
-                    k: v
-                    for k, v in self.answers.combined.items()
-                    if k not in self.answers.hidden
-                },
-                defaults=True,
-                quiet=True,
-                src_path=self.subproject.template.url,  # type: ignore[union-attr]
-                exclude=exclude_plus_removed,
-            ) as new_worker:
-                new_worker.run_copy()
-            with local.cwd(new_copy):
-                self._git_initialize_repo()
-                new_copy_head = git("rev-parse", "HEAD").strip()
+                self._invalidate_render_context()
+            skipped: AbstractSet[PurePosixPath] = set()
+            if previous is not None:
+                assert old_sink and current_worker._incremental
+                skipped = current_worker._incremental.skipped
+                # Render the old template only where the new one was rendered.
+                # Elsewhere, take files from the project, so they have no diff.
+                self._copy_old_template(
+                    old_copy / subproject_subdir, last_answers, old_sink, skipped
+                )
+                for skipped_path in skipped:
+                    with suppress(KeyError):
+                        blob_mode, blob_sha = subproject_tree[
+                            (old_sink.prefix / skipped_path).as_posix()
+                        ]
+                        old_sink.add_blob(skipped_path, blob_sha, blob_mode)
+                with local.cwd(old_copy):
+                    old_paths = old_sink.manifest
+                    _commit_unignored(old_sink)
+            alternates = [subproject_top]
+            new_paths: AbstractSet[PurePosixPath]
+            if new_sink is None:
+                # Render with the same answers in an empty dir to avoid pollution
+                with replace(
+                    self,
+                    dst_path=new_copy / subproject_subdir,
+                    data={
+                        k: v
+                        for k, v in self.answers.combined.items()
+                        if k not in self.answers.hidden
+                    },
+                    defaults=True,
+                    quiet=True,
+                    src_path=self.subproject.template.url,  # type: ignore[union-attr]
+                    exclude=exclude_plus_removed,
+                    incremental=False,
+                    # Throwaway copies can share data with the template clone
+                    reflink=True,
+                ) as new_worker:
+                    new_worker.run_copy()
+                with local.cwd(new_copy):
+                    self._git_initialize_repo()
+                    new_copy_head = backend.rev_parse(new_copy)
+                alternates.append(Path(new_copy))
+                new_paths = _walk_paths(Path(new_copy)).keys()
+            else:
+                new_copy_head = new_sink.commit("new template")
+                new_paths = {
+                    parent
+                    for path in chain(
+                        new_sink.manifest, map(new_sink.prefix.joinpath, skipped)
+                    )
+                    for parent in (path, *path.parents)
+                }
             # Extract diff between temporary destination and real destination
             # with some special handling of newly added files in both the poject
             # and the template.
             with local.cwd(old_copy):
                 # Configure borrowing Git objects from the real destination and
-                # temporary destination of the new template.
-                set_git_alternates(subproject_top, Path(new_copy))
+                # temporary destination of the new template, if any.
+                set_git_alternates(*alternates)
                 # Create an empty file in the temporary destination when the
                 # same file was added in *both* the project and the temporary
                 # destination of the new template. With this minor change, the
@@ -1032,39 +1650,65 @@ class Worker:
                 # destination for such files will use the "update file mode"
                 # instead of the "new file mode" which avoids deleting the file
                 # content previously added in the project.
-                diff_added_cmd = git[
-                    "diff-tree", "-r", "--diff-filter=A", "--name-only"
-                ]
-                for filename in (
-                    set(diff_added_cmd("HEAD", subproject_head).splitlines())
-                ) & set(diff_added_cmd("HEAD", new_copy_head).splitlines()):
-                    f = Path(filename)
-                    f.parent.mkdir(parents=True, exist_ok=True)
-                    f.touch((subproject_top / filename).stat().st_mode)
-                    git("add", "--force", filename)
-                self._git_commit("add new empty files")
+                added_options = ("-r", "--diff-filter=A", "--name-only")
+                for filename in set(
+                    backend.diff_tree(
+                        old_copy, "HEAD", subproject_head, *added_options
+                    ).splitlines()
+                ) & set(
+                    backend.diff_tree(
+                        old_copy, "HEAD", new_copy_head, *added_options
+                    ).splitlines()
+                ):
+                    mode = (subproject_top / filename).stat().st_mode
+                    if old_sink is None:
+                        f = Path(filename)
+                        f.parent.mkdir(parents=True, exist_ok=True)
+                        f.touch(mode)
+                        git("add", "--force", filename)
+                    else:
+                        # New files are always inside the subproject
+                        old_sink.write_file(
+                            PurePosixPath(normalize_git_path(filename)).relative_to(
+                                old_sink.prefix
+                            ),
+                            b"",
+                            mode,
+                        )
+                if old_sink is None:
+                    self._git_commit("add new empty files")
+                else:
+                    git("update-ref", "HEAD", old_sink.commit("add new empty files"))
                 # Extract diff between temporary destination and real
                 # destination
-                diff_cmd = git[
-                    "diff-tree",
-                    f"--unified={self.context_lines}",
+                diff_options = (
                     "HEAD",
                     subproject_head,
-                ]
+                    f"--unified={self.context_lines}",
+                )
                 try:
-                    diff = diff_cmd("--inter-hunk-context=-1")
+                    diff = backend.diff_tree(
+                        old_copy, *diff_options, "--inter-hunk-context=-1"
+                    )
                 except ProcessExecutionError:
                     print(
                         colors.warn
                         | "Make sure Git >= 2.24 is installed to improve updates.",
                         file=sys.stderr,
                     )
-                    diff = diff_cmd("--inter-hunk-context=0")
-            compared = dircmp(old_copy, new_copy)
+                    diff = backend.diff_tree(
+                        old_copy, *diff_options, "--inter-hunk-context=0"
+                    )
             # Try to apply cached diff into final destination
             with local.cwd(subproject_top):
-                apply_cmd = git["apply", "--reject", "--exclude", self.answers_relpath]
-                ignored_files = git["status", "--ignored", "--porcelain"]()
+                apply_options = [
+                    "--reject",
+                    "--exclude",
+                    str(self.answers_relpath),
+                    "--exclude",
+                    str(self._manifest_relpath),
+                ]
+                ignored_files = backend.status(subproject_top, ignored=True)
                 # returns "!! file1\n !! file2\n"
                 # extra_exclude will contain: ["file1", file2"]
                 extra_exclude = [
@@ -1074,11 +1718,12 @@ class Worker:
                 for skip_pattern in chain(
                     self.skip_if_exists, self.template.skip_if_exists, extra_exclude
                 ):
-                    apply_cmd = apply_cmd["--exclude", skip_pattern]
-                (apply_cmd << diff)(retcode=None)
+                    apply_options.extend(("--exclude", skip_pattern))
+                backend.apply(subproject_top, diff, *apply_options)
                 if self.conflict == "inline":
                     conflicted = []
-                    status = git("status", "--porcelain").strip().splitlines()
+                    rejected = []
+                    status = backend.status(subproject_top).strip().splitlines()
                     for line in status:
                         # Filter merge rejections (part 1/2)
                         if not line.startswith("?? "):
@@ -1091,22 +1736,26 @@ class Worker:
                         if not fname.endswith(".rej"):
                             continue
                         # Remove ".rej" suffix
-                        fname = fname[:-4]
+                        rejected.append(fname[:-4])
+                    if rejected:
                         # Undo possible non-rejected chunks
-                        git("checkout", "--", fname)
+                        git("checkout", "--", *rejected)
+                        objects = sinks.enter_context(GitObjects(old_copy))
+                    for fname in rejected:
+                        # Materialize only rendered files that must be merged
+                        for sink, root, head in (
+                            (old_sink, old_copy, "HEAD"),
+                            (new_sink, new_copy, new_copy_head),
+                        ):
+                            if sink and PurePosixPath(fname) in sink.manifest:
+                                _checkout_blob(objects, head, fname, Path(root, fname))
                         # 3-way-merge the file directly
-                        git(
-                            "merge-file",
-                            "-L",
-                            "before updating",
-                            "-L",
-                            "last update",
-                            "-L",
-                            "after updating",
+                        backend.merge_file(
+                            subproject_top,
                             fname,
                             Path(old_copy) / fname,
                             Path(new_copy) / fname,
-                            retcode=None,
+                            ("before updating", "last update", "after updating"),
                         )
                         # Remove rejection witness
                         Path(f"{fname}.rej").unlink()
@@ -1141,13 +1790,75 @@ class Worker:
                             << "\n".join(input_lines)
                         )()
             # Trigger recursive removal of deleted files in last template version
-            _remove_old_files(subproject_top, compared)
+            _remove_old_files(subproject_top, old_paths, new_paths)
 
         # Run post-migration tasks
         self._execute_tasks(
             self.template.migration_tasks("after", self.subproject.template)  # type: ignore[arg-type]
         )
 
+    def _copy_old_template(
+        self,
+        dst_path: Path,
+        data: AnyByStrDict,
+        sink: RenderSink | None,
+        skip: AbstractSet[PurePosixPath] = frozenset(),
+    ) -> None:
+        """Render the last template version used, with the last answers.
+
+        Args:
+            dst_path:
+                Where to render it.
+            data:
+                Last answers.
+            sink:
+                Where to write rendered files, instead of `dst_path`.
+            skip:
+                Rendered file paths to leave out.
+        """
+        with replace(
+            self,
+            dst_path=dst_path,
+            data=data,
+            defaults=True,
+            quiet=True,
+            src_path=self.subproject.template.url,  # type: ignore[union-attr]
+            vcs_ref=self.subproject.template.commit,  # type: ignore[union-attr]
+            sink=sink,
+            incremental=False,
+            # Throwaway copies can share data with the template clone
+            reflink=True,
+        ) as old_worker:
+            if skip:
+                old_worker._incremental = IncrementalRender(skip=skip)
+            old_worker.run_copy()
+
+    def _previous_manifest(self) -> RenderManifest | None:
+        """Load the subproject render manifest, if it can be trusted.
+
+        It must come from the last template version used, with the same
+        template settings, and answers must not have been edited since.
+        """
+        manifest = RenderManifest.load(
+            self.subproject.local_abspath / self._manifest_relpath
+        )
+        if (
+            manifest is None
+            or manifest.commit != self.subproject.template.commit_hash  # type: ignore[union-attr]
+            or manifest.config != self._config_fingerprint()
+        ):
+            return None
+        answers = manifest.files.get(self.answers_relpath.as_posix())
+        try:
+            answers_sha = git_blob_hash(
+                (self.subproject.local_abspath / self.answers_relpath).read_bytes()
+            )
+        except OSError:
+            return None
+        if answers is None or answers.sha != answers_sha:
+            return None
+        return manifest
+
     def _git_initialize_repo(self) -> None:
         """Initialize a git repository in the current directory."""
         git = get_git()
@@ -1230,48 +1941,304 @@ def run_update(
     return worker
 
 
-def _remove_old_files(prefix: Path, cmp: dircmp[str], rm_common: bool = False) -> None:
+@dataclass
+class UpdateResult:
+    """Outcome of updating one subproject with [run_update_many][copier.main.run_update_many].
+
+    Attributes:
+        dst_path:
+            Path to the subproject.
+
+        old_version:
+            Template version the subproject was updated from, if known.
+
+        new_version:
+            Template version the subproject was updated to, if known.
+
+        error:
+            Description of the error that prevented updating the subproject, or
+            `None` if it was updated successfully.
+    """
+
+    dst_path: Path
+    old_version: str | None = None
+    new_version: str | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Tell if the subproject was updated successfully."""
+        return self.error is None
+
+
+def run_update_many(
+    dst_paths: Iterable[StrOrPath],
+    data: AnyByStrDict | None = None,
+    jobs: int | None = None,
+    **kwargs: Any,
+) -> list[UpdateResult]:
+    """Update several subprojects, each one from its template.
+
+    Every distinct template version is cloned and parsed only once, and shared
+    by all the subprojects that need it through a
+    [TemplateRegistry][copier.template.TemplateRegistry]. Then, subprojects are
+    updated in a pool of up to `jobs` processes (one per CPU by default).
+
+    A failure updating one subproject doesn't stop the others. Questions are
+    never asked interactively, so default answers are used for new questions.
+
+    See [Worker][copier.main.Worker] fields to understand this function's args.
+
+    Returns:
+        One result for each subproject, in the same order as `dst_paths`.
+    """
+    if data is not None:
+        kwargs["data"] = data
+    kwargs.update(defaults=True, overwrite=True)
+    paths = [Path(dst_path) for dst_path in dst_paths]
+    results: dict[int, UpdateResult] = {}
+    with TemplateRegistry() as registry:
+        # Resolve every template before spreading the work, so it happens once
+        for index, dst_path in enumerate(paths):
+            if failure := _resolve_templates(registry, dst_path, kwargs):
+                results[index] = failure
+        pending = [index for index in range(len(paths)) if index not in results]
+        if jobs == 1 or len(pending) < 2:
+            for index in pending:
+                results[index] = _update_one(paths[index], kwargs)
+        else:
+            with ProcessPoolExecutor(
+                max_workers=jobs,
+                initializer=_init_update_process,
+                initargs=(registry.templates,),
+            ) as pool:
+                futures = {
+                    index: pool.submit(_update_one, paths[index], kwargs)
+                    for index in pending
+                }
+                for index, future in futures.items():
+                    results[index] = future.result()
+    return [results[index] for index in range(len(paths))]
+
+
+def _resolve_templates(
+    registry: TemplateRegistry, dst_path: Path, kwargs: AnyByStrDict
+) -> UpdateResult | None:
+    """Resolve the old and new templates of a subproject in the registry.
+
+    Return a failed result if they cannot be resolved.
+    """
+    try:
+        with Worker(dst_path=dst_path, **kwargs) as worker:
+            for template in (worker.subproject.template, worker.template):
+                if template is not None:
+                    registry.resolve(template)
+    except Exception as error:
+        return UpdateResult(dst_path=dst_path, error=_describe_error(error))
+    return None
+
+
+def _init_update_process(templates: Mapping[TemplateKey, Template]) -> None:
+    """Share the already resolved templates in a subprocess."""
+    TemplateRegistry(templates).activate()
+
+
+def _update_one(dst_path: Path, kwargs: AnyByStrDict) -> UpdateResult:
+    """Update one subproject, reporting errors instead of raising them."""
+    result = UpdateResult(dst_path=dst_path)
+    try:
+        with Worker(dst_path=dst_path, **kwargs) as worker:
+            if worker.subproject.template:
+                result.old_version = _version_str(worker.subproject.template)
+            worker.run_update()
+            result.new_version = _version_str(worker.template)
+    except Exception as error:
+        result.error = _describe_error(error)
+    return result
+
+
+def _version_str(template: Template) -> str | None:
+    return None if template.version is None else str(template.version)
+
+
+def _describe_error(error: Exception) -> str:
+    if isinstance(error, UserMessageError):
+        return "\n".join(map(str, error.args))
+    return f"{type(error).__name__}: {error}"
+
+
+def _walk_paths(root: Path) -> Manifest:
+    """Get all paths found in a rendered copy, except Git's own files.
+
+    Only directories are told apart from files in the resulting modes.
+    """
+    result: Manifest = {}
+    for folder, dirs, files in os.walk(root):
+        if folder == str(root) and ".git" in dirs:
+            dirs.remove(".git")
+        relfolder = PurePosixPath(Path(folder).relative_to(root).as_posix())
+        result.update((relfolder / name, stat.S_IFDIR) for name in dirs)
+        result.update((relfolder / name, stat.S_IFREG) for name in files)
+    return result
+
+
+def _tree_blobs(repo: Path, tree: str) -> dict[str, tuple[int, str]]:
+    """List all blobs in a Git tree.
+
+    Args:
+        repo:
+            Repository where the tree lives.
+        tree:
+            Hash of the tree.
+
+    Returns:
+        POSIX mode and hash of each blob, by path.
+    """
+    result = {}
+    for entry in get_git(repo)("ls-tree", "-r", "-z", tree).split("\0"):
+        if not entry:
+            continue
+        info, path = entry.split("\t", 1)
+        mode, kind, sha = info.split()
+        if kind == "blob":
+            result[path] = (int(mode, 8), sha)
+    return result
+
+
+def _removed_paths(
+    repo: Path, subdir: Path, manifest: RenderManifest, tree: Mapping[str, Any]
+) -> list[str]:
+    """Find paths rendered last time that were removed from the project since.
+
+    Paths that Git ignores aren't considered removed.
+
+    Args:
+        repo:
+            Repository of the project.
+        subdir:
+            Path of the subproject inside the repository.
+        manifest:
+            Manifest of the last render.
+        tree:
+            Blobs in the project, by path.
+
+    Returns:
+        Removed paths, relative to the repository root.
+    """
+    prefix = PurePosixPath(subdir.as_posix())
+    missing = [
+        path
+        for path in ((prefix / name).as_posix() for name in manifest.files)
+        if path not in tree
+    ]
+    if not missing:
+        return []
+    ignored = set(
+        (get_git(repo)["check-ignore", "-z", "--stdin"] << "\0".join(missing))(
+            retcode=(0, 1)
+        ).split("\0")
+    )
+    return [path for path in missing if path not in ignored]
+
+
+def _commit_unignored(sink: GitTreeSink) -> None:
+    """Commit everything in a sink that Git wouldn't ignore, as `HEAD`.
+
+    This is what `git add .` would commit after writing the sink to disk, so
+    `.gitignore` files are checked out to know what to leave out.
+
+    Args:
+        sink:
+            Where the old template was rendered. Its repository `HEAD` will
+            point to the new commit.
+    """
+    git = get_git(sink.repo)
+    head = sink.commit("old template")
+    files = [
+        str(path) for path, mode in sink.manifest.items() if not stat.S_ISDIR(mode)
+    ]
+    gitignores = [path for path in files if PurePosixPath(path).name == ".gitignore"]
+    if gitignores:
+        git("checkout", head, "--", *gitignores)
+    ignored = (git["check-ignore", "--no-index", "-z", "--stdin"] << "\0".join(files))(
+        retcode=(0, 1)
+    ).split("\0")
+    if ignored := [path for path in ignored if path]:
+        sink.discard(map(PurePosixPath, ignored))
+        head = sink.commit("old template")
+    git("update-ref", "HEAD", head)
+
+
+def _checkout_blob(objects: GitObjects, commit: str, path: str, dst: Path) -> None:
+    """Write one committed file, without touching the index.
+
+    Args:
+        objects:
+            Reader of the repository where the commit lives.
+        commit:
+            Commit where the file is found.
+        path:
+            File path inside the commit.
+        dst:
+            Where to write it.
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    dst.write_bytes(objects.read_blob(f"{commit}:{path}"))
+
+
+def _deletion_plan(
+    old_paths: Manifest, new_paths: AbstractSet[PurePosixPath]
+) -> tuple[list[PurePosixPath], list[PurePosixPath]]:
+    """Plan what to remove after rendering a new template version.
+
+    Only path manifests are compared, so nothing is read from disk.
+
+    Args:
+        old_paths:
+            Modes of paths rendered by the old template.
+        new_paths:
+            Paths rendered by the new template.
+
+    Returns:
+        Files only rendered by the old template, and directories only rendered
+        by it, with children always before their parents.
+    """
+    files: list[PurePosixPath] = []
+    dirs: set[PurePosixPath] = set()
+    for path, mode in old_paths.items():
+        if stat.S_ISDIR(mode):
+            dirs.add(path)
+        elif path not in new_paths:
+            files.append(path)
+            dirs.update(path.parents)
+    dirs.difference_update(new_paths)
+    dirs.discard(PurePosixPath("."))
+    return files, sorted(dirs, key=lambda path: len(path.parts), reverse=True)
+
+
+def _remove_old_files(
+    prefix: Path, old_paths: Manifest, new_paths: AbstractSet[PurePosixPath]
+) -> None:
     """Remove files and directories only found in "old" template.
 
-    This is an internal helper method used to process a comparison of 2
-    directories, where the left one is considered the "old" one, and the
-    right one is the "new" one.
+    This is an internal helper method used to compare the paths rendered by
+    the old template with the paths rendered by the new one.
 
-    Then, it will recursively try to remove anything that is only in the old
-    directory.
+    Files only rendered by the old template are removed in one batch, and
+    then their directories are removed too if they end empty, bottom-up.
 
     Args:
         prefix:
-            Where we start removing. It can be different from the directories
-            being compared.
-        cmp:
-            The comparison result.
-        rm_common:
-            Should we remove common files and directories?
+            Where we start removing.
+        old_paths:
+            Modes of paths rendered by the old template, relative to `prefix`.
+        new_paths:
+            Paths rendered by the new template, relative to `prefix`.
     """
-    # Gather files and dirs to remove
-    to_rm = []
-    subdirs = {}
-    with suppress(NotADirectoryError, FileNotFoundError):
-        to_rm = cmp.left_only
-        if rm_common:
-            to_rm += cmp.common_files + cmp.common_dirs
-        subdirs = cmp.subdirs
-    # Remove files found only in old template copy
-    for name in to_rm:
-        target = prefix / name
-        if target.is_file():
+    files, dirs = _deletion_plan(old_paths, new_paths)
+    for path in files:
+        if (target := prefix / path).is_file():
             target.unlink()
-        else:
-            # Recurse in dirs totally removed in latest template
-            _remove_old_files(target, dircmp(Path(cmp.left, name), target), True)
-            # Remove subdir if it ends empty
-            with suppress(OSError):
-                target.rmdir()  # Raises if dir not empty
-    # Recurse
-    for key, value in subdirs.items():
-        subdir = prefix / key
-        _remove_old_files(subdir, value)
-        # Remove subdir if it ends empty
+    for path in dirs:
         with suppress(OSError):
-            subdir.rmdir()  # Raises if dir not empty
+            (prefix / path).rmdir()  # Raises if dir not empty
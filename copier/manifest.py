@@ -0,0 +1,165 @@
+"""Fingerprints of rendered files, used for incremental updates.
+
+When rendering incrementally, Copier keeps a render manifest next to the
+answers file. For each rendered file, it records what the output depended on:
+which template sources were read, which context variables were referenced, and
+a hash of the result. An incremental update compares those fingerprints with
+the new template version and answers, and only renders files that changed.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from contextlib import suppress
+from hashlib import sha1, sha256
+from pathlib import Path, PurePosixPath
+from typing import AbstractSet, Any
+
+from pydantic import ValidationError
+from pydantic.dataclasses import dataclass
+from pydantic_core import to_json, to_jsonable_python
+
+from .tools import CHUNK_SIZE
+
+MANIFEST_VERSION = 1
+
+
+def git_blob_hash(content: bytes) -> str:
+    """Get the Git object hash of a blob, without calling Git.
+
+    Args:
+        content: The blob contents.
+    """
+    return sha1(b"blob %d\0%s" % (len(content), content)).hexdigest()  # noqa: S324
+
+
+def git_file_hash(path: Path) -> str:
+    """Get the Git object hash of a file, reading it in chunks.
+
+    Args:
+        path: The file.
+    """
+    with path.open("rb") as file:
+        digest = sha1(b"blob %d\0" % os.fstat(file.fileno()).st_size)  # noqa: S324
+        while chunk := file.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint(value: Any) -> str:
+    """Get a stable hash of any value.
+
+    Values that cannot be serialized as JSON are hashed by their `repr`, which
+    might change between runs. That only makes them look changed, though.
+
+    Args:
+        value: What to hash.
+    """
+    serialized = json.dumps(
+        to_jsonable_python(value, fallback=repr), sort_keys=True, default=repr
+    )
+    return sha256(serialized.encode()).hexdigest()
+
+
+@dataclass
+class RenderedFile:
+    """Fingerprint of one rendered file.
+
+    Attributes:
+        src: Path of the source file, relative to the template root.
+        mode: POSIX mode of the source file.
+        sha: Git object hash of the rendered contents.
+        templates:
+            Names of all template sources read to render it, or `None` if they
+            cannot be known. Then, the file is always rendered again.
+        variables: Names of context variables it may reference.
+    """
+
+    src: str
+    mode: int
+    sha: str
+    templates: tuple[str, ...] | None = None
+    variables: tuple[str, ...] = ()
+
+
+@dataclass
+class RenderManifest:
+    """Fingerprints of everything rendered in a subproject.
+
+    Attributes:
+        commit: Template commit hash used to render.
+        config: Fingerprint of the template settings and Jinja environment.
+        sources: Git object hash of each template source, by name.
+        context: Fingerprint of each context variable value, by name.
+        files: Fingerprint of each rendered file, by POSIX path relative to
+            the subproject root.
+        version: Format version of the manifest.
+    """
+
+    commit: str | None
+    config: str
+    sources: dict[str, str]
+    context: dict[str, str]
+    files: dict[str, RenderedFile]
+    version: int = MANIFEST_VERSION
+
+    @classmethod
+    def load(cls, path: Path) -> RenderManifest | None:
+        """Load a manifest, if it exists and is valid.
+
+        Args:
+            path: Where the manifest is stored.
+        """
+        with suppress(OSError, ValidationError, ValueError):
+            result = cls(**json.loads(path.read_bytes()))
+            if result.version == MANIFEST_VERSION:
+                return result
+        return None
+
+    def dump(self, path: Path) -> None:
+        """Store the manifest.
+
+        Args:
+            path: Where to store it.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(to_json(self, indent=1) + b"\n")
+
+
+class IncrementalRender:
+    """State of an incremental render.
+
+    Incremental renders can leave some files alone, if they would produce
+    exactly the same contents they produced last time.
+
+    Attributes:
+        previous:
+            Manifest of the last render, when trusted. Files whose fingerprints
+            didn't change since then are skipped.
+        skip:
+            Rendered paths that must be skipped anyway.
+        sources:
+            Git object hashes of template sources read so far, by name.
+        context:
+            Fingerprints of context variables read so far, by name.
+        files:
+            Fingerprints of files rendered or skipped so far, by path.
+        skipped:
+            Rendered paths skipped so far.
+    """
+
+    def __init__(
+        self,
+        previous: RenderManifest | None = None,
+        skip: AbstractSet[PurePosixPath] = frozenset(),
+    ) -> None:
+        self.previous = previous
+        self.skip = skip
+        self.sources: dict[str, str] = {}
+        self.context: dict[str, str] = {}
+        self.files: dict[str, RenderedFile] = {}
+        self.skipped: set[PurePosixPath] = set()
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> IncrementalRender:
+        return self
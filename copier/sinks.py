@@ -0,0 +1,473 @@
+"""Destinations where rendered templates are written.
+
+A [Worker][copier.main.Worker] writes to its `dst_path` by default. Give it a
+different sink to render somewhere else, like into memory or straight into Git
+objects, without touching the filesystem.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import stat
+import sys
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import count
+from pathlib import Path, PurePath, PurePosixPath
+from subprocess import PIPE, Popen
+from threading import BoundedSemaphore, Event, Lock
+from types import TracebackType
+from typing import IO, Any, Callable, Iterable, cast
+
+from plumbum import ProcessExecutionError
+
+from .tools import CHUNK_SIZE, clone_file
+from .types import StrOrPath
+from .vcs import GIT_USER_EMAIL, GIT_USER_NAME, get_git, get_git_backend
+
+Manifest = dict[PurePosixPath, int]
+
+
+def _posix(path: PurePath) -> PurePosixPath:
+    return PurePosixPath(path.as_posix())
+
+
+class RenderSink(ABC):
+    """Destination of a rendered template.
+
+    Paths received are always relative to the destination root.
+
+    Sinks are shared resources: copying a worker never copies its sink.
+    """
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> RenderSink:
+        return self
+
+    @abstractmethod
+    def write_file(self, path: PurePath, content: bytes, mode: int) -> None:
+        """Write a rendered file.
+
+        Args:
+            path: Where to write it.
+            content: Rendered contents.
+            mode: POSIX mode of the file.
+        """
+
+    def copy_file(self, path: PurePath, src: Path, mode: int) -> None:
+        """Write a template file that is copied as it is, without rendering.
+
+        By default, it is read and written like any rendered file. Sinks can
+        stream it instead, so big files are never loaded whole into memory.
+
+        Args:
+            path: Where to write it.
+            src: The template file.
+            mode: POSIX mode of the file.
+        """
+        self.write_file(path, src.read_bytes(), mode)
+
+    @abstractmethod
+    def write_symlink(self, path: PurePath, target: PurePath, mode: int) -> None:
+        """Write a rendered symlink.
+
+        Args:
+            path: Where to write it.
+            target: Where it points to.
+            mode: POSIX mode of the symlink.
+        """
+
+    @abstractmethod
+    def make_dir(self, path: PurePath) -> None:
+        """Create a rendered directory, without contents.
+
+        Args:
+            path: Where to create it.
+        """
+
+    def flush(self) -> None:  # noqa: B027
+        """Wait until everything received so far is written.
+
+        Workers call it after rendering. By default, it does nothing.
+        """
+
+
+class DirectorySink(RenderSink):
+    """Write rendered templates into a directory.
+
+    Attributes:
+        root: The destination directory.
+        reflink:
+            Copy template files with [clone_file][copier.tools.clone_file],
+            sharing their data where the filesystem supports it.
+    """
+
+    def __init__(self, root: Path, reflink: bool = False) -> None:
+        self.root = root
+        self.reflink = reflink
+        # Directories known to exist, so each one is created only once
+        self._dirs: set[Path] = set()
+
+    def _make_dirs(self, path: Path) -> None:
+        """Create a directory and its parents, unless done already."""
+        if path not in self._dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._dirs.add(path)
+
+    def _file_path(self, path: PurePath) -> Path:
+        """Get where to write a file, ready to be replaced."""
+        dst_abspath = self.root / path
+        self._make_dirs(dst_abspath.parent)
+        if dst_abspath.is_symlink():
+            # Writing to a symlink just writes to its target, so if we want to
+            # replace a symlink with a file we have to unlink it first
+            dst_abspath.unlink()
+        return dst_abspath
+
+    def write_file(self, path: PurePath, content: bytes, mode: int) -> None:
+        """Write a rendered file, replacing any previous one."""
+        dst_abspath = self._file_path(path)
+        dst_abspath.write_bytes(content)
+        dst_abspath.chmod(mode)
+
+    def copy_file(self, path: PurePath, src: Path, mode: int) -> None:
+        """Copy a template file, replacing any previous one.
+
+        The copy is streamed, with `sendfile` or similar where available.
+        """
+        dst_abspath = self._file_path(path)
+        if self.reflink:
+            clone_file(src, dst_abspath)
+        else:
+            shutil.copyfile(src, dst_abspath)
+        dst_abspath.chmod(mode)
+
+    def write_symlink(self, path: PurePath, target: PurePath, mode: int) -> None:
+        """Write a rendered symlink, replacing any previous file."""
+        dst_abspath = self.root / path
+        # symlink_to doesn't overwrite existing files, so delete it first
+        if dst_abspath.is_symlink() or dst_abspath.exists():
+            dst_abspath.unlink()
+        self._make_dirs(dst_abspath.parent)
+        dst_abspath.symlink_to(target)
+        if sys.platform == "darwin":
+            # Only macOS supports permissions on symlinks.
+            # Other platforms just copy the permission of the target
+            dst_abspath.lchmod(mode)
+
+    def make_dir(self, path: PurePath) -> None:
+        """Create a rendered directory, if missing."""
+        self._make_dirs(self.root / path)
+
+    def flush(self) -> None:
+        """Forget which directories exist, since they may be removed later."""
+        self._dirs.clear()
+
+
+class WriteBackSink(RenderSink):
+    """Write into another sink in the background.
+
+    Everything received is queued and written by a pool of threads, so
+    rendering goes on meanwhile. That matters on network filesystems, where
+    each write may take milliseconds. A few writes per thread are queued at
+    most, so rendered contents don't pile up in memory.
+
+    Writes to different paths may happen in any order. Once one fails, queued
+    ones are skipped, and the next call raises the first error found.
+
+    Attributes:
+        sink: Where everything is written. It must be safe to use from several
+            threads.
+        jobs: How many threads write at once.
+    """
+
+    def __init__(self, sink: RenderSink, jobs: int = 1) -> None:
+        self.sink = sink
+        self.jobs = jobs
+        self._pool: ThreadPoolExecutor | None = None
+        self._pending: list[Future[None]] = []
+        self._slots = BoundedSemaphore(jobs * 4)
+        self._failed = Event()
+
+    def _run(self, method: Callable[..., None], *args: Any) -> None:
+        try:
+            if not self._failed.is_set():
+                method(*args)
+        except BaseException:
+            self._failed.set()
+            raise
+        finally:
+            self._slots.release()
+
+    def _submit(self, method: Callable[..., None], *args: Any) -> None:
+        if self._failed.is_set():
+            self.flush()
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                self.jobs, thread_name_prefix="copier-write"
+            )
+        self._slots.acquire()
+        self._pending.append(self._pool.submit(self._run, method, *args))
+
+    def write_file(self, path: PurePath, content: bytes, mode: int) -> None:
+        """Queue writing a rendered file."""
+        self._submit(self.sink.write_file, path, content, mode)
+
+    def copy_file(self, path: PurePath, src: Path, mode: int) -> None:
+        """Queue copying a template file."""
+        self._submit(self.sink.copy_file, path, src, mode)
+
+    def write_symlink(self, path: PurePath, target: PurePath, mode: int) -> None:
+        """Queue writing a rendered symlink."""
+        self._submit(self.sink.write_symlink, path, target, mode)
+
+    def make_dir(self, path: PurePath) -> None:
+        """Queue creating a rendered directory."""
+        self._submit(self.sink.make_dir, path)
+
+    def flush(self) -> None:
+        """Wait until everything queued is written, and stop the threads.
+
+        Raises:
+            Exception: The first error found while writing, in queue order.
+        """
+        pending, self._pending = self._pending, []
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self._failed.clear()
+        self.sink.flush()
+        for future in pending:
+            future.result()
+
+
+class MemorySink(RenderSink):
+    """Keep rendered templates in memory.
+
+    Attributes:
+        entries:
+            POSIX mode and contents of everything rendered, by path. Contents
+            of symlinks are their targets, and directories have no contents.
+    """
+
+    def __init__(self) -> None:
+        self.entries: dict[PurePosixPath, tuple[int, bytes]] = {}
+
+    @property
+    def manifest(self) -> Manifest:
+        """Get the POSIX mode of everything rendered, by path."""
+        return {path: mode for path, (mode, _) in self.entries.items()}
+
+    def write_file(self, path: PurePath, content: bytes, mode: int) -> None:
+        """Keep a rendered file."""
+        self.entries[_posix(path)] = (mode, content)
+
+    def write_symlink(self, path: PurePath, target: PurePath, mode: int) -> None:
+        """Keep a rendered symlink."""
+        self.entries[_posix(path)] = (
+            stat.S_IFLNK | stat.S_IMODE(mode),
+            str(target).encode(),
+        )
+
+    def make_dir(self, path: PurePath) -> None:
+        """Keep a rendered directory."""
+        self.entries[_posix(path)] = (stat.S_IFDIR | 0o755, b"")
+
+
+def _fast_import_path(path: PurePosixPath) -> bytes:
+    """Quote a path for `git fast-import`, if needed."""
+    result = str(path)
+    if result.startswith('"') or "\n" in result:
+        escaped = result.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        result = f'"{escaped}"'
+    return result.encode()
+
+
+class GitTreeSink(RenderSink):
+    """Write rendered templates straight into Git objects.
+
+    Blobs are streamed to a persistent `git fast-import` process as soon as
+    they are rendered. Nothing is written to the working tree or the index.
+    Then, [commit][copier.sinks.GitTreeSink.commit] writes the tree and a
+    commit with everything received so far. Use it as a context manager, to
+    stop the process when leaving the context.
+
+    Attributes:
+        repo: Path to the repository where objects are written.
+        ref: The reference that points to the last commit.
+        prefix: Path of the destination root inside the repository.
+    """
+
+    def __init__(
+        self,
+        repo: StrOrPath,
+        ref: str = "refs/copier/tree",
+        prefix: StrOrPath = ".",
+    ) -> None:
+        self.repo = Path(repo)
+        self.ref = ref
+        self.prefix = _posix(Path(prefix))
+        # Blobs are referenced by mark when streamed, or by hash otherwise
+        self._entries: dict[PurePosixPath, tuple[int, int | str]] = {}
+        self._marks = count(1)
+        self._command = get_git(self.repo)[
+            "fast-import", "--quiet", "--force", "--done"
+        ]
+        self._process: Popen[bytes] | None = None
+        # Files may be written from several threads
+        self._lock = Lock()
+
+    def __enter__(self) -> GitTreeSink:
+        return self
+
+    def __exit__(
+        self,
+        type: type[BaseException] | None,
+        value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @property
+    def manifest(self) -> Manifest:
+        """Get the POSIX mode of everything written, by repository path."""
+        return {path: mode for path, (mode, _) in self._entries.items()}
+
+    def _stdin(self) -> IO[bytes]:
+        if self._process is None:
+            self._process = cast(
+                "Popen[bytes]",
+                self._command.popen(stdin=PIPE, stdout=PIPE, stderr=PIPE),
+            )
+        assert self._process.stdin
+        return self._process.stdin
+
+    def _write(self, data: bytes) -> None:
+        try:
+            self._stdin().write(data)
+        except BrokenPipeError:
+            self._fail()
+
+    def _fail(self) -> None:
+        assert self._process
+        _, stderr = self._process.communicate()
+        raise ProcessExecutionError(
+            self._command.formulate(), self._process.returncode, "", stderr.decode()
+        )
+
+    def _write_blob(self, path: PurePath, content: bytes, mode: int) -> None:
+        with self._lock:
+            mark = next(self._marks)
+            self._write(
+                b"blob\nmark :%d\ndata %d\n%s\n" % (mark, len(content), content)
+            )
+            self._entries[self.prefix / _posix(path)] = (mode, mark)
+
+    def write_file(self, path: PurePath, content: bytes, mode: int) -> None:
+        """Stream a rendered file as a blob."""
+        self._write_blob(path, content, stat.S_IFREG | stat.S_IMODE(mode))
+
+    def copy_file(self, path: PurePath, src: Path, mode: int) -> None:
+        """Stream a template file as a blob, in chunks."""
+        with src.open("rb") as file, self._lock:
+            remaining = os.fstat(file.fileno()).st_size
+            mark = next(self._marks)
+            self._write(b"blob\nmark :%d\ndata %d\n" % (mark, remaining))
+            while remaining:
+                chunk = file.read(min(remaining, CHUNK_SIZE))
+                if not chunk:
+                    raise OSError(f"{src} was truncated while copying it")
+                self._write(chunk)
+                remaining -= len(chunk)
+            self._write(b"\n")
+            self._entries[self.prefix / _posix(path)] = (
+                stat.S_IFREG | stat.S_IMODE(mode),
+                mark,
+            )
+
+    def write_symlink(self, path: PurePath, target: PurePath, mode: int) -> None:
+        """Stream a rendered symlink as a blob."""
+        self._write_blob(path, str(target).encode(), stat.S_IFLNK | stat.S_IMODE(mode))
+
+    def add_blob(self, path: PurePath, sha: str, mode: int) -> None:
+        """Add a blob that the repository can already find, by its hash.
+
+        Args:
+            path: Where to add it.
+            sha: Hash of the blob.
+            mode: POSIX mode of the file.
+        """
+        with self._lock:
+            self._entries[self.prefix / _posix(path)] = (mode, sha)
+
+    def make_dir(self, path: PurePath) -> None:
+        """Remember a rendered directory. Git doesn't track it, though."""
+        self._entries[self.prefix / _posix(path)] = (stat.S_IFDIR | 0o755, 0)
+
+    def discard(self, paths: Iterable[PurePosixPath]) -> None:
+        """Leave some paths out of later commits.
+
+        Args:
+            paths: Repository paths to forget.
+        """
+        for path in paths:
+            self._entries.pop(path, None)
+
+    def commit(self, message: str = "Copier tree", parent: str | None = None) -> str:
+        """Write a commit with everything received so far.
+
+        Args:
+            message: The commit message.
+            parent: The parent commit, if any.
+
+        Returns:
+            The new commit hash, which [ref][copier.sinks.GitTreeSink] points to.
+        """
+        encoded_message = message.encode()
+        lines = [
+            b"commit %s\ncommitter %s <%s> %d +0000\ndata %d\n%s\n"
+            % (
+                self.ref.encode(),
+                GIT_USER_NAME.encode(),
+                GIT_USER_EMAIL.encode(),
+                time.time(),
+                len(encoded_message),
+                encoded_message,
+            )
+        ]
+        if parent:
+            lines.append(b"from %s\n" % parent.encode())
+        lines.append(b"deleteall\n")
+        for path, (mode, blob) in sorted(self._entries.items()):
+            if stat.S_ISDIR(mode):
+                continue
+            if stat.S_ISLNK(mode):
+                git_mode = b"120000"
+            else:
+                git_mode = b"100755" if mode & stat.S_IXUSR else b"100644"
+            dataref = b":%d" % blob if isinstance(blob, int) else blob.encode()
+            lines.append(b"M %s %s %s\n" % (git_mode, dataref, _fast_import_path(path)))
+        # Wait until the commit is visible to other Git processes
+        lines.append(b"\ncheckpoint\nprogress copier\n")
+        self._write(b"".join(lines))
+        process = self._process
+        assert process and process.stdout
+        try:
+            process.stdin.flush()  # type: ignore[union-attr]
+        except BrokenPipeError:
+            self._fail()
+        if process.stdout.readline() != b"progress copier\n":
+            self._fail()
+        return get_git_backend().rev_parse(self.repo, self.ref)
+
+    def close(self) -> None:
+        """Stop the `git fast-import` process, if running."""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        _, stderr = process.communicate(b"done\n")
+        if process.returncode:
+            raise ProcessExecutionError(
+                self._command.formulate(), process.returncode, "", stderr.decode()
+            )
@@ -11,12 +11,11 @@ from pathlib import Path
 from typing import Callable
 
 import yaml
-from plumbum.machines import local
 from pydantic.dataclasses import dataclass
 
-from .template import Template
+from .template import Template, TemplateRegistry
 from .types import AbsolutePath, AnyByStrDict, VCSTypes
-from .vcs import get_git, is_in_git_repo
+from .vcs import get_git_backend, is_in_git_repo
 
 
 @dataclass
@@ -42,8 +41,7 @@ class Subproject:
         Only applicable for VCS-tracked templates.
         """
         if self.vcs == "git":
-            with local.cwd(self.local_abspath):
-                return bool(get_git()("status", "--porcelain").strip())
+            return bool(get_git_backend().status(self.local_abspath).strip())
         return False
 
     def _cleanup(self) -> None:
@@ -76,6 +74,8 @@ class Subproject:
         last_url = self.last_answers.get("_src_path")
         last_ref = self.last_answers.get("_commit")
         if last_url:
+            if registry := TemplateRegistry.active():
+                return registry.get(last_url, last_ref, False)
             result = Template(url=last_url, ref=last_ref)
             self._cleanup_hooks.append(result._cleanup)
             return result
@@ -2,15 +2,28 @@
 
 from __future__ import annotations
 
+import os
 import re
 import sys
 from collections import ChainMap, defaultdict
 from contextlib import suppress
 from dataclasses import field
 from functools import cached_property
-from pathlib import Path, PurePosixPath
+from itertools import takewhile
+from pathlib import Path, PurePath, PurePosixPath
 from shutil import rmtree
-from typing import Any, Literal, Mapping, Sequence
+from threading import Lock
+from types import TracebackType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterable,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 from warnings import warn
 
 import dunamai
@@ -28,9 +41,20 @@ from .errors import (
     UnknownCopierVersionWarning,
     UnsupportedVersionError,
 )
-from .tools import copier_version, handle_remove_readonly
+from .tools import copier_version, file_lock, handle_remove_readonly
 from .types import AnyByStrDict, VCSTypes
-from .vcs import checkout_latest_tag, clone, get_git, get_repo
+from .vcs import (
+    clone,
+    clone_cache_enabled,
+    get_git,
+    get_git_backend,
+    get_repo,
+    latest_remote_tag,
+    update_submodules,
+)
+
+if TYPE_CHECKING:  # always false
+    from .jinja import CachedSandboxedEnvironment
 
 # Default list of files in the template to exclude from the rendered project
 DEFAULT_EXCLUDE: tuple[str, ...] = (
@@ -46,6 +70,9 @@ DEFAULT_EXCLUDE: tuple[str, ...] = (
 
 DEFAULT_TEMPLATES_SUFFIX = ".jinja"
 
+# Submodules can be initialized while rendering in parallel
+_submodules_lock = Lock()
+
 
 def filter_config(data: AnyByStrDict) -> tuple[AnyByStrDict, AnyByStrDict]:
     """Separates config and questions data."""
@@ -62,7 +89,9 @@ def filter_config(data: AnyByStrDict) -> tuple[AnyByStrDict, AnyByStrDict]:
     return config_data, questions_data
 
 
-def load_template_config(conf_path: Path, quiet: bool = False) -> AnyByStrDict:
+def load_template_config(
+    conf_path: Path, quiet: bool = False, includes: list[str] | None = None
+) -> AnyByStrDict:
     """Load the `copier.yml` file.
 
     This is like a simple YAML load, but applying all specific quirks needed
@@ -74,6 +103,8 @@ def load_template_config(conf_path: Path, quiet: bool = False) -> AnyByStrDict:
     Params:
         conf_path: The path to the `copier.yml` file.
         quiet: Used to configure the exception.
+        includes: If given, glob patterns of all `!include` tags found are
+            appended to it.
 
     Raises:
         InvalidConfigFileError: When the file is formatted badly.
@@ -88,6 +119,8 @@ def load_template_config(conf_path: Path, quiet: bool = False) -> AnyByStrDict:
         include_file = str(loader.construct_scalar(node))
         if PurePosixPath(include_file).is_absolute():
             raise ValueError("YAML include file path must be a relative path")
+        if includes is not None:
+            includes.append(include_file)
         return [
             yaml.load(path.read_bytes(), Loader=type(loader))
             for path in conf_path.parent.glob(include_file)
@@ -115,6 +148,59 @@ def load_template_config(conf_path: Path, quiet: bool = False) -> AnyByStrDict:
     return dict(ChainMap(dict(merged_options), *reversed(flattened_result)))
 
 
+def _config_paths(template_root: Path) -> list[Path]:
+    """Find all `copier.yml` file candidates in a template."""
+    return [
+        p
+        for p in template_root.glob("copier.*")
+        if p.is_file() and re.match(r"\.ya?ml", p.suffix, re.I)
+    ]
+
+
+def _sparse_paths(template_root: Path) -> list[str] | None:
+    """Get which directories a template needs, besides root files.
+
+    Only templates that enable [sparse_checkout][] need less than everything.
+    They need their `subdirectory` and the directories of all their includes.
+
+    Args:
+        template_root: Where the template is checked out, maybe partially.
+
+    Returns:
+        The directories needed, or `None` if everything is needed.
+    """
+    conf_paths = _config_paths(template_root)
+    if len(conf_paths) != 1:
+        return None
+    includes: list[str] = []
+    raw_config = load_template_config(conf_paths[0], includes=includes)
+    config_data = filter_config(raw_config)[0]
+    subdirectory = PurePosixPath(config_data.get("subdirectory", ""))
+    if (
+        not config_data.get("sparse_checkout")
+        or subdirectory == PurePosixPath(".")
+        or subdirectory.is_absolute()
+        or ".." in subdirectory.parts
+    ):
+        return None
+    result = [subdirectory.as_posix()]
+    for include in includes:
+        parts = PurePosixPath(include).parent.parts
+        # Directories in a glob can only be found after checking out its root
+        static = list(takewhile(lambda part: not re.search(r"[*?[]", part), parts))
+        if ".." in parts or (len(static) < len(parts) and not static):
+            return None
+        if static:
+            result.append(PurePosixPath(*static).as_posix())
+    return result
+
+
+def _include_root(include: str) -> PurePosixPath:
+    """Get the path that contains every file matched by an include glob."""
+    parts = PurePosixPath(include).parts
+    return PurePosixPath(*takewhile(lambda part: not re.search(r"[*?[]", part), parts))
+
+
 def verify_copier_version(version_str: str) -> None:
     """Raise an error if the current Copier version is less than the given version.
 
@@ -253,15 +339,16 @@ class Template:
 
         It reads [the `copier.yml` file][the-copieryml-file].
         """
-        conf_paths = [
-            p
-            for p in self.local_abspath.glob("copier.*")
-            if p.is_file() and re.match(r"\.ya?ml", p.suffix, re.I)
-        ]
+        conf_paths = _config_paths(self.local_abspath)
         if len(conf_paths) > 1:
             raise MultipleConfigFilesError(conf_paths)
         elif len(conf_paths) == 1:
-            return load_template_config(conf_paths[0])
+            includes: list[str] = []
+            result = load_template_config(conf_paths[0], includes=includes)
+            # Included files may be in submodules, which are initialized lazily
+            if self.init_submodules(map(_include_root, includes)):
+                result = load_template_config(conf_paths[0])
+            return result
         return {}
 
     @cached_property
@@ -280,15 +367,14 @@ class Template:
     def commit(self) -> str | None:
         """If the template is VCS-tracked, get its commit description."""
         if self.vcs == "git":
-            with local.cwd(self.local_abspath):
-                return get_git()("describe", "--tags", "--always").strip()
+            return get_git_backend().describe(self.local_abspath)
         return None
 
     @cached_property
     def commit_hash(self) -> str | None:
         """If the template is VCS-tracked, get its commit full hash."""
         if self.vcs == "git":
-            return get_git()("-C", self.local_abspath, "rev-parse", "HEAD").strip()
+            return get_git_backend().rev_parse(self.local_abspath)
         return None
 
     @cached_property
@@ -553,15 +639,105 @@ class Template:
         """
         result = Path(self.url)
         if self.vcs == "git":
-            result = Path(clone(self.url_expanded, self.ref))
-            if self.ref is None:
-                checkout_latest_tag(result, self.use_prereleases)
+            ref = self.ref
+            # Cached clones fetch everything anyway, so it would not help
+            shallow = (
+                ref is None
+                and not os.path.exists(self.url_expanded)
+                and not clone_cache_enabled()
+            )
+            if shallow:
+                # Find the latest remote tag beforehand, to clone only that
+                ref = latest_remote_tag(self.url_expanded, self.use_prereleases)
+            result = Path(
+                clone(
+                    self.url_expanded,
+                    ref,
+                    shallow=shallow,
+                    sparse=_sparse_paths,
+                    # Rendering may not need all submodules
+                    submodules=False,
+                    latest_tag=True,
+                    use_prereleases=self.use_prereleases,
+                )
+            )
         if not result.is_dir():
             raise ValueError("Local template must be a directory.")
         with suppress(OSError):
             result = result.resolve()
         return result
 
+    @cached_property
+    def submodules(self) -> tuple[PurePosixPath, ...]:
+        """Get paths of the top-level submodules of the template.
+
+        They are not initialized when cloning the template. See
+        [init_submodules][copier.template.Template.init_submodules].
+        """
+        if self.vcs != "git" or not (self.local_abspath / ".gitmodules").is_file():
+            return ()
+        entries = get_git()(
+            "-C", self.local_abspath, "ls-files", "--stage", "-z"
+        ).split("\0")
+        return tuple(
+            PurePosixPath(entry.split("\t", 1)[1])
+            for entry in entries
+            if entry.startswith("160000 ")
+        )
+
+    @cached_property
+    def _initialized_submodules(self) -> set[PurePosixPath]:
+        """Get paths of the submodules initialized so far."""
+        return set()
+
+    def init_submodules(self, paths: Iterable[PurePath]) -> bool:
+        """Initialize the submodules needed to use some template paths.
+
+        Submodules inside any of `paths`, or containing any of them, are
+        initialized recursively, unless they were already, or they are outside
+        a sparse checkout.
+
+        Several processes can share the same clone, so a lock file in the Git
+        directory of the clone serializes them.
+
+        Args:
+            paths: Paths relative to the template root.
+
+        Returns:
+            Whether any submodule was initialized.
+        """
+        wanted = {PurePosixPath(PurePath(path).as_posix()) for path in paths}
+        candidates = [
+            submodule
+            for submodule in self.submodules
+            if submodule not in self._initialized_submodules
+            and any(
+                submodule == path
+                or path in submodule.parents
+                or submodule in path.parents
+                for path in wanted
+            )
+        ]
+        if not candidates:
+            return False
+        lock = self.local_abspath / ".git" / "copier-submodules.lock"
+        with _submodules_lock, file_lock(lock):
+            # Another thread or process may have initialized them meanwhile
+            missing = []
+            for submodule in candidates:
+                submodule_abspath = self.local_abspath / submodule
+                if submodule in self._initialized_submodules:
+                    continue
+                if (submodule_abspath / ".git").exists():
+                    self._initialized_submodules.add(submodule)
+                elif submodule_abspath.is_dir():
+                    missing.append(submodule)
+            if not missing:
+                return False
+            update_submodules(self.local_abspath, map(str, missing))
+            self._initialized_submodules.update(missing)
+        return True
+
     @cached_property
     def url_expanded(self) -> str:
         """Get usable URL.
@@ -606,3 +782,103 @@ class Template:
         if get_repo(self.url):
             return "git"
         return None
+
+
+TemplateKey = Tuple[str, Optional[str], bool]
+
+
+def template_key(url: str, ref: str | None, use_prereleases: bool) -> TemplateKey:
+    """Get the key that identifies equivalent templates.
+
+    Prereleases only matter when looking for the latest version.
+    """
+    return url, ref, use_prereleases and ref is None
+
+
+class TemplateRegistry:
+    """Share templates between all workers that need the same one.
+
+    While a registry is active, workers and subprojects get their templates
+    from it, instead of creating them. This way, each template is cloned and
+    its configuration is parsed only once, and its Jinja environment is reused.
+
+    The registry owns its templates: use it as a context manager to activate it
+    and to clean them up when leaving the context.
+
+    Attributes:
+        templates:
+            Known templates, by [key][copier.template.template_key].
+        jinja_envs:
+            Jinja environments built for each known template, by key.
+    """
+
+    _active: TemplateRegistry | None = None
+
+    def __init__(self, templates: Mapping[TemplateKey, Template] | None = None):
+        self.templates: dict[TemplateKey, Template] = dict(templates or {})
+        self.jinja_envs: dict[TemplateKey, CachedSandboxedEnvironment] = {}
+
+    def __enter__(self) -> TemplateRegistry:
+        self.activate()
+        return self
+
+    def __exit__(
+        self,
+        type: type[BaseException] | None,
+        value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        TemplateRegistry._active = None
+        self.cleanup()
+
+    @classmethod
+    def active(cls) -> TemplateRegistry | None:
+        """Get the registry active in this process, if any."""
+        return cls._active
+
+    def activate(self) -> None:
+        """Make this the registry used by the whole process."""
+        TemplateRegistry._active = self
+
+    def cleanup(self) -> None:
+        """Clean up all known templates."""
+        for template in {id(tpl): tpl for tpl in self.templates.values()}.values():
+            template._cleanup()
+
+    def get(self, url: str, ref: str | None, use_prereleases: bool) -> Template:
+        """Get a known template, or create and remember it."""
+        key = template_key(url, ref, use_prereleases)
+        try:
+            return self.templates[key]
+        except KeyError:
+            result = self.templates[key] = Template(
+                url=url, ref=ref, use_prereleases=use_prereleases
+            )
+            return result
+
+    def key_of(self, template: Template) -> TemplateKey | None:
+        """Get the key of a known template, or `None` if it is unknown."""
+        for key, known in self.templates.items():
+            if known is template:
+                return key
+        return None
+
+    def resolve(self, template: Template) -> None:
+        """Clone a known template and load everything workers need from it.
+
+        The template also becomes known by the commit it points to, which is
+        how old templates are requested when updating.
+        """
+        for prop in (
+            "local_abspath",
+            "commit",
+            "commit_hash",
+            "version",
+            "config_data",
+            "questions_data",
+        ):
+            getattr(template, prop)
+        if template.commit is not None:
+            self.templates.setdefault(
+                template_key(template.url, template.commit, False), template
+            )
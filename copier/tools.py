@@ -6,19 +6,23 @@ import errno
 import os
 import platform
 import re
+import shutil
 import stat
 import sys
-from contextlib import suppress
+import time
+from contextlib import contextmanager, suppress
 from decimal import Decimal
 from enum import Enum
 from importlib.metadata import version
 from pathlib import Path
 from types import TracebackType
-from typing import Any, Callable, Iterator, Literal, TextIO, cast
+from typing import Any, Callable, Iterable, Iterator, Literal, TextIO, cast
+from unicodedata import normalize
 
 import colorama
 from packaging.version import Version
 from pathspec.patterns.gitwildmatch import GitWildMatchPattern
+from pathspec.util import normalize_file
 from pydantic import StrictBool
 
 colorama.just_fix_windows_console()
@@ -37,6 +41,9 @@ class Style:
 INDENT = " " * 2
 HLINE = "-" * 42
 
+# Big enough to stream files quickly, small enough to keep memory use low
+CHUNK_SIZE = 1024**2
+
 OS: Literal["linux", "macos", "windows"] | None = cast(
     Any,
     {
@@ -224,6 +231,194 @@ def escape_git_path(path: str) -> str:
     )
 
 
+_re_named_group = re.compile(r"\(\?P<\w+>")
+
+
+def _literal_pattern(pattern: str) -> tuple[str, bool] | None:
+    """Find the path matched by a gitwildmatch pattern without special characters.
+
+    Args:
+        pattern: The pattern, which must not be negated.
+
+    Returns:
+        The path, and whether it is anchored to the root, or `None` if the
+        pattern has wildcards, escapes or any other special meaning.
+    """
+    if (
+        not pattern
+        or pattern[0] == "#"
+        or pattern[-1].isspace()
+        or any(char in "*?[\\" for char in pattern)
+    ):
+        return None
+    anchored = pattern.startswith("/")
+    path = pattern.removeprefix("/")
+    segments = path.split("/")
+    # Empty segments also cover directory patterns, ending with a slash
+    if not all(segments) or {".", ".."} & set(segments):
+        return None
+    return path, anchored or len(segments) > 1
+
+
+class _PatternRun:
+    """Consecutive patterns that all include, or all exclude, what they match.
+
+    Literal patterns are kept in sets: anchored ones by path, and the others
+    by the name they match at any depth. Wildcard patterns are combined into
+    a single regular expression.
+    """
+
+    def __init__(self, include: bool) -> None:
+        self.include = include
+        self.paths: set[str] = set()
+        self.names: set[str] = set()
+        self.regexes: list[str] = []
+        self.regex: re.Pattern[str] | None = None
+
+    def compile(self) -> None:
+        if self.regexes:
+            self.regex = re.compile(
+                "|".join(
+                    f"(?:{_re_named_group.sub('(?:', regex)})" for regex in self.regexes
+                )
+            )
+
+    def match_literal(self, name: str, path: str) -> bool:
+        return path in self.paths or name in self.names
+
+
+class PathMatcher:
+    """Match paths against gitwildmatch patterns, like `PathSpec.match_file`.
+
+    Patterns are NFD-normalized, and later ones take precedence over earlier
+    ones, including negated patterns. Instead of testing each pattern against
+    each path, literal patterns are looked up in sets and wildcard patterns
+    are tested all at once, with a combined regular expression. Literal
+    matches of each directory are cached, so they are looked up once for all
+    the files inside it.
+
+    Args:
+        patterns: The gitwildmatch patterns.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self._runs: list[_PatternRun] = []
+        for pattern in patterns:
+            # TODO Is normalization really needed?
+            pattern = normalize("NFD", pattern)
+            regex, include = GitWildMatchPattern.pattern_to_regex(pattern)
+            if regex is None or include is None:
+                continue
+            if not self._runs or self._runs[-1].include != include:
+                self._runs.append(_PatternRun(include))
+            run = self._runs[-1]
+            # Pathspec versions disagree about what negated patterns match
+            # inside folders, so they are always left to their regexes
+            literal = _literal_pattern(pattern) if include else None
+            if literal is None:
+                run.regexes.append(regex)
+            elif literal[1]:
+                run.paths.add(literal[0])
+            else:
+                run.names.add(literal[0])
+        for run in self._runs:
+            run.compile()
+        # Latest runs take precedence, so they are tried first
+        self._runs.reverse()
+        self._folders: dict[str, tuple[bool, ...]] = {}
+
+    def _match_folder(self, folder: str) -> tuple[bool, ...]:
+        """Tell which runs match a folder, or its parents, with literal patterns."""
+        with suppress(KeyError):
+            return self._folders[folder]
+        # Find the closest parent already known, without recursion, since
+        # folders can be deeper than the recursion limit
+        pending = []
+        while folder and folder not in self._folders:
+            pending.append(folder)
+            folder = folder.rpartition("/")[0]
+        result = self._folders.get(folder, (False,) * len(self._runs))
+        for folder in reversed(pending):
+            name = folder.rpartition("/")[2]
+            result = tuple(
+                result[index] or run.match_literal(name, folder)
+                for index, run in enumerate(self._runs)
+            )
+            self._folders[folder] = result
+        return result
+
+    def match_file(self, file: str | os.PathLike[str]) -> bool:
+        """Tell if a relative path matches the patterns.
+
+        Args:
+            file: The path to match.
+        """
+        path = normalize_file(file)
+        parent, _, name = path.rpartition("/")
+        folder_result = self._match_folder(parent)
+        for index, run in enumerate(self._runs):
+            if (
+                folder_result[index]
+                or run.match_literal(name, path)
+                or (run.regex is not None and run.regex.search(path))
+            ):
+                return run.include
+        return False
+
+
+def same_contents(path: Path, other: Path) -> bool:
+    """Tell if two files have the same contents, reading them in chunks.
+
+    Files with different sizes are told apart without reading them.
+
+    Args:
+        path: One file. Errors opening it are raised, like when reading it.
+        other: The other file.
+    """
+    with path.open("rb") as file, other.open("rb") as other_file:
+        if os.fstat(file.fileno()).st_size != os.fstat(other_file.fileno()).st_size:
+            return False
+        while chunk := file.read(CHUNK_SIZE):
+            if chunk != other_file.read(CHUNK_SIZE):
+                return False
+        return not other_file.read(1)
+
+
+# From linux/fs.h, since the fcntl module doesn't expose it
+_FICLONE = 0x40049409
+
+
+def clone_file(src: Path, dst: Path) -> None:
+    """Copy a file, sharing its data with the copy where possible.
+
+    A reflink (`FICLONE`) shares the data blocks until either file changes,
+    on filesystems that support copy-on-write, like Btrfs or XFS. Otherwise,
+    `copy_file_range` copies the data inside the kernel, which some
+    filesystems also accelerate. Both are Linux-only, so other platforms, and
+    filesystems that support neither, get a regular copy.
+
+    Args:
+        src: The file to copy.
+        dst: Where to copy it. Any previous file is replaced.
+    """
+    with src.open("rb") as src_file, dst.open("wb") as dst_file:
+        if sys.platform == "linux":
+            import fcntl
+
+            with suppress(OSError):
+                fcntl.ioctl(dst_file.fileno(), _FICLONE, src_file.fileno())
+                return
+            with suppress(OSError):
+                # Offsets advance as data is copied, so any failure below can
+                # continue with a regular copy
+                while os.copy_file_range(
+                    src_file.fileno(), dst_file.fileno(), CHUNK_SIZE * 64
+                ):
+                    pass
+                return
+        shutil.copyfileobj(src_file, dst_file, CHUNK_SIZE)
+
+
 def get_git_objects_dir(path: Path) -> Path:
     """Get the absolute path of a Git repository's objects directory."""
     # FIXME: A lazy import is currently necessary to avoid circular imports with
@@ -258,9 +453,84 @@ def set_git_alternates(*repos: Path, path: Path = Path(".")) -> None:
     alternates_file.write_bytes(b"\n".join(map(bytes, map(get_git_objects_dir, repos))))
 
 
-def scantree(path: str, follow_symlinks: bool) -> Iterator[os.DirEntry[str]]:
-    """A recursive extension of `os.scandir`."""
-    for entry in os.scandir(path):
-        yield entry
-        if entry.is_dir(follow_symlinks=follow_symlinks):
-            yield from scantree(entry.path, follow_symlinks)
+def cache_dir() -> Path:
+    """Get the root directory for Copier's persistent caches.
+
+    It can be overridden with the `COPIER_CACHE_DIR` environment variable.
+    Otherwise, the platform conventions are followed.
+    """
+    if env_dir := os.environ.get("COPIER_CACHE_DIR"):
+        return Path(env_dir).expanduser()
+    if OS == "windows":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+        return base / "copier" / "Cache"
+    if OS == "macos":
+        return Path.home() / "Library" / "Caches" / "copier"
+    base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return base / "copier"
+
+
+def _try_lock(fd: int) -> bool:
+    """Try to take an exclusive advisory lock on an open file, without waiting."""
+    try:
+        if sys.platform == "win32":
+            import msvcrt
+
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError as error:
+        if error.errno in {errno.EACCES, errno.EAGAIN, errno.EDEADLK}:
+            return False
+        raise
+    return True
+
+
+def _unlock(fd: int) -> None:
+    """Release the advisory lock taken by `_try_lock`."""
+    if sys.platform == "win32":
+        import msvcrt
+
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+@contextmanager
+def file_lock(
+    path: Path,
+    timeout: float | None = None,
+    poll_interval: float = 0.1,
+) -> Iterator[None]:
+    """Hold an exclusive lock, backed by a lock file, while in the context.
+
+    It is safe to use from several processes, on any platform. The lock is an
+    advisory lock held by the OS on the lock file, so it is released even if
+    the holding process dies. The lock file itself is left in place, because
+    removing it could let 2 processes lock different files with the same path.
+
+    Args:
+        path: The lock file path.
+        timeout: Seconds to wait for the lock before raising `TimeoutError`.
+            Wait forever if `None`.
+        poll_interval: Seconds to wait between lock attempts.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    fd = os.open(path, os.O_CREAT | os.O_RDWR)
+    try:
+        while not _try_lock(fd):
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Could not acquire lock {path}")
+            time.sleep(poll_interval)
+        try:
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
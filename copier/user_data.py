@@ -24,6 +24,7 @@ from pygments.lexers.data import JsonLexer, YamlLexer
 from questionary.prompts.common import Choice
 
 from .errors import InvalidTypeError, UserMessageError
+from .jinja import CachedSandboxedEnvironment
 from .tools import cast_to_bool, cast_to_str, force_str_end
 from .types import MISSING, AnyByStrDict, MissingType, OptStrOrPath, StrOrPath
 
@@ -431,6 +432,12 @@ class Question:
         `extra_answers` are combined self `self.answers.combined` when rendering
         the template.
         """
+        if (
+            isinstance(value, str)
+            and isinstance(self.jinja_env, CachedSandboxedEnvironment)
+            and self.jinja_env.is_literal(value)
+        ):
+            return value
         try:
             template = self.jinja_env.from_string(value)
         except TypeError:
@@ -5,9 +5,18 @@ from __future__ import annotations
 import os
 import re
 import sys
-from contextlib import suppress
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from contextlib import ExitStack, contextmanager, suppress
+from hashlib import sha256
 from pathlib import Path
+from shutil import rmtree
+from subprocess import PIPE, Popen
 from tempfile import TemporaryDirectory, mkdtemp
+from threading import Lock
+from types import TracebackType
+from typing import Any, Callable, ClassVar, Iterable, Iterator, Sequence, cast
 from warnings import warn
 
 from packaging import version
@@ -15,16 +24,72 @@ from packaging.version import InvalidVersion, Version
 from plumbum import TF, ProcessExecutionError, colors, local
 from plumbum.machines import LocalCommand
 
-from .errors import DirtyLocalWarning, ShallowCloneWarning
+from .errors import (
+    CloneCacheWarning,
+    DirtyLocalWarning,
+    ShallowCloneWarning,
+    UserMessageError,
+)
+from .tools import cache_dir, cast_to_bool, file_lock
 from .types import OptBool, OptStrOrPath, StrOrPath
 
 GIT_USER_NAME = "Copier"
 GIT_USER_EMAIL = "copier@copier"
 
 
+# Counters of Git processes spawned, by subcommand, for each active context
+_process_counters: list[Counter[str]] = []
+_process_counters_lock = Lock()
+
+
+@contextmanager
+def count_git_processes() -> Iterator[Counter[str]]:
+    """Count Git processes spawned within the context, in any thread.
+
+    Useful to find out how many processes an operation needs.
+
+    Yields:
+        Amount of processes spawned so far, by Git subcommand.
+    """
+    counter: Counter[str] = Counter()
+    with _process_counters_lock:
+        _process_counters.append(counter)
+    try:
+        yield counter
+    finally:
+        with _process_counters_lock:
+            _process_counters.remove(counter)
+
+
+def _git_subcommand(args: Sequence[Any]) -> str:
+    """Find the subcommand in some `git` arguments."""
+    options_with_value = {"-C", "-c"}
+    arguments = iter(map(str, args))
+    for argument in arguments:
+        if argument in options_with_value:
+            next(arguments, None)
+        elif not argument.startswith("-"):
+            return argument
+    return ""
+
+
+class _GitCommand(LocalCommand):
+    """The `git` command, keeping track of processes spawned."""
+
+    __slots__ = ()
+
+    def popen(self, args: Sequence[Any] = (), *pargs: Any, **kwargs: Any) -> Any:
+        if _process_counters:
+            subcommand = _git_subcommand([args] if isinstance(args, str) else args)
+            with _process_counters_lock:
+                for counter in _process_counters:
+                    counter[subcommand] += 1
+        return super().popen(args, *pargs, **kwargs)
+
+
 def get_git(context_dir: OptStrOrPath = None) -> LocalCommand:
     """Gets `git` command, or fails if it's not available."""
-    command = local["git"].with_env(
+    command = _GitCommand(local.which("git")).with_env(
         GIT_AUTHOR_NAME=GIT_USER_NAME,
         GIT_AUTHOR_EMAIL=GIT_USER_EMAIL,
         GIT_COMMITTER_NAME=GIT_USER_NAME,
@@ -42,6 +107,378 @@ def get_git_version() -> Version:
     return Version(re.findall(r"\d+\.\d+\.\d+", git("version"))[0])
 
 
+class GitObjects:
+    """Read objects of a repository through one long-lived Git process.
+
+    Instead of spawning `git cat-file` for each object, all reads are sent to
+    the same `git cat-file --batch` process. Use it as a context manager, to
+    stop the process when leaving the context.
+
+    Attributes:
+        repo: Path to the repository.
+    """
+
+    def __init__(self, repo: StrOrPath) -> None:
+        self.repo = Path(repo)
+        self._command = get_git(self.repo)["cat-file", "--batch"]
+        self._process: Popen[bytes] | None = None
+        # Objects may be read from several threads
+        self._lock = Lock()
+
+    def __enter__(self) -> GitObjects:
+        return self
+
+    def __exit__(
+        self,
+        type: type[BaseException] | None,
+        value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def read_blob(self, rev: str) -> bytes:
+        """Get the contents of a blob.
+
+        Args:
+            rev: A revision that names the blob, like `HEAD:path/to/file`.
+
+        Raises:
+            KeyError: If there is no such blob.
+        """
+        if "\n" in rev:
+            # Batch queries are line-based, so they can't name such paths
+            command = get_git(self.repo)["cat-file", "blob", rev]
+            process = cast("Popen[bytes]", command.popen(stdout=PIPE, stderr=PIPE))
+            content, _ = process.communicate()
+            if process.returncode:
+                raise KeyError(rev)
+            return content
+        with self._lock:
+            if self._process is None:
+                self._process = cast(
+                    "Popen[bytes]", self._command.popen(stdin=PIPE, stdout=PIPE)
+                )
+            stdin, stdout = self._process.stdin, self._process.stdout
+            assert stdin and stdout
+            stdin.write(b"%s\n" % rev.encode())
+            stdin.flush()
+            header = stdout.readline().split()
+            if len(header) != 3:
+                raise KeyError(rev)
+            content = stdout.read(int(header[2]))
+            # Skip the newline after the contents
+            stdout.read(1)
+        if header[1] != b"blob":
+            raise KeyError(rev)
+        return content
+
+    def close(self) -> None:
+        """Stop the `git cat-file` process, if running."""
+        process, self._process = self._process, None
+        if process is not None:
+            process.communicate()
+
+
+class GitBackend(ABC):
+    """Carry out the Git operations that Copier needs.
+
+    Get the configured one with [get_git_backend][copier.vcs.get_git_backend].
+    All paths passed to a repository operation are relative to its working
+    tree.
+    """
+
+    name: ClassVar[str]
+
+    @abstractmethod
+    def clone(self, url: str, location: StrOrPath, *options: str) -> None:
+        """Clone a repository.
+
+        Args:
+            url: Git-parseable URL of the repository.
+            location: Where to clone it.
+            options: Extra `git clone` options.
+        """
+
+    @abstractmethod
+    def tags(self, repo: StrOrPath) -> list[str]:
+        """List tag names of a repository, sorted alphabetically.
+
+        Args:
+            repo: Path to the repository.
+        """
+
+    @abstractmethod
+    def describe(self, repo: StrOrPath) -> str:
+        """Describe `HEAD` like `git describe --tags --always` does.
+
+        Args:
+            repo: Path to the repository.
+        """
+
+    @abstractmethod
+    def rev_parse(self, repo: StrOrPath, rev: str = "HEAD") -> str:
+        """Get the full object hash that a revision points to.
+
+        Args:
+            repo: Path to the repository.
+            rev: The revision.
+        """
+
+    @abstractmethod
+    def write_tree(self, repo: StrOrPath) -> str:
+        """Write a tree object from the index, and return its hash.
+
+        Args:
+            repo: Path to the repository.
+        """
+
+    @abstractmethod
+    def diff_tree(self, repo: StrOrPath, old: str, new: str, *options: str) -> str:
+        """Compare two trees, like `git diff-tree` does.
+
+        Args:
+            repo: Path to the repository.
+            old: The tree to compare from.
+            new: The tree to compare to.
+            options: Extra `git diff-tree` options.
+        """
+
+    @abstractmethod
+    def apply(self, repo: StrOrPath, diff: str, *options: str) -> None:
+        """Apply a diff to the working tree.
+
+        Hunks that don't apply are left alone, without failing.
+
+        Args:
+            repo: Path to the repository.
+            diff: The diff to apply.
+            options: Extra `git apply` options.
+        """
+
+    @abstractmethod
+    def merge_file(
+        self,
+        repo: StrOrPath,
+        current: StrOrPath,
+        base: StrOrPath,
+        other: StrOrPath,
+        labels: tuple[str, str, str],
+    ) -> None:
+        """Merge changes from `base` to `other` into `current`, in place.
+
+        Conflicts are written to `current` with conflict markers, without
+        failing.
+
+        Args:
+            repo: Path to the repository.
+            current: The file to merge into.
+            base: The common ancestor.
+            other: The file to merge from.
+            labels: Conflict marker labels of `current`, `base` and `other`.
+        """
+
+    @abstractmethod
+    def status(self, repo: StrOrPath, ignored: bool = False) -> str:
+        """Get the working tree status, like `git status --porcelain` does.
+
+        Args:
+            repo: Path to the repository.
+            ignored: Also list ignored files.
+        """
+
+
+class CliGitBackend(GitBackend):
+    """Run every Git operation with the `git` command.
+
+    Each operation spawns a process. This is the default backend.
+    """
+
+    name = "cli"
+
+    def clone(self, url: str, location: StrOrPath, *options: str) -> None:
+        """Clone a repository with `git clone`."""
+        get_git()("clone", *options, url, location)
+
+    def tags(self, repo: StrOrPath) -> list[str]:
+        """List tag names with `git tag`."""
+        return get_git(repo)("tag").split()
+
+    def describe(self, repo: StrOrPath) -> str:
+        """Describe `HEAD` with `git describe`."""
+        return get_git(repo)("describe", "--tags", "--always").strip()
+
+    def rev_parse(self, repo: StrOrPath, rev: str = "HEAD") -> str:
+        """Get an object hash with `git rev-parse`."""
+        return get_git(repo)("rev-parse", rev).strip()
+
+    def write_tree(self, repo: StrOrPath) -> str:
+        """Write a tree object with `git write-tree`."""
+        return get_git(repo)("write-tree").strip()
+
+    def diff_tree(self, repo: StrOrPath, old: str, new: str, *options: str) -> str:
+        """Compare two trees with `git diff-tree`."""
+        return get_git(repo)("diff-tree", *options, old, new)
+
+    def apply(self, repo: StrOrPath, diff: str, *options: str) -> None:
+        """Apply a diff with `git apply`."""
+        (get_git(repo)[["apply", *options]] << diff)(retcode=None)
+
+    def merge_file(
+        self,
+        repo: StrOrPath,
+        current: StrOrPath,
+        base: StrOrPath,
+        other: StrOrPath,
+        labels: tuple[str, str, str],
+    ) -> None:
+        """Merge a file with `git merge-file`."""
+        label_options = [option for label in labels for option in ("-L", label)]
+        get_git(repo)("merge-file", *label_options, current, base, other, retcode=None)
+
+    def status(self, repo: StrOrPath, ignored: bool = False) -> str:
+        """Get the working tree status with `git status`."""
+        command = get_git(repo)["status", "--porcelain"]
+        if ignored:
+            command = command["--ignored"]
+        return command()
+
+
+class DulwichGitBackend(CliGitBackend):
+    """Run the most frequent Git operations in-process, with [Dulwich][].
+
+    Listing tags, resolving revisions, writing trees from the index and
+    getting the status don't spawn any process. Operations that Dulwich
+    doesn't support, or that it fails to carry out, are run with the `git`
+    command instead. Dulwich is an optional dependency.
+
+    [Dulwich]: https://www.dulwich.io/
+    """
+
+    name = "dulwich"
+
+    def __init__(self) -> None:
+        try:
+            from dulwich.errors import (
+                ChecksumMismatch,
+                FileFormatException,
+                NoIndexPresent,
+                NotGitRepository,
+                ObjectMissing,
+                WrongObjectException,
+            )
+            from dulwich.index import UnsupportedIndexFormat
+            from dulwich.repo import Repo
+        except ModuleNotFoundError as error:
+            raise UserMessageError(
+                f"Copier could not load the {self.name} Git backend:\n{error}\n"
+                "Make sure to install Dulwich alongside Copier itself."
+            )
+        self._repo_class = Repo
+        # Errors that make an operation fall back to the `git` command, which
+        # supports more repository formats. Dulwich reports some malformed or
+        # unsupported index files, like split indexes, with assertions.
+        self._errors = (
+            ChecksumMismatch,
+            FileFormatException,
+            NoIndexPresent,
+            NotGitRepository,
+            ObjectMissing,
+            UnsupportedIndexFormat,
+            WrongObjectException,
+            AssertionError,
+            KeyError,
+            NotImplementedError,
+            OSError,
+            ValueError,
+        )
+
+    def _open(self, repo: StrOrPath) -> Any:
+        return self._repo_class.discover(str(repo))
+
+    def tags(self, repo: StrOrPath) -> list[str]:
+        """List tag names from the references of the repository."""
+        try:
+            with self._open(repo) as dulwich_repo:
+                return sorted(
+                    os.fsdecode(name)
+                    for name in dulwich_repo.refs.as_dict(b"refs/tags")
+                )
+        except self._errors:
+            return super().tags(repo)
+
+    def rev_parse(self, repo: StrOrPath, rev: str = "HEAD") -> str:
+        """Resolve a revision that names a commit."""
+        from dulwich.objectspec import parse_commit
+
+        try:
+            with self._open(repo) as dulwich_repo:
+                return parse_commit(dulwich_repo, rev.encode()).id.decode()
+        except self._errors:
+            return super().rev_parse(repo, rev)
+
+    def write_tree(self, repo: StrOrPath) -> str:
+        """Write a tree object from the index of the repository."""
+        try:
+            with self._open(repo) as dulwich_repo:
+                index = dulwich_repo.open_index()
+                if index.has_conflicts():
+                    # Git refuses to write such trees, so let it fail
+                    return super().write_tree(repo)
+                return index.commit(dulwich_repo.object_store).decode()
+        except self._errors:
+            return super().write_tree(repo)
+
+    def status(self, repo: StrOrPath, ignored: bool = False) -> str:
+        """Get the working tree status, except ignored files."""
+        if ignored:
+            return super().status(repo, ignored)
+        from dulwich.porcelain import status
+
+        try:
+            with self._open(repo) as dulwich_repo:
+                result = status(dulwich_repo)
+        except self._errors:
+            return super().status(repo, ignored)
+        lines = [
+            f"{code}  {os.fsdecode(path)}"
+            for code, kind in (("A", "add"), ("D", "delete"), ("M", "modify"))
+            for path in result.staged[kind]
+        ]
+        lines.extend(f" M {os.fsdecode(path)}" for path in result.unstaged)
+        lines.extend(f"?? {os.fsdecode(path)}" for path in result.untracked)
+        return "".join(f"{line}\n" for line in lines)
+
+
+GIT_BACKENDS: dict[str, type[GitBackend]] = {
+    backend.name: backend for backend in (CliGitBackend, DulwichGitBackend)
+}
+_git_backends: dict[str, GitBackend] = {}
+
+
+def get_git_backend() -> GitBackend:
+    """Get the backend that carries out Git operations.
+
+    It's the `git` command by default. Set the `COPIER_GIT_BACKEND` environment
+    variable to `dulwich` to run the most frequent operations in-process.
+
+    Raises:
+        UserMessageError: If the backend is unknown or unavailable.
+    """
+    name = os.environ.get("COPIER_GIT_BACKEND") or CliGitBackend.name
+    try:
+        return _git_backends[name]
+    except KeyError:
+        pass
+    try:
+        backend_class = GIT_BACKENDS[name]
+    except KeyError:
+        raise UserMessageError(
+            f"Unknown Git backend {name!r}; choose one of: {', '.join(GIT_BACKENDS)}"
+        )
+    backend = _git_backends[name] = backend_class()
+    return backend
+
+
 GIT_PREFIX = ("git@", "git://", "git+", "https://github.com/", "https://gitlab.com/")
 GIT_POSTFIX = ".git"
 REPLACEMENTS = (
@@ -52,8 +489,15 @@ REPLACEMENTS = (
 )
 
 
+# Headers of all bundle formats supported by Git
+GIT_BUNDLE_SIGNATURES = (b"# v2 git bundle\n", b"# v3 git bundle\n")
+
+
 def is_git_repo_root(path: StrOrPath) -> bool:
     """Indicate if a given path is a git repo root directory."""
+    # Most paths are not repositories, so avoid spawning Git for those
+    if not Path(path, ".git").exists():
+        return False
     try:
         with local.cwd(Path(path, ".git")):
             return get_git()("rev-parse", "--is-inside-git-dir").strip() == "true"
@@ -85,6 +529,14 @@ def is_git_bundle(path: Path) -> bool:
     """Indicate if a path is a valid git bundle."""
     with suppress(OSError):
         path = path.resolve()
+    # Reading the header is much cheaper than asking Git to verify the bundle
+    try:
+        with path.open("rb") as bundle:
+            header = bundle.read(len(GIT_BUNDLE_SIGNATURES[0]))
+    except OSError:
+        return False
+    if header not in GIT_BUNDLE_SIGNATURES:
+        return False
     with TemporaryDirectory(prefix=f"{__name__}.is_git_bundle.") as dirname:
         with local.cwd(dirname):
             get_git()("init")
@@ -106,6 +558,9 @@ def get_repo(url: str) -> str | None:
             - /local/path/to/git/bundle/file.bundle
             - ~/path/to/git/repo
             - ~/path/to/git/repo.bundle
+
+            Local paths are classified once per process, while they don't
+            change. See [clear_repo_cache][copier.vcs.clear_repo_cache].
     """
     for pattern, replacement in REPLACEMENTS:
         url = re.sub(pattern, replacement, url)
@@ -121,13 +576,76 @@ def get_repo(url: str) -> str | None:
     if url.startswith("~"):
         url_path = url_path.expanduser()
 
-    if is_git_repo_root(url_path) or is_git_bundle(url_path):
+    # Classifying local paths requires Git, so remember the results while the
+    # files involved don't change
+    key = (
+        str(url_path.absolute()),
+        _stat_signature(url_path),
+        _stat_signature(url_path / ".git"),
+    )
+    if key not in _local_repo_cache:
+        _local_repo_cache[key] = is_git_repo_root(url_path) or is_git_bundle(url_path)
+    if _local_repo_cache[key]:
         return url_path.as_posix()
 
     return None
 
 
-def checkout_latest_tag(local_repo: StrOrPath, use_prereleases: OptBool = False) -> str:
+_local_repo_cache: dict[
+    tuple[str, tuple[int, ...] | None, tuple[int, ...] | None], bool
+] = {}
+
+
+def _stat_signature(path: Path) -> tuple[int, ...] | None:
+    """Get what identifies a version of a path, or `None` if missing."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def clear_repo_cache() -> None:
+    """Forget how [get_repo][copier.vcs.get_repo] classified local paths.
+
+    Results are already discarded when the path or its `.git` entry change.
+    Call this if a repository could have changed some other way.
+    """
+    _local_repo_cache.clear()
+
+
+def _latest_tag(tags: Iterable[str], use_prereleases: OptBool = False) -> str:
+    """Pick the latest tag, sorted by PEP 440, or `HEAD` if there is none.
+
+    Parameters:
+        tags:
+            Tag names. Those that are not valid versions are ignored.
+        use_prereleases:
+            If `False`, skip prerelease tags.
+    """
+    latest: tuple[Version, str] | None = None
+    for tag in tags:
+        try:
+            parsed = version.parse(tag)
+        except InvalidVersion:
+            continue
+        if parsed.is_prerelease and not use_prereleases:
+            continue
+        # On ties, the first tag wins
+        if latest is None or parsed > latest[0]:
+            latest = parsed, tag
+    if latest is None:
+        print(
+            colors.warn | "No git tags found in template; using HEAD as ref",
+            file=sys.stderr,
+        )
+        return "HEAD"
+    return latest[1]
+
+
+def checkout_latest_tag(
+    local_repo: StrOrPath, use_prereleases: OptBool = False, submodules: bool = True
+) -> str:
     """Checkout latest git tag and check it out, sorted by PEP 440.
 
     Parameters:
@@ -135,65 +653,337 @@ def checkout_latest_tag(local_repo: StrOrPath, use_prereleases: OptBool = False)
             A git repository in the local filesystem.
         use_prereleases:
             If `False`, skip prerelease git tags.
+        submodules:
+            If `False`, leave submodules alone. Initialize them later with
+            [update_submodules][copier.vcs.update_submodules].
     """
     git = get_git()
     with local.cwd(local_repo):
-        all_tags = filter(valid_version, git("tag").split())
-        if not use_prereleases:
-            all_tags = filter(
-                lambda tag: not version.parse(tag).is_prerelease, all_tags
+        latest_tag = _latest_tag(get_git_backend().tags("."), use_prereleases)
+        git("checkout", "--force", latest_tag)
+        if submodules:
+            update_submodules(local_repo)
+        return latest_tag
+
+
+def update_submodules(
+    local_repo: StrOrPath, paths: Iterable[str] | None = None
+) -> None:
+    """Initialize and check out submodules recursively.
+
+    Parameters:
+        local_repo:
+            A git repository in the local filesystem.
+        paths:
+            Only update submodules inside these paths. If `None`, update all.
+    """
+    command = get_git(local_repo)[
+        "submodule", "update", "--checkout", "--init", "--recursive", "--force"
+    ]
+    if paths is not None:
+        pathspec = list(paths)
+        if not pathspec:
+            return
+        command = command[["--", *pathspec]]
+    command()
+
+
+def latest_remote_tag(url: str, use_prereleases: OptBool = False) -> str:
+    """Get the latest git tag of a remote repository, sorted by PEP 440.
+
+    Tags are listed without cloning anything.
+
+    Parameters:
+        url:
+            Git-parseable URL of the repo. As returned by
+            [get_repo][copier.vcs.get_repo].
+        use_prereleases:
+            If `False`, skip prerelease git tags.
+
+    Returns:
+        The tag name, or `HEAD` if there are no tags.
+    """
+    refs = get_git()("ls-remote", "--tags", "--refs", url).splitlines()
+    tags = (ref.split("\t", 1)[1].removeprefix("refs/tags/") for ref in refs)
+    return _latest_tag(tags, use_prereleases)
+
+
+def clone_cache_enabled() -> bool:
+    """Tell if remote clones should go through the persistent clone cache.
+
+    The cache is enabled by default. Set the `COPIER_CLONE_CACHE` environment
+    variable to a false value (like `0` or `false`) to disable it.
+    """
+    return cast_to_bool(os.environ.get("COPIER_CLONE_CACHE", True))
+
+
+def clone_cache_dir() -> Path:
+    """Get the directory where bare mirrors of remote templates are cached."""
+    return cache_dir() / "clones"
+
+
+def _dir_size(path: Path) -> int:
+    """Get the total size of the files found under a directory."""
+    result = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            with suppress(OSError):
+                result += os.lstat(os.path.join(root, name)).st_size
+    return result
+
+
+def prune_clone_cache(
+    max_age: float | None = None, max_size: int | None = None
+) -> None:
+    """Evict mirrors from the clone cache.
+
+    Mirrors unused for longer than `max_age` are removed. Then, the least
+    recently used mirrors are removed until the cache fits in `max_size`.
+    Mirrors locked by another process are never evicted.
+
+    Args:
+        max_age:
+            Seconds since the last use. Defaults to the value of the
+            `COPIER_CLONE_CACHE_MAX_AGE` environment variable (in days), or 30 days.
+        max_size:
+            Bytes used by the whole cache. Defaults to the value of the
+            `COPIER_CLONE_CACHE_MAX_SIZE` environment variable (in MiB), or 2 GiB.
+    """
+    if max_age is None:
+        max_age = float(os.environ.get("COPIER_CLONE_CACHE_MAX_AGE", 30)) * 86400
+    if max_size is None:
+        max_size = int(
+            float(os.environ.get("COPIER_CLONE_CACHE_MAX_SIZE", 2048)) * 1024**2
+        )
+    root = clone_cache_dir()
+    mirrors = []
+    for mirror in root.glob("*.git"):
+        with suppress(OSError):
+            mirrors.append((mirror.stat().st_mtime, mirror))
+    now = time.time()
+    total_size = 0
+    # Most recently used mirrors go first, so they are the last ones evicted
+    for last_used, mirror in sorted(mirrors, reverse=True):
+        size = _dir_size(mirror)
+        total_size += size
+        if now - last_used <= max_age and total_size <= max_size:
+            continue
+        with suppress(TimeoutError), file_lock(mirror.with_suffix(".lock"), timeout=0):
+            rmtree(mirror, ignore_errors=True)
+            total_size -= size
+
+
+def _prune_clone_cache_if_due(interval: float = 86400) -> None:
+    """Prune the clone cache, unless it was pruned less than `interval` ago.
+
+    Sizing the mirrors walks all of them, so it is not done on every clone.
+    The last pruning time is the modification time of a stamp file.
+    """
+    stamp = clone_cache_dir() / "last-prune"
+    with suppress(OSError):
+        if time.time() - stamp.stat().st_mtime < interval:
+            return
+    stamp.touch()
+    prune_clone_cache()
+
+
+def _prefetch_blobs(mirror: Path, ref: str) -> None:
+    """Fetch into a partial mirror the file contents that `ref` needs.
+
+    Blobs fetched once stay in the mirror, so later checkouts of the same
+    files work offline. The caller must hold the mirror lock.
+    """
+    git = get_git(mirror)
+    try:
+        objects = git("rev-list", "--objects", "--missing=print", ref, "--")
+    except ProcessExecutionError:
+        # Unknown here; the checkout will report it properly
+        return
+    missing = [line[1:] for line in objects.splitlines() if line.startswith("?")]
+    # Batches keep the command line short enough on every platform
+    for start in range(0, len(missing), 1000):
+        try:
+            git(
+                "fetch",
+                "--no-tags",
+                "--no-write-fetch-head",
+                "origin",
+                *missing[start : start + 1000],
+            )
+        except ProcessExecutionError:
+            warn(
+                f"Could not fetch the contents of '{ref}' into the cached clone.",
+                CloneCacheWarning,
             )
-        sorted_tags = sorted(all_tags, key=version.parse, reverse=True)
+            return
+
+
+def _update_mirror(url: str) -> Path:
+    """Create or refresh the cached bare mirror of a remote repository.
+
+    The caller must hold the mirror lock.
+    """
+    git = get_git()
+    root = clone_cache_dir()
+    mirror = root / f"{sha256(url.encode()).hexdigest()}.git"
+    if mirror.is_dir():
         try:
-            latest_tag = str(sorted_tags[0])
-        except IndexError:
-            print(
-                colors.warn | "No git tags found in template; using HEAD as ref",
-                file=sys.stderr,
+            git("-C", mirror, "fetch", "--prune", "--force", "--tags", "origin")
+        except ProcessExecutionError:
+            warn(
+                f"Could not refresh the cached clone of '{url}'; using it as it is.",
+                CloneCacheWarning,
             )
-            latest_tag = "HEAD"
-        git("checkout", "--force", latest_tag)
-        git("submodule", "update", "--checkout", "--init", "--recursive", "--force")
-        return latest_tag
+    else:
+        # Clone in a temporary location first, so an interrupted clone
+        # never leaves a broken mirror behind
+        staging = mkdtemp(prefix=f"{mirror.name}.", dir=root)
+        options = ["--bare"]
+        # File contents are fetched later, only for what gets checked out
+        if get_git_version() >= Version("2.27"):
+            options.append("--filter=blob:none")
+        try:
+            get_git_backend().clone(url, staging, *options)
+            git(
+                "-C",
+                staging,
+                "config",
+                "remote.origin.fetch",
+                "+refs/heads/*:refs/heads/*",
+            )
+            os.replace(staging, mirror)
+        finally:
+            rmtree(staging, ignore_errors=True)
+    # The mirror directory modification time tracks its last usage
+    os.utime(mirror)
+    return mirror
+
 
+def _clone_cached(
+    url: str,
+    location: str,
+    ref: str,
+    latest_tag: bool = False,
+    use_prereleases: OptBool = False,
+) -> str | None:
+    """Clone a remote repository through its cached bare mirror.
 
-def clone(url: str, ref: str | None = None) -> str:
+    Args:
+        url: The remote repository.
+        location: Where to clone it, without checking anything out.
+        ref: The revision that will be checked out.
+        latest_tag: Check out the latest tag of the mirror instead of `ref`.
+        use_prereleases: If `False`, skip prerelease tags.
+
+    Returns:
+        The revision to check out, or `None` if the cache could not be used,
+        and nothing was cloned.
+    """
+    git = get_git()
+    root = clone_cache_dir()
+    lock = root / f"{sha256(url.encode()).hexdigest()}.lock"
+    with ExitStack() as stack:
+        try:
+            root.mkdir(parents=True, exist_ok=True)
+            stack.enter_context(file_lock(lock))
+            mirror = _update_mirror(url)
+        except OSError as error:
+            warn(
+                f"Could not use the clone cache in '{root}'; "
+                f"cloning '{url}' without it. {error}",
+                CloneCacheWarning,
+            )
+            return None
+        if latest_tag:
+            ref = _latest_tag(get_git_backend().tags(mirror), use_prereleases)
+        partial = _is_partial(mirror)
+        if partial:
+            _prefetch_blobs(mirror, ref)
+        # A local clone hardlinks objects, so it is cheap
+        get_git_backend().clone(str(mirror), location, "--no-checkout")
+    git("-C", location, "remote", "set-url", "origin", url)
+    if partial:
+        # Other missing contents are fetched lazily from the real origin
+        for key, value in (
+            ("core.repositoryformatversion", "1"),
+            ("extensions.partialClone", "origin"),
+            ("remote.origin.promisor", "true"),
+            ("remote.origin.partialclonefilter", "blob:none"),
+        ):
+            git("-C", location, "config", key, value)
+    with suppress(OSError):
+        _prune_clone_cache_if_due()
+    return ref
+
+
+def _is_partial(repo: Path) -> bool:
+    """Tell if a repository is a partial clone, with contents left to fetch."""
+    return get_git(repo)["config", "--get", "remote.origin.promisor"] & TF
+
+
+def clone(
+    url: str,
+    ref: str | None = None,
+    shallow: bool = False,
+    sparse: Callable[[Path], Iterable[str] | None] | None = None,
+    submodules: bool = True,
+    latest_tag: bool = False,
+    use_prereleases: OptBool = False,
+) -> str:
     """Clone repo into some temporary destination.
 
     Includes dirty changes for local templates by copying into a temp
     directory and applying a wip commit there.
 
+    Remote repositories are cloned through a persistent cache of bare
+    mirrors, unless [disabled][copier.vcs.clone_cache_enabled].
+
     Args:
         url:
             Git-parseable URL of the repo. As returned by
             [get_repo][copier.vcs.get_repo].
         ref:
             Reference to checkout. For Git repos, defaults to `HEAD`.
+        shallow:
+            Fetch only the commit that `ref` points to, which must be a branch,
+            a tag or `HEAD`. It only affects remote repositories cloned without
+            the cache.
+        sparse:
+            Tells which directories to check out, besides root files, or `None`
+            to check out everything. It receives the clone location, and is
+            called again after each checkout until it asks for nothing new.
+        submodules:
+            If `False`, leave submodules alone. Initialize them later with
+            [update_submodules][copier.vcs.update_submodules].
+        latest_tag:
+            If `ref` is `None`, check out the latest tag, sorted by PEP 440,
+            instead of `HEAD`.
+        use_prereleases:
+            If `False`, skip prerelease tags when looking for the latest one.
     """
     git = get_git()
-    git_version = get_git_version()
     location = mkdtemp(prefix=f"{__name__}.clone.")
-    _clone = git["clone", "--no-checkout", url, location]
-    # Faster clones if possible
-    if git_version >= Version("2.27"):
-        if url_match := re.match("(file://)?(.*)", url):
-            file_url = url_match.groups()[-1]
+    checkout_ref = ref or "HEAD"
+    latest_tag = latest_tag and ref is None
+    cached_ref = None
+    if clone_cache_enabled() and not os.path.exists(url):
+        cached_ref = _clone_cached(
+            url, location, checkout_ref, latest_tag, use_prereleases
+        )
+    if cached_ref is not None:
+        checkout_ref = cached_ref
+    else:
+        if shallow and not os.path.exists(url):
+            _clone_shallow(url, location, checkout_ref)
         else:
-            file_url = url
-        if is_git_shallow_repo(file_url):
-            warn(
-                f"The repository '{url}' is a shallow clone, this might lead to unexpected "
-                "failure or unusually high resource consumption.",
-                ShallowCloneWarning,
+            _clone_direct(url, location)
+        if latest_tag:
+            checkout_ref = _latest_tag(
+                get_git_backend().tags(location), use_prereleases
             )
-        else:
-            _clone = _clone["--filter=blob:none"]
-    _clone()
     # Include dirty changes if checking out a local HEAD
     if ref in {None, "HEAD"} and os.path.exists(url) and Path(url).is_dir():
-        is_dirty = False
-        with local.cwd(url):
-            is_dirty = bool(git("status", "--porcelain").strip())
+        is_dirty = bool(get_git_backend().status(url).strip())
         if is_dirty:
             url_abspath = Path(url).absolute()
             with local.cwd(location):
@@ -213,12 +1003,75 @@ def clone(url: str, ref: str | None = None) -> str:
                 )
 
     with local.cwd(location):
-        git("checkout", "-f", ref or "HEAD")
-        git("submodule", "update", "--checkout", "--init", "--recursive", "--force")
+        paths = None
+        if sparse is not None and get_git_version() >= Version("2.35"):
+            paths = _sparse_checkout(Path(location), checkout_ref, sparse)
+        if paths is None:
+            git("checkout", "-f", checkout_ref)
+        if submodules:
+            # Only submodules inside the checked out directories are needed
+            update_submodules(location, paths)
 
     return location
 
 
+def _sparse_checkout(
+    location: Path, ref: str, sparse: Callable[[Path], Iterable[str] | None]
+) -> list[str] | None:
+    """Check out only the directories that `sparse` asks for, plus root files.
+
+    Returns:
+        The directories checked out, or `None` if everything was checked out.
+    """
+    git = get_git(location)
+    paths: set[str] = set()
+    # In cone mode, root files are always checked out
+    git("sparse-checkout", "set", "--cone")
+    git("checkout", "-f", ref)
+    while True:
+        requested = sparse(location)
+        if requested is None:
+            break
+        wanted = set(requested)
+        if wanted <= paths:
+            # A missing directory probably has a templated name
+            if all((location / path).is_dir() for path in paths):
+                return sorted(paths)
+            break
+        paths |= wanted
+        git("sparse-checkout", "set", "--cone", *sorted(paths))
+    git("sparse-checkout", "disable")
+    return None
+
+
+def _clone_direct(url: str, location: str) -> None:
+    """Clone a repository without going through the clone cache."""
+    options = ["--no-checkout"]
+    # Faster clones if possible
+    if get_git_version() >= Version("2.27"):
+        if url_match := re.match("(file://)?(.*)", url):
+            file_url = url_match.groups()[-1]
+        else:
+            file_url = url
+        if is_git_shallow_repo(file_url):
+            warn(
+                f"The repository '{url}' is a shallow clone, this might lead to unexpected "
+                "failure or unusually high resource consumption.",
+                ShallowCloneWarning,
+            )
+        else:
+            options.append("--filter=blob:none")
+    get_git_backend().clone(url, location, *options)
+
+
+def _clone_shallow(url: str, location: str, ref: str) -> None:
+    """Clone only the commit that a branch or tag points to."""
+    options = ["--no-checkout", "--depth=1"]
+    if ref != "HEAD":
+        options.extend(("--branch", ref))
+    get_git_backend().clone(url, location, *options)
+
+
 def valid_version(version_: str) -> bool:
     """Tell if a string is a valid [PEP 440][] version specifier.
 
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import platform
 import sys
+from pathlib import Path
 from typing import Any, Iterator
 
 import pytest
@@ -66,6 +67,17 @@ def default_gitconfig(default_gitconfig: GitConfig) -> GitConfig:
     return default_gitconfig
 
 
+@pytest.fixture(scope="session", autouse=True)
+def copier_cache_dir(tmp_path_factory: pytest.TempPathFactory) -> Iterator[Path]:
+    """Keep Copier's persistent caches isolated from the user ones."""
+    path = tmp_path_factory.mktemp("copier-cache")
+    # local.env is a snapshot frozen at Python startup, so patch it too
+    with local.env(COPIER_CACHE_DIR=str(path)):
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            monkeypatch.setenv("COPIER_CACHE_DIR", str(path))
+            yield path
+
+
 @pytest.fixture
 def gitconfig(gitconfig: GitConfig) -> Iterator[GitConfig]:
     """
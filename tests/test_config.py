@@ -12,6 +12,7 @@ import copier
 from copier.errors import InvalidConfigFileError, MultipleConfigFilesError
 from copier.template import DEFAULT_EXCLUDE, Task, Template, load_template_config
 from copier.types import AnyByStrDict
+from copier.user_data import load_answersfile_data
 
 from .helpers import BRACKET_ENVOPS_JSON, SUFFIX_TMPL, build_file_tree, git_init
 
@@ -301,6 +302,50 @@ def test_worker_good_data(tmp_path: Path) -> None:
     ]
 
 
+def test_worker_render_context_snapshot(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ["src", "dst"])
+    build_file_tree({src / "copier.yml": "project_name: demo"})
+    worker = copier.Worker(str(src), dst, defaults=True)
+    context = worker._render_context_snapshot
+    assert worker._render_context_snapshot is context
+    assert "project_name" not in worker._render_context()
+    with pytest.raises(TypeError):
+        context["project_name"] = "nope"  # type: ignore[index]
+    # Each render gets its own copy of Copier's own mappings
+    assert worker._render_context()["_copier_conf"] is not context["_copier_conf"]
+    assert worker._render_context()["_copier_answers"] is not context["_copier_answers"]
+    # Answering questions builds a new context
+    worker._ask()
+    assert worker._render_context_snapshot is not context
+    assert worker._render_context()["project_name"] == "demo"
+
+
+def test_render_context_changes_do_not_leak(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ["src", "dst"])
+    build_file_tree(
+        {
+            src / "copier.yml": "project_name: demo",
+            # Rendered before the answers file
+            src / "a.txt.jinja": (
+                "{{ _copier_answers.pop('project_name') }}"
+                "{{ _copier_conf.pop('os') is not none }}"
+            ),
+            src / "{{ _copier_conf.answers_file }}.jinja": (
+                "{{ _copier_answers|to_nice_yaml }}"
+            ),
+            src / "os.txt.jinja": "{{ 'os' in _copier_conf }}",
+        }
+    )
+    copier.run_copy(str(src), dst, defaults=True)
+    assert (dst / "a.txt").read_text() == "demoTrue"
+    assert load_answersfile_data(dst)["project_name"] == "demo"
+    assert (dst / "os.txt").read_text() == "True"
+
+
 @pytest.mark.parametrize(
     "test_input, expected_exclusions",
     [
@@ -207,6 +207,23 @@ def test_copy(tmp_path: Path) -> None:
     assert (tmp_path / "aaaa.txt").exists()
 
 
+def test_copy_parallel(tmp_path_factory: pytest.TempPathFactory) -> None:
+    sequential, parallel = map(tmp_path_factory.mktemp, ["sequential", "parallel"])
+    render(sequential)
+    render(parallel, render_jobs=4)
+
+    def assert_same_tree(cmp: filecmp.dircmp[str]) -> None:
+        assert not cmp.left_only
+        assert not cmp.right_only
+        assert not cmp.diff_files
+        assert not cmp.funny_files
+        for sub in cmp.subdirs.values():
+            assert_same_tree(sub)
+
+    # config.py contains a random secret
+    assert_same_tree(filecmp.dircmp(sequential, parallel, ignore=["config.py"]))
+
+
 @pytest.mark.impure
 def test_copy_repo(tmp_path: Path) -> None:
     copier.run_copy(
@@ -1042,3 +1059,55 @@ def test_templated_choices(tmp_path_factory: pytest.TempPathFactory, spec: str)
     )
     copier.run_copy(str(src), dst, data={"q": "two"})
     assert yaml.safe_load((dst / "q.txt").read_text()) == "two"
+
+
+def test_render_order_is_sorted(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    build_file_tree(
+        {
+            (src / "b.txt"): "",
+            (src / "a" / "z.txt"): "",
+            (src / "a" / "y" / "x.txt"): "",
+            (src / "c.txt.jinja"): "",
+        }
+    )
+    rendered: list[str] = []
+    original_render_file = copier.Worker._render_file
+
+    def _render_file(self: copier.Worker, src_relpath: Path, *args: Any) -> None:
+        rendered.append(src_relpath.as_posix())
+        original_render_file(self, src_relpath, *args)
+
+    monkeypatch.setattr(copier.Worker, "_render_file", _render_file)
+    copier.run_copy(str(src), dst)
+    assert rendered == ["a/y/x.txt", "a/z.txt", "b.txt", "c.txt.jinja"]
+
+
+@pytest.mark.skipif(
+    platform.system() == "Windows", reason="Paths this long need extra setup"
+)
+def test_copy_deeper_than_recursion_limit(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    deep = Path(*["d"] * (sys.getrecursionlimit() + 10))
+    # Create each level on its own, because `mkdir(parents=True)` is recursive
+    folder = src
+    for part in deep.parts:
+        folder /= part
+        folder.mkdir()
+    (folder / "deep.txt").write_text("deep")
+    try:
+        copier.run_copy(str(src), dst)
+        assert (dst / deep / "deep.txt").read_text() == "deep"
+    finally:
+        # Remove each level on its own too, because `rmtree` is recursive
+        for root in (src, dst):
+            (root / deep / "deep.txt").unlink(missing_ok=True)
+            for parent in (root / deep, *(root / deep).parents):
+                if parent == root:
+                    break
+                if parent.exists():
+                    parent.rmdir()
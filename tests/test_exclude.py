@@ -262,3 +262,34 @@ def test_exclude_wildcard_negate_nested_file(
         "..", "keep-me.txt"
     )
     assert not (dst / "exclude-me.txt").exists()
+
+
+def test_exclude_prunes_folders(tmp_path_factory: pytest.TempPathFactory) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    build_file_tree(
+        {
+            (src / "copier.yml"): "_exclude: [node_modules]",
+            (src / "node_modules" / "pkg" / "{{ 1 / 0 }}.js"): "",
+            (src / "keep.txt"): "",
+        }
+    )
+    # Names inside excluded folders are never rendered
+    run_copy(str(src), dst)
+    assert (dst / "keep.txt").exists()
+    assert not (dst / "node_modules").exists()
+
+
+def test_exclude_negated_inside_excluded_folder(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    build_file_tree(
+        {
+            (src / "copier.yml"): "_exclude: [vendor, '!vendor/lib/keep.txt']",
+            (src / "vendor" / "lib" / "keep.txt"): "",
+            (src / "vendor" / "lib" / "drop.txt"): "",
+        }
+    )
+    run_copy(str(src), dst)
+    assert (dst / "vendor" / "lib" / "keep.txt").exists()
+    assert not (dst / "vendor" / "lib" / "drop.txt").exists()
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+from jinja2.bccache import Bucket
+
+from copier import run_copy
+from copier.jinja import CachedSandboxedEnvironment, TemplateBytecodeCache
+from copier.main import Worker
+
+from .helpers import build_file_tree, git_save
+
+
+def test_from_string_cache() -> None:
+    env = CachedSandboxedEnvironment()
+    first = env.from_string("Hello {{ name }}")
+    assert env.from_string("Hello {{ name }}") is first
+    assert env.from_string("Bye {{ name }}") is not first
+    info = env.string_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 2, 2)
+    assert first.render(name="Mario") == "Hello Mario"
+    env.string_cache_clear()
+    assert env.string_cache_info().currsize == 0
+
+
+def test_from_string_cache_is_bounded() -> None:
+    env = CachedSandboxedEnvironment(string_cache_size=2)
+    for source in ("a", "b", "c", "a"):
+        env.from_string(source)
+    info = env.string_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (0, 4, 2)
+
+
+def test_from_string_not_cached() -> None:
+    env = CachedSandboxedEnvironment()
+    assert env.from_string("{{ x }}", globals={"x": 1}).render() == "1"
+    assert env.string_cache_info().misses == 0
+    with pytest.raises(TypeError):
+        env.from_string(1)  # type: ignore[arg-type]
+
+
+def test_cache_shared_by_worker_and_questions(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ["src", "dst"])
+    build_file_tree(
+        {
+            src / "copier.yml": """\
+                project_name:
+                    type: str
+                    default: demo
+                copy_of_name:
+                    type: str
+                    default: "{{ project_name }}"
+                """,
+            src / "{{ project_name }}" / "a.txt": "a",
+            src / "{{ project_name }}" / "b.txt": "b",
+        }
+    )
+    with Worker(str(src), dst, defaults=True) as worker:
+        worker.run_copy()
+        info = worker.jinja_env.string_cache_info()
+    assert (dst / "demo" / "a.txt").read_text() == "a"
+    # The folder name was compiled for the question default, and reused
+    assert info.hits > 0
+    assert info.currsize < info.hits + info.misses
+
+
+def test_is_literal() -> None:
+    env = CachedSandboxedEnvironment()
+    assert env.is_literal("plain name.txt")
+    assert env.is_literal("two\nlines")
+    assert not env.is_literal("{{ name }}")
+    assert not env.is_literal("{% if x %}{% endif %}")
+    assert not env.is_literal("{# comment #}")
+    # Rendering drops the trailing newline
+    assert not env.is_literal("line\n")
+    custom = CachedSandboxedEnvironment(
+        variable_start_string="[[",
+        variable_end_string="]]",
+        line_statement_prefix="%%",
+    )
+    assert custom.is_literal("{{ name }}")
+    assert not custom.is_literal("[[ name ]]")
+    assert not custom.is_literal("%% if x")
+
+
+def test_literal_renders_skip_jinja(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ["src", "dst"])
+    build_file_tree(
+        {
+            src / "copier.yml": """\
+                name:
+                    type: str
+                    default: demo
+                    help: Your name
+                """,
+            src / "folder" / "a.txt": "a",
+            src / "b.txt.jinja": "{{ name }}",
+        }
+    )
+    with Worker(str(src), dst, defaults=True) as worker:
+        worker.run_copy()
+        env = worker.jinja_env
+    assert (dst / "b.txt").read_text() == "demo"
+    assert env.literal_renders > 0
+    # Only templated strings are compiled
+    assert env.string_cache_info().currsize == 0
+
+
+def test_path_plan_renders_folders_once(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ["src", "dst"])
+    build_file_tree(
+        {
+            src / "copier.yml": "name: demo",
+            src / "{{ name }}" / "deep" / "{{ name }}.txt": "1",
+            src / "{{ name }}" / "deep" / "b.txt": "2",
+            src / "{{ name }}" / "c.txt": "3",
+            src / "d.txt": "4",
+            src / "d.txt.jinja": "5",
+        }
+    )
+    rendered: list[str] = []
+    original_render_string = Worker._render_string
+
+    def _render_string(self: Worker, string: str, *args: object) -> str:
+        rendered.append(string)
+        return original_render_string(self, string, *args)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(Worker, "_render_string", _render_string)
+    run_copy(str(src), dst, defaults=True)
+    assert (dst / "demo" / "deep" / "demo.txt").read_text() == "1"
+    assert (dst / "demo" / "deep" / "b.txt").read_text() == "2"
+    assert (dst / "demo" / "c.txt").read_text() == "3"
+    assert (dst / "d.txt").read_text() == "5"
+    # Each templated name is rendered once, and literal names never
+    assert rendered.count("{{ name }}") == 1
+    assert rendered.count("{{ name }}.txt") == 1
+    assert not {"deep", "b.txt", "c.txt", "d.txt"} & set(rendered)
+
+
+def test_bytecode_cache(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    src, dst1, dst2, dst3, cache = map(
+        tmp_path_factory.mktemp, ["src", "dst1", "dst2", "dst3", "cache"]
+    )
+    monkeypatch.setenv("COPIER_CACHE_DIR", str(cache))
+    build_file_tree({src / "file.txt.jinja": "{{ 1 + 1 }}"})
+    git_save(src)
+    dumps: list[str] = []
+    original_dump = TemplateBytecodeCache.dump_bytecode
+
+    def _dump(self: TemplateBytecodeCache, bucket: Bucket) -> None:
+        dumps.append(bucket.key)
+        original_dump(self, bucket)
+
+    monkeypatch.setattr(TemplateBytecodeCache, "dump_bytecode", _dump)
+    run_copy(str(src), dst1, bytecode_cache=True)
+    assert len(dumps) == 1
+    assert list((cache / "bytecode").iterdir())
+    # Later runs load compiled files instead of compiling them again
+    run_copy(str(src), dst2, bytecode_cache=True)
+    assert len(dumps) == 1
+    # Changed sources are compiled again
+    build_file_tree({src / "file.txt.jinja": "{{ 2 + 2 }}"})
+    run_copy(str(src), dst3, bytecode_cache=True)
+    assert len(dumps) == 2
+    assert (dst2 / "file.txt").read_text() == "2"
+    assert (dst3 / "file.txt").read_text() == "4"
+
+
+def test_prune_bytecode_cache(tmp_path: Path) -> None:
+    env = CachedSandboxedEnvironment()
+    cache = TemplateBytecodeCache(tmp_path, "v1")
+    buckets = [cache.get_bucket(env, name, None, name) for name in ("old", "new")]
+    for bucket in buckets:
+        bucket.code = compile("", "<test>", "exec")
+        cache.dump_bytecode(bucket)
+    old_file, new_file = (tmp_path / (cache.pattern % bucket.key) for bucket in buckets)
+    os.utime(old_file, (0, 0))
+    cache.prune(max_age=86400, max_size=2**40)
+    assert not old_file.exists()
+    assert new_file.exists()
+    # Loading a file marks it as recently used
+    os.utime(new_file, (0, 0))
+    cache.get_bucket(env, "new", None, "new")
+    cache.prune(max_age=86400, max_size=2**40)
+    assert new_file.exists()
+    cache.prune(max_age=86400, max_size=0)
+    assert not new_file.exists()
+
+
+def test_prune_bytecode_cache_once_per_day(tmp_path: Path) -> None:
+    # The first cache pruned the directory already today
+    cache = TemplateBytecodeCache(tmp_path)
+    old_file = tmp_path / (cache.pattern % "old")
+    old_file.touch()
+    os.utime(old_file, (0, 0))
+    TemplateBytecodeCache(tmp_path)
+    assert old_file.exists()
+    os.utime(tmp_path / "last-prune", (0, 0))
+    TemplateBytecodeCache(tmp_path)
+    assert not old_file.exists()
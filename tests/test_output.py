@@ -49,6 +49,16 @@ def test_output_skip(capsys: pytest.CaptureFixture[str], tmp_path: Path) -> None
     assert re.search(r"identical[^\s]*  doc[/\\]images[/\\]nslogo\.gif", err)
 
 
+def test_output_parallel(capsys: pytest.CaptureFixture[str], tmp_path: Path) -> None:
+    render(tmp_path)
+    capsys.readouterr()
+    render(tmp_path, quiet=False, defaults=True, overwrite=True)
+    _, sequential_err = capsys.readouterr()
+    render(tmp_path, quiet=False, defaults=True, overwrite=True, render_jobs=4)
+    _, parallel_err = capsys.readouterr()
+    assert parallel_err == sequential_err
+
+
 def test_output_quiet(capsys: pytest.CaptureFixture[str], tmp_path: Path) -> None:
     render(tmp_path, quiet=True)
     out, err = capsys.readouterr()
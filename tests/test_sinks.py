@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import os
+import re
+import stat
+from pathlib import Path, PurePath, PurePosixPath
+from typing import Any
+
+import pytest
+
+from copier import run_copy
+from copier.sinks import DirectorySink, GitTreeSink, MemorySink, WriteBackSink
+from copier.tools import CHUNK_SIZE
+
+from .helpers import build_file_tree, git
+
+
+@pytest.fixture
+def template(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    src = tmp_path_factory.mktemp("src")
+    build_file_tree(
+        {
+            src / "copier.yml": "_preserve_symlinks: true\nname: world",
+            src / "hello.txt.jinja": "Hello {{ name }}",
+            src / "run.sh": "#!/bin/sh",
+            src / "link.txt": Path("hello.txt"),
+            src / "{{ name }}" / "nested.txt": "nested",
+        }
+    )
+    (src / "run.sh").chmod(0o755)
+    (src / "empty").mkdir()
+    return src
+
+
+def test_memory_sink(template: Path, tmp_path: Path) -> None:
+    sink = MemorySink()
+    dst = tmp_path / "dst"
+    run_copy(str(template), dst, defaults=True, sink=sink)
+    assert not dst.exists()
+    entries = sink.entries
+    assert entries[PurePosixPath("hello.txt")][1] == b"Hello world"
+    assert entries[PurePosixPath("world", "nested.txt")][1] == b"nested"
+    assert entries[PurePosixPath("run.sh")][0] & stat.S_IXUSR
+    assert entries[PurePosixPath("link.txt")] == (
+        stat.S_IFLNK | 0o777,
+        b"hello.txt",
+    )
+    assert stat.S_ISDIR(entries[PurePosixPath("empty")][0])
+
+
+def test_git_tree_sink(template: Path, tmp_path: Path) -> None:
+    repo = tmp_path / "repo"
+    git("init", repo)
+    with GitTreeSink(repo, prefix="sub") as sink:
+        run_copy(str(template), repo / "sub", defaults=True, sink=sink, render_jobs=4)
+        first = sink.commit("first")
+        sink.discard([PurePosixPath("sub", "run.sh")])
+        second = sink.commit("second", parent=first)
+    assert not (repo / "sub").exists()
+    assert git("-C", repo, "rev-parse", "refs/copier/tree").strip() == second
+    assert git("-C", repo, "rev-parse", f"{second}^").strip() == first
+    tree = git("-C", repo, "ls-tree", "-r", first).splitlines()
+    modes = {line.split("\t")[1]: line.split()[0] for line in tree}
+    assert modes == {
+        "sub/hello.txt": "100644",
+        "sub/link.txt": "120000",
+        "sub/run.sh": "100755",
+        "sub/world/nested.txt": "100644",
+    }
+    assert git("-C", repo, "show", f"{first}:sub/hello.txt") == "Hello world"
+    assert "sub/run.sh" not in git("-C", repo, "ls-tree", "-r", second)
+    assert PurePosixPath("sub", "empty") in sink.manifest
+
+
+def test_reflink(template: Path, tmp_path: Path) -> None:
+    dst = tmp_path / "dst"
+    run_copy(str(template), dst, defaults=True, reflink=True)
+    assert (dst / "run.sh").read_text() == "#!/bin/sh"
+    assert (dst / "run.sh").stat().st_mode & stat.S_IXUSR
+    assert (dst / "hello.txt").read_text() == "Hello world"
+
+
+@pytest.mark.parametrize("render_jobs", [1, 4])
+def test_big_files_are_streamed(
+    tmp_path_factory: pytest.TempPathFactory,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    render_jobs: int,
+) -> None:
+    src, dst, repo = map(tmp_path_factory.mktemp, ["src", "dst", "repo"])
+    content = os.urandom(CHUNK_SIZE * 2 + 1)
+    build_file_tree({src / "big.bin": content})
+    original_read_bytes = Path.read_bytes
+
+    def _read_bytes(self: Path) -> bytes:
+        assert self.name != "big.bin", "Big files must not be loaded whole"
+        return original_read_bytes(self)
+
+    monkeypatch.setattr(Path, "read_bytes", _read_bytes)
+    run_copy(str(src), dst, defaults=True, render_jobs=render_jobs)
+    assert original_read_bytes(dst / "big.bin") == content
+    # Compared in chunks on later copies
+    capsys.readouterr()
+    run_copy(str(src), dst, defaults=True, render_jobs=render_jobs)
+    assert re.search(r"identical[^\s]*  big\.bin", capsys.readouterr().err)
+    git("init", repo)
+    with GitTreeSink(repo) as sink:
+        run_copy(str(src), repo, defaults=True, sink=sink, render_jobs=render_jobs)
+        commit = sink.commit()
+    blob = git("-C", repo, "rev-parse", f"{commit}:big.bin").strip()
+    assert blob == git("hash-object", dst / "big.bin").strip()
+
+
+def test_existing_files_are_compared_cheaply(
+    template: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    dst = tmp_path / "dst"
+    run_copy(str(template), dst, defaults=True, incremental=True)
+    (dst / "hello.txt").write_text("Bye")
+    original_read_bytes = Path.read_bytes
+
+    def _read_bytes(self: Path) -> bytes:
+        assert self != dst / "hello.txt", "Its size changed, so it needn't be read"
+        return original_read_bytes(self)
+
+    def _same_contents(_path: Path, _other: Path) -> bool:
+        raise AssertionError("Template files must be hashed only once")
+
+    monkeypatch.setattr(Path, "read_bytes", _read_bytes)
+    monkeypatch.setattr("copier.main.same_contents", _same_contents)
+    capsys.readouterr()
+    run_copy(str(template), dst, defaults=True, incremental=True, overwrite=True)
+    assert re.search(r"identical[^\s]*  run\.sh", capsys.readouterr().err)
+    assert (dst / "hello.txt").read_text() == "Hello world"
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_write_back_sink(tmp_path: Path, jobs: int) -> None:
+    sink = WriteBackSink(DirectorySink(tmp_path), jobs)
+    for index in range(50):
+        sink.write_file(PurePosixPath("sub", f"{index}.txt"), b"%d" % index, 0o644)
+    sink.write_symlink(PurePosixPath("link"), PurePosixPath("sub"), 0o777)
+    sink.make_dir(PurePosixPath("empty"))
+    sink.flush()
+    assert (tmp_path / "sub" / "49.txt").read_bytes() == b"49"
+    assert (tmp_path / "link").is_symlink()
+    assert (tmp_path / "empty").is_dir()
+
+
+def test_write_back_sink_errors() -> None:
+    class FailingSink(MemorySink):
+        def write_file(self, path: PurePath, content: bytes, mode: int) -> None:
+            if path.name == "bad.txt":
+                raise OSError("Cannot write")
+            super().write_file(path, content, mode)
+
+    memory = FailingSink()
+    sink = WriteBackSink(memory)
+    sink.write_file(PurePosixPath("bad.txt"), b"", 0o644)
+    with pytest.raises(OSError, match="Cannot write"):
+        for index in range(50):
+            sink.write_file(PurePosixPath(f"{index}.txt"), b"", 0o644)
+        sink.flush()
+    # Writes queued after the error are skipped, and new ones work again
+    assert len(memory.entries) < 50
+    sink.write_file(PurePosixPath("good.txt"), b"", 0o644)
+    sink.flush()
+    assert PurePosixPath("good.txt") in memory.entries
+
+
+def test_directory_sink_makes_dirs_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    made: list[Path] = []
+    original_mkdir = Path.mkdir
+
+    def _mkdir(self: Path, *args: Any, **kwargs: Any) -> None:
+        made.append(self)
+        original_mkdir(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "mkdir", _mkdir)
+    sink = DirectorySink(tmp_path)
+    for index in range(10):
+        sink.write_file(PurePosixPath("sub", f"{index}.txt"), b"", 0o644)
+    assert made == [tmp_path / "sub"]
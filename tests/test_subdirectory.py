@@ -310,3 +310,67 @@ def test_new_version_changes_subdirectory(
     # Also assert the subdirectories themselves were not rendered
     assert not (dst / "subdir1").exists()
     assert not (dst / "subdir2").exists()
+
+
+@pytest.mark.parametrize("subdirectory", ["template", "{{ 'template' }}"])
+def test_sparse_checkout(
+    tmp_path_factory: pytest.TempPathFactory, subdirectory: str
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    build_file_tree(
+        {
+            src / "copier.yml": f"""\
+                _subdirectory: "{subdirectory}"
+                _sparse_checkout: true
+                ---
+                !include questions/*.yml
+                """,
+            src / "questions" / "name.yml": "name: world",
+            src / "docs" / "huge.md": "Nobody needs this",
+            src / "template" / "hello.txt.jinja": "Hello {{ name }}",
+        }
+    )
+    with local.cwd(src):
+        git_init("v1")
+        git("tag", "v1")
+    with copier.Worker(str(src), dst, vcs_ref="v1", defaults=True) as worker:
+        worker.run_copy()
+        checked_out = {
+            path.relative_to(worker.template.local_abspath).as_posix()
+            for path in worker.template.local_abspath.rglob("*")
+            if ".git" not in path.parts
+        }
+    assert (dst / "hello.txt").read_text() == "Hello world"
+    assert ("docs/huge.md" in checked_out) == (subdirectory != "template")
+
+
+@pytest.mark.parametrize("clone_cache", ["true", "false"])
+def test_sparse_checkout_latest_tag(
+    tmp_path_factory: pytest.TempPathFactory,
+    monkeypatch: pytest.MonkeyPatch,
+    clone_cache: str,
+) -> None:
+    src, dst, cache = map(tmp_path_factory.mktemp, ("src", "dst", "cache"))
+    monkeypatch.setenv("COPIER_CACHE_DIR", str(cache))
+    monkeypatch.setenv("COPIER_CLONE_CACHE", clone_cache)
+    build_file_tree(
+        {
+            src / "copier.yml": """\
+                _subdirectory: template
+                _sparse_checkout: true
+                """,
+            src / "docs" / "huge.md": "Nobody needs this",
+            src / "template" / "hello.txt": "Hello",
+        }
+    )
+    with local.cwd(src):
+        git_init("v1")
+        git("tag", "v1")
+        git("commit", "--allow-empty", "-m", "untagged")
+    # A remote template, so the clone cache applies when enabled
+    with copier.Worker(f"git+{src.as_uri()}", dst, defaults=True) as worker:
+        worker.run_copy()
+        template_root = worker.template.local_abspath
+        assert worker.template.commit == "v1"
+        assert not (template_root / "docs" / "huge.md").exists()
+    assert (dst / "hello.txt").read_text() == "Hello"
@@ -1,11 +1,22 @@
+import os
+from itertools import product
 from pathlib import Path
 from stat import S_IREAD
 from tempfile import TemporaryDirectory
 
 import pytest
+from pathspec import PathSpec
 from poethepoet.app import PoeThePoet
 
-from copier.tools import normalize_git_path
+from copier.tools import (
+    CHUNK_SIZE,
+    PathMatcher,
+    clone_file,
+    escape_git_path,
+    file_lock,
+    normalize_git_path,
+    same_contents,
+)
 
 from .helpers import git
 
@@ -52,3 +63,66 @@ def test_temporary_directory_with_git_repo_deletion() -> None:
 )
 def test_normalizing_git_paths(path: str, normalized: str) -> None:
     assert normalize_git_path(path) == normalized
+
+
+def test_file_lock(tmp_path: Path) -> None:
+    lock = tmp_path / "sub" / "some.lock"
+    with file_lock(lock), pytest.raises(TimeoutError), file_lock(lock, timeout=0):
+        pass
+    # Released, even though the lock file stays
+    assert lock.exists()
+    with file_lock(lock, timeout=0):
+        pass
+
+
+@pytest.mark.parametrize(
+    "patterns",
+    [
+        ["a", "/b", "a/c.txt", "*.py", "d/"],
+        ["*", "!*.txt", "a/c.txt"],
+        ["a", "!a/b", "a/b/c.txt", "!**/d.py"],
+        ["a/**/c.txt", "\\!b", "# comment", "", "/"],
+        [escape_git_path(path) for path in ("a/b", "[b]", "sp ace ", "c*.txt")],
+    ],
+)
+def test_path_matcher(patterns: list[str]) -> None:
+    spec = PathSpec.from_lines("gitwildmatch", patterns)
+    matcher = PathMatcher(patterns)
+    names = ["a", "b", "!b", "[b]", "c.txt", "c*.txt", "d", "d.py", "sp ace "]
+    paths: list[str | Path] = [
+        "/".join(parts) for parts in product(names, repeat=3) if len(set(parts)) == 3
+    ]
+    paths += names + [Path(path) for path in paths[::7]]
+    for path in paths:
+        assert matcher.match_file(path) == spec.match_file(path), (path, patterns)
+
+
+@pytest.mark.parametrize(
+    ("content", "other", "same"),
+    [
+        (b"", b"", True),
+        (b"a" * CHUNK_SIZE * 2, b"a" * CHUNK_SIZE * 2, True),
+        (b"a" * CHUNK_SIZE * 2, b"a" * CHUNK_SIZE + b"b" * CHUNK_SIZE, False),
+        (b"abc", b"abcd", False),
+    ],
+)
+def test_same_contents(
+    tmp_path: Path, content: bytes, other: bytes, same: bool
+) -> None:
+    (tmp_path / "a").write_bytes(content)
+    (tmp_path / "b").write_bytes(other)
+    assert same_contents(tmp_path / "a", tmp_path / "b") is same
+    with pytest.raises(FileNotFoundError):
+        same_contents(tmp_path / "missing", tmp_path / "b")
+
+
+@pytest.mark.parametrize("size", [0, 10, CHUNK_SIZE * 2 + 1])
+def test_clone_file(tmp_path: Path, size: int) -> None:
+    content = os.urandom(size)
+    (tmp_path / "src").write_bytes(content)
+    (tmp_path / "dst").write_bytes(b"previous contents, longer than some sources")
+    clone_file(tmp_path / "src", tmp_path / "dst")
+    assert (tmp_path / "dst").read_bytes() == content
+    # They are independent copies
+    (tmp_path / "dst").write_bytes(b"changed")
+    assert (tmp_path / "src").read_bytes() == content
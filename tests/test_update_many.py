@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+from plumbum import local
+
+from copier import run_copy, run_update_many
+from copier.cli import CopierApp
+from copier.vcs import clone
+
+from .helpers import build_file_tree, git_save
+
+
+@pytest.fixture
+def tpl(tmp_path_factory: pytest.TempPathFactory) -> str:
+    """A template with 2 versions."""
+    src = tmp_path_factory.mktemp("tpl")
+    build_file_tree(
+        {
+            src / "copier.yml": "your_name: Mario",
+            src / "{{ _copier_conf.answers_file }}.jinja": (
+                "{{ _copier_answers|to_nice_yaml }}"
+            ),
+            src / "name.txt.jinja": "Hello {{ your_name }}.",
+        }
+    )
+    git_save(src, tag="v1")
+    return str(src)
+
+
+def _subprojects(tpl: str, root: Path, names: list[str]) -> list[Path]:
+    """Copy the template into one subproject per name, and evolve the template."""
+    result = []
+    for name in names:
+        dst = root / name
+        run_copy(tpl, dst, data={"your_name": name}, defaults=True, overwrite=True)
+        git_save(dst)
+        result.append(dst)
+    Path(tpl, "name.txt.jinja").write_text("Bye {{ your_name }}.")
+    git_save(tpl, tag="v2")
+    return result
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_update_many(tpl: str, tmp_path: Path, jobs: int) -> None:
+    dsts = _subprojects(tpl, tmp_path, ["Luigi", "Peach", "Toad"])
+    results = run_update_many(dsts, jobs=jobs)
+    assert [result.dst_path for result in results] == dsts
+    for result in results:
+        assert result.ok
+        assert result.old_version == "1"
+        assert result.new_version == "2"
+        dst = Path(result.dst_path)
+        assert (dst / "name.txt").read_text() == f"Bye {dst.name}."
+
+
+def test_update_many_clones_each_template_once(
+    tpl: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    dsts = _subprojects(tpl, tmp_path, ["Luigi", "Peach", "Toad"])
+    clones = []
+
+    def _clone(url: str, ref: str | None = None, **kwargs: Any) -> str:
+        clones.append(ref)
+        return clone(url, ref, **kwargs)
+
+    monkeypatch.setattr("copier.template.clone", _clone)
+    results = run_update_many(dsts, jobs=1)
+    assert all(result.ok for result in results)
+    # Old and new template versions, shared by all subprojects
+    assert len(clones) == 2
+
+
+def test_update_many_reports_failures(tpl: str, tmp_path: Path) -> None:
+    dsts = _subprojects(tpl, tmp_path, ["Luigi", "Peach"])
+    broken = tmp_path / "broken"
+    broken.mkdir()
+    results = run_update_many([dsts[0], broken, dsts[1]], jobs=2)
+    assert [result.ok for result in results] == [True, False, True]
+    assert results[1].dst_path == broken
+    assert results[1].error
+    assert (dsts[1] / "name.txt").read_text() == "Bye Peach."
+
+
+def test_update_many_cli(tpl: str, tmp_path: Path) -> None:
+    dsts = _subprojects(tpl, tmp_path, ["Luigi", "Peach"])
+    with local.cwd(tmp_path):
+        _, retcode = CopierApp.run(
+            ["copier", "update-many", "-j", "2", "Luigi", "Peach"], exit=False
+        )
+    assert retcode == 0
+    for dst in dsts:
+        assert (dst / "name.txt").read_text() == f"Bye {dst.name}."
+    with local.cwd(tmp_path):
+        _, retcode = CopierApp.run(
+            ["copier", "update-many", "Luigi", str(tmp_path)], exit=False
+        )
+    assert retcode == 1
@@ -1768,3 +1768,167 @@ def test_gitignore_file_unignored(
     # Otherwise, it should succeed.
     run_update(dst_path=dst, overwrite=True)
     assert "_commit: v3" in (dst / ".copier-answers.yml").read_text()
+
+
+@pytest.mark.parametrize("tasks", [False, True])
+def test_update_renders_new_template_once(
+    tmp_path_factory: pytest.TempPathFactory,
+    monkeypatch: pytest.MonkeyPatch,
+    tasks: bool,
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    with local.cwd(src):
+        build_file_tree(
+            {
+                "copier.yml": "_tasks: ['touch task.txt']" if tasks else "",
+                "{{ _copier_conf.answers_file }}.jinja": "{{ _copier_answers|to_nice_yaml }}",
+                "a.txt": "a\nb\nc\n",
+                "old.txt": "old",
+            }
+        )
+        git_init("v1")
+        git("tag", "v1")
+    run_copy(str(src), dst, defaults=True, overwrite=True, unsafe=True)
+    with local.cwd(dst):
+        Path("a.txt").write_text("a\nb\nc\nproject\n")
+        git_init("v1")
+    with local.cwd(src):
+        Path("a.txt").write_text("template\na\nb\nc\n")
+        Path("old.txt").unlink()
+        Path("new.txt").write_text("new")
+        git("add", "-A")
+        git("commit", "-m2")
+        git("tag", "v2")
+    renders = []
+    original_render = Worker._render_template
+
+    def _render(self: Worker) -> None:
+        renders.append(self.dst_path)
+        original_render(self)
+
+    monkeypatch.setattr(Worker, "_render_template", _render)
+    run_update(dst, overwrite=True, unsafe=True)
+    # Old template, and new template in the final destination; without tasks,
+    # the new template doesn't need to be rendered again
+    assert len(renders) == (3 if tasks else 2)
+    assert (dst / "a.txt").read_text() == "template\na\nb\nc\nproject\n"
+    assert (dst / "new.txt").read_text() == "new"
+    assert not (dst / "old.txt").exists()
+
+
+def test_update_keeps_ignored_rendered_files(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    with local.cwd(src):
+        build_file_tree(
+            {
+                "{{ _copier_conf.answers_file }}.jinja": "{{ _copier_answers|to_nice_yaml }}",
+                ".gitignore": "*.log\n",
+                "logs/debug.log.jinja": "log",
+                "a.txt": "a",
+            }
+        )
+        git_init("v1")
+        git("tag", "v1")
+    run_copy(str(src), dst, defaults=True, overwrite=True)
+    with local.cwd(dst):
+        git_init("v1")
+    with local.cwd(src):
+        Path("a.txt").write_text("b")
+        git("commit", "-am2")
+        git("tag", "v2")
+    run_update(dst, overwrite=True)
+    # The old template is rendered without touching the disk, but files
+    # ignored by Git are still left out of the old copy, like before
+    assert (dst / "a.txt").read_text() == "b"
+    assert (dst / "logs" / "debug.log").read_text() == "log"
+
+
+def test_update_removes_old_dirs(tmp_path_factory: pytest.TempPathFactory) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    with local.cwd(src):
+        build_file_tree(
+            {
+                "{{ _copier_conf.answers_file }}.jinja": "{{ _copier_answers|to_nice_yaml }}",
+                "gone/a.txt": "a",
+                "gone/deep/b.txt": "b",
+                "kept/c.txt": "c",
+                "kept/old/d.txt": "d",
+            }
+        )
+        git_init("v1")
+        git("tag", "v1")
+    run_copy(str(src), dst, defaults=True, overwrite=True)
+    with local.cwd(dst):
+        build_file_tree({"gone/user.txt": "mine"})
+        git_init("v1")
+    with local.cwd(src):
+        git("rm", "-r", "gone", "kept/old")
+        git("commit", "-m2")
+        git("tag", "v2")
+    run_update(dst, overwrite=True)
+    # Vanished directories are removed, unless something else is left in them
+    assert not (dst / "gone" / "a.txt").exists()
+    assert not (dst / "gone" / "deep").exists()
+    assert (dst / "gone" / "user.txt").read_text() == "mine"
+    assert not (dst / "kept" / "old").exists()
+    assert (dst / "kept" / "c.txt").read_text() == "c"
+
+
+def test_incremental_update(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    src, dst = map(tmp_path_factory.mktemp, ("src", "dst"))
+    with local.cwd(src):
+        build_file_tree(
+            {
+                "copier.yml": """\
+                    _exclude: [copier.yml, .git, part]
+                    name: a
+                    other: b
+                    """,
+                "{{ _copier_conf.answers_file }}.jinja": "{{ _copier_answers|to_nice_yaml }}",
+                "name.txt.jinja": "{{ name }}\n",
+                "other.txt.jinja": "{{ other }}\n",
+                "included.txt.jinja": "{% include 'part.jinja' %}\n",
+                "part.jinja": "part 1",
+                "static.txt": "static\n",
+            }
+        )
+        git_init("v1")
+        git("tag", "v1")
+    run_copy(str(src), dst, defaults=True, overwrite=True, incremental=True)
+    assert (dst / ".copier-answers.manifest.json").is_file()
+    with local.cwd(dst):
+        build_file_tree({"name.txt": "a\nmine\n"})
+        git_init("v1")
+    with local.cwd(src):
+        build_file_tree({"part.jinja": "part 2"})
+        git("commit", "-am2")
+        git("tag", "v2")
+    rendered: list[str] = []
+    original = Worker._render_file_content
+
+    def _render_file_content(self: Worker, src_relpath: Path) -> bytes:
+        rendered.append(src_relpath.as_posix())
+        return original(self, src_relpath)
+
+    monkeypatch.setattr(Worker, "_render_file_content", _render_file_content)
+    run_update(
+        dst, data={"other": "c"}, defaults=True, overwrite=True, incremental=True
+    )
+    # Only files whose sources or answers changed are rendered, by both versions
+    assert sorted(rendered) == sorted(
+        2
+        * [
+            "{{ _copier_conf.answers_file }}.jinja",
+            "included.txt.jinja",
+            "other.txt.jinja",
+        ]
+    )
+    assert (dst / "name.txt").read_text() == "a\nmine\n"
+    assert (dst / "other.txt").read_text() == "c\n"
+    assert (dst / "included.txt").read_text() == "part 2\n"
+    assert (dst / "static.txt").read_text() == "static\n"
+    assert yaml.safe_load((dst / ".copier-answers.yml").read_text())["_commit"] == "v2"
@@ -1,18 +1,32 @@
+import importlib.util
 import os
 import shutil
+from collections.abc import Callable, Iterator, Sequence
 from pathlib import Path
-from typing import Callable, Iterator, Sequence
+from typing import Any
 
 import pytest
 import yaml
 from packaging.version import Version
 from plumbum import local
 
-from copier import Worker, run_copy, run_update
-from copier.errors import ShallowCloneWarning
-from copier.vcs import checkout_latest_tag, clone, get_git_version, get_repo
-
-from .helpers import git
+from copier import Worker, run_copy, run_update, vcs
+from copier.errors import CloneCacheWarning, ShallowCloneWarning, UserMessageError
+from copier.template import Template
+from copier.vcs import (
+    GitObjects,
+    checkout_latest_tag,
+    clear_repo_cache,
+    clone,
+    count_git_processes,
+    get_git,
+    get_git_backend,
+    get_git_version,
+    get_repo,
+    prune_clone_cache,
+)
+
+from .helpers import build_file_tree, git, git_save
 
 
 def test_get_repo() -> None:
@@ -66,6 +80,30 @@ def test_get_repo() -> None:
     )
 
 
+def test_get_repo_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    checks: list[Path] = []
+    original = vcs.is_git_repo_root
+
+    def _is_git_repo_root(path: Path) -> bool:
+        checks.append(path)
+        return original(path)
+
+    monkeypatch.setattr(vcs, "is_git_repo_root", _is_git_repo_root)
+    (tmp_path / "not_a_bundle.txt").write_text("hello")
+    with monkeypatch.context() as patch:
+        # Git is never needed for paths that are obviously not repositories
+        patch.setattr(vcs, "get_git", None)
+        assert get_repo(str(tmp_path)) is None
+        assert get_repo(str(tmp_path / "not_a_bundle.txt")) is None
+    git("init", tmp_path)
+    assert get_repo(str(tmp_path)) == tmp_path.as_posix()
+    assert get_repo(str(tmp_path)) == tmp_path.as_posix()
+    assert len(checks) == 3
+    clear_repo_cache()
+    assert get_repo(str(tmp_path)) == tmp_path.as_posix()
+    assert len(checks) == 4
+
+
 @pytest.mark.impure
 def test_clone() -> None:
     tmp = clone("https://github.com/copier-org/copier.git")
@@ -208,3 +246,360 @@ def test_select_latest_version_tag(
     assert (dst / filename).read_text() == "v1.0.1"
     answers = yaml.safe_load((dst / ".copier-answers.yml").read_text())
     assert answers["_commit"] == "v1.0.1"
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "cache"
+    monkeypatch.setenv("COPIER_CACHE_DIR", str(path))
+    return path
+
+
+def _make_remote(path: Path, tag: str) -> str:
+    path.mkdir(exist_ok=True)
+    with local.cwd(path):
+        git("init")
+        git("config", "uploadpack.allowFilter", "true")
+        Path("version.txt").write_text(tag)
+        git("add", ".")
+        git("commit", "-m", tag)
+        git("tag", tag)
+    return path.as_uri()
+
+
+def test_clone_cache_reuses_mirror(tmp_path: Path, cache_dir: Path) -> None:
+    url = _make_remote(tmp_path / "remote", "v1")
+    first = clone(url)
+    assert Path(first, "version.txt").read_text() == "v1"
+    mirrors = list((cache_dir / "clones").glob("*.git"))
+    assert len(mirrors) == 1
+    # The mirror is a partial clone, with only the contents checked out so far
+    assert git("-C", mirrors[0], "config", "remote.origin.promisor").strip() == "true"
+    # The clone points to the real origin, not to the mirror
+    assert git("-C", first, "remote", "get-url", "origin").strip() == url
+    # Updates are fetched incrementally into the same mirror
+    _make_remote(tmp_path / "remote", "v2")
+    second = clone(url)
+    assert Path(second, "version.txt").read_text() == "v2"
+    assert list((cache_dir / "clones").glob("*.git")) == mirrors
+    # If the origin becomes unreachable, the cached mirror is still usable
+    shutil.rmtree(tmp_path / "remote")
+    with pytest.warns(CloneCacheWarning):
+        third = clone(url, "v1")
+    assert Path(third, "version.txt").read_text() == "v1"
+    for location in (first, second, third):
+        shutil.rmtree(location)
+
+
+def test_clone_cache_disabled(
+    tmp_path: Path, cache_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("COPIER_CLONE_CACHE", "false")
+    location = clone(_make_remote(tmp_path / "remote", "v1"))
+    assert Path(location, "version.txt").read_text() == "v1"
+    assert not (cache_dir / "clones").exists()
+    shutil.rmtree(location)
+
+
+def test_clone_cache_unusable(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # A file where the cache directory should be
+    (tmp_path / "cache").touch()
+    monkeypatch.setenv("COPIER_CACHE_DIR", str(tmp_path / "cache"))
+    url = _make_remote(tmp_path / "remote", "v1")
+    with pytest.warns(CloneCacheWarning, match="without it"):
+        location = clone(url)
+    assert Path(location, "version.txt").read_text() == "v1"
+    shutil.rmtree(location)
+
+
+@pytest.mark.parametrize(
+    "use_prereleases, expected", [(False, "v2.0"), (True, "v3.0a1")]
+)
+def test_latest_remote_tag_shallow_clone(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    use_prereleases: bool,
+    expected: str,
+) -> None:
+    monkeypatch.setenv("COPIER_CLONE_CACHE", "false")
+    for tag in ("v1.0", "v2.0", "not-a-version", "v3.0a1", "v1.5"):
+        url = _make_remote(tmp_path / "remote", tag)
+    template = Template(f"git+{url}", use_prereleases=use_prereleases)
+    assert template.commit == expected
+    assert Path(template.local_abspath, "version.txt").read_text() == expected
+    # Only the tagged commit was fetched
+    assert (
+        git("-C", template.local_abspath, "rev-list", "--count", "HEAD").strip() == "1"
+    )
+    shutil.rmtree(template.local_abspath)
+
+
+@pytest.mark.usefixtures("cache_dir")
+def test_latest_tag_resolved_locally_with_clone_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for tag in ("v1.0", "v2.0"):
+        url = _make_remote(tmp_path / "remote", tag)
+
+    def _latest_remote_tag(*_args: Any) -> str:
+        raise AssertionError("Listing remote tags is useless with the cache")
+
+    monkeypatch.setattr("copier.template.latest_remote_tag", _latest_remote_tag)
+    template = Template(f"git+{url}")
+    assert template.commit == "v2.0"
+    shutil.rmtree(template.local_abspath)
+
+
+def test_clone_cache_skips_local_paths(tmp_path: Path, cache_dir: Path) -> None:
+    _make_remote(tmp_path / "remote", "v1")
+    location = clone(str(tmp_path / "remote"))
+    assert Path(location, "version.txt").read_text() == "v1"
+    assert not (cache_dir / "clones").exists()
+    shutil.rmtree(location)
+
+
+def test_prune_clone_cache(tmp_path: Path, cache_dir: Path) -> None:
+    for name in ("old", "new"):
+        shutil.rmtree(clone(_make_remote(tmp_path / name, name)))
+    old_mirror, new_mirror = sorted(
+        (cache_dir / "clones").glob("*.git"), key=lambda path: path.stat().st_mtime
+    )
+    os.utime(old_mirror, (0, 0))
+    prune_clone_cache(max_age=86400, max_size=2**40)
+    assert not old_mirror.exists()
+    assert new_mirror.exists()
+    prune_clone_cache(max_age=86400, max_size=0)
+    assert not new_mirror.exists()
+
+
+def test_prune_clone_cache_once_per_day(tmp_path: Path, cache_dir: Path) -> None:
+    shutil.rmtree(clone(_make_remote(tmp_path / "old", "old")))
+    (old_mirror,) = (cache_dir / "clones").glob("*.git")
+    os.utime(old_mirror, (0, 0))
+    # The first clone pruned the cache already today
+    new_url = _make_remote(tmp_path / "new", "new")
+    shutil.rmtree(clone(new_url))
+    assert old_mirror.exists()
+    os.utime(cache_dir / "clones" / "last-prune", (0, 0))
+    shutil.rmtree(clone(new_url))
+    assert not old_mirror.exists()
+
+
+def test_lazy_submodules(tmp_path_factory: pytest.TempPathFactory) -> None:
+    src, dst, used, vendor, macros = map(
+        tmp_path_factory.mktemp, ("src", "dst", "used", "vendor", "macros")
+    )
+    build_file_tree(
+        {
+            used / "used.txt": "used",
+            vendor / "huge.txt": "huge",
+            macros / "m.jinja": "{% macro hi() %}hi{% endmacro %}",
+            src / "copier.yml": "_exclude: [copier.yml, .git*, vendor, macros]",
+            src / "hello.txt.jinja": "{% from 'macros/m.jinja' import hi %}{{ hi() }}",
+        }
+    )
+    submodules = {"used": used, "vendor": vendor, "macros": macros}
+    for repo in submodules.values():
+        git_save(repo)
+    # Allow cloning local submodules
+    with local.env(
+        GIT_CONFIG_COUNT="1",
+        GIT_CONFIG_KEY_0="protocol.file.allow",
+        GIT_CONFIG_VALUE_0="always",
+    ):
+        with local.cwd(src):
+            git("init")
+            for name, repo in submodules.items():
+                git("submodule", "add", repo, name)
+        git_save(src, tag="v1")
+        with Worker(str(src), dst, defaults=True) as worker:
+            worker.run_copy()
+            template_root = worker.template.local_abspath
+            assert (template_root / "used" / "used.txt").is_file()
+            # Excluded submodules are only fetched if something else needs them
+            assert not (template_root / "vendor" / "huge.txt").exists()
+            assert (template_root / "macros" / "m.jinja").is_file()
+    assert (dst / "used" / "used.txt").read_text() == "used"
+    assert (dst / "hello.txt").read_text() == "hi"
+    assert not (dst / "vendor").exists()
+
+
+def test_lazy_submodules_in_subdirectory(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    src, dst, used, vendor = map(
+        tmp_path_factory.mktemp, ("src", "dst", "used", "vendor")
+    )
+    build_file_tree(
+        {
+            used / "used.txt": "used",
+            vendor / "huge.txt": "huge",
+            src / "copier.yml": "_subdirectory: tpl\n_exclude: [vendor]",
+            src / "tpl" / "{{ 'hello' }}.txt": "hello",
+        }
+    )
+    submodules = {"used": used, "vendor": vendor}
+    for repo in submodules.values():
+        git_save(repo)
+    # Allow cloning local submodules
+    with local.env(
+        GIT_CONFIG_COUNT="1",
+        GIT_CONFIG_KEY_0="protocol.file.allow",
+        GIT_CONFIG_VALUE_0="always",
+    ):
+        with local.cwd(src):
+            git("init")
+            for name, repo in submodules.items():
+                git("submodule", "add", repo, f"tpl/{name}")
+        git_save(src, tag="v1")
+        with Worker(str(src), dst, defaults=True) as worker:
+            worker.run_copy()
+            template_root = worker.template.local_abspath
+            assert (template_root / "tpl" / "used" / "used.txt").is_file()
+            assert not (template_root / "tpl" / "vendor" / "huge.txt").exists()
+    assert (dst / "used" / "used.txt").read_text() == "used"
+    assert (dst / "hello.txt").read_text() == "hello"
+    assert not (dst / "vendor").exists()
+
+
+def test_submodules_for_tasks_and_includes(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    src, dst, scripts, shared = map(
+        tmp_path_factory.mktemp, ("src", "dst", "scripts", "shared")
+    )
+    build_file_tree(
+        {
+            scripts / "x.txt": "hello",
+            shared / "questions.yml": "greeting: hi",
+            src / "copier.yml": """\
+                _subdirectory: tpl
+                _tasks:
+                    - cat {{ _copier_conf.src_path }}/scripts/x.txt > task.txt
+                ---
+                !include shared/questions.yml
+                """,
+            src / "tpl" / "greeting.txt.jinja": "{{ greeting }}",
+        }
+    )
+    submodules = {"scripts": scripts, "shared": shared}
+    for repo in submodules.values():
+        git_save(repo)
+    # Allow cloning local submodules
+    with local.env(
+        GIT_CONFIG_COUNT="1",
+        GIT_CONFIG_KEY_0="protocol.file.allow",
+        GIT_CONFIG_VALUE_0="always",
+    ):
+        with local.cwd(src):
+            git("init")
+            for name, repo in submodules.items():
+                git("submodule", "add", repo, name)
+        git_save(src, tag="v1")
+        run_copy(str(src), dst, defaults=True, unsafe=True)
+    assert (dst / "greeting.txt").read_text() == "hi"
+    assert (dst / "task.txt").read_text() == "hello"
+
+
+def test_count_git_processes(tmp_path: Path) -> None:
+    git("init", tmp_path)
+    with count_git_processes() as outer:
+        get_git()("version")
+        with count_git_processes() as inner:
+            get_git(tmp_path)("status")
+            get_git()("-c", "core.quotePath=false", "-C", tmp_path, "status")
+    get_git()("version")
+    assert outer == {"version": 1, "status": 2}
+    assert inner == {"status": 2}
+
+
+def test_git_objects(tmp_path: Path) -> None:
+    build_file_tree({tmp_path / "a.txt": "a", tmp_path / "b.txt": "b"})
+    git_save(tmp_path)
+    with count_git_processes() as processes, GitObjects(tmp_path) as objects:
+        assert objects.read_blob("HEAD:a.txt") == b"a"
+        assert objects.read_blob("HEAD:b.txt") == b"b"
+        with pytest.raises(KeyError):
+            objects.read_blob("HEAD:missing.txt")
+        with pytest.raises(KeyError):
+            objects.read_blob("HEAD")
+        assert objects.read_blob("HEAD:a.txt") == b"a"
+    # All objects are read by the same process
+    assert processes == {"cat-file": 1}
+
+
+@pytest.mark.parametrize(
+    "backend_name",
+    [
+        "cli",
+        pytest.param(
+            "dulwich",
+            marks=pytest.mark.skipif(
+                not importlib.util.find_spec("dulwich"),
+                reason="Dulwich is not installed",
+            ),
+        ),
+    ],
+)
+def test_git_backends(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, backend_name: str
+) -> None:
+    repo = tmp_path / "repo"
+    build_file_tree({repo / "a.txt": "1\n2\n3\n"})
+    git_save(repo, tag="v1")
+    monkeypatch.setenv("COPIER_GIT_BACKEND", backend_name)
+    backend = get_git_backend()
+    assert backend.name == backend_name
+    head = git("-C", repo, "rev-parse", "HEAD").strip()
+    assert backend.tags(repo) == ["v1"]
+    assert backend.describe(repo) == "v1"
+    assert backend.rev_parse(repo) == head
+    assert backend.rev_parse(repo, "v1") == head
+    assert backend.status(repo) == ""
+    (repo / "a.txt").write_text("1\n2\n3\n4\n")
+    (repo / "b.txt").write_text("b")
+    assert backend.status(repo).splitlines() == [" M a.txt", "?? b.txt"]
+    git("-C", repo, "add", "a.txt")
+    tree = backend.write_tree(repo)
+    assert tree == git("-C", repo, "write-tree").strip()
+    diff = backend.diff_tree(repo, "HEAD", tree, "--unified=1")
+    assert "+4" in diff
+    git("-C", repo, "reset", "--hard")
+    backend.apply(repo, diff)
+    assert (repo / "a.txt").read_text() == "1\n2\n3\n4\n"
+    (tmp_path / "base.txt").write_text("1\n2\n3\n")
+    (tmp_path / "other.txt").write_text("0\n1\n2\n3\n")
+    backend.merge_file(
+        repo, "a.txt", tmp_path / "base.txt", tmp_path / "other.txt", ("a", "b", "c")
+    )
+    assert (repo / "a.txt").read_text() == "0\n1\n2\n3\n4\n"
+    clone_dir = tmp_path / "clone"
+    backend.clone(str(repo), clone_dir, "--no-checkout")
+    assert backend.rev_parse(clone_dir) == head
+
+
+def test_dulwich_backend_falls_back_to_cli(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pytest.importorskip("dulwich")
+    repo = tmp_path / "repo"
+    build_file_tree({repo / "a.txt": "a"})
+    git_save(repo, tag="v1")
+    monkeypatch.setenv("COPIER_GIT_BACKEND", "dulwich")
+    backend = get_git_backend()
+
+    def _open(repo: Path) -> None:
+        raise NotImplementedError("Unsupported index extension")
+
+    # Whatever Dulwich fails to read, Git reads instead
+    monkeypatch.setattr(backend, "_open", _open)
+    git("-C", repo, "add", "a.txt")
+    assert backend.write_tree(repo) == git("-C", repo, "write-tree").strip()
+    assert backend.status(repo) == ""
+    assert backend.tags(repo) == ["v1"]
+
+
+def test_unknown_git_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("COPIER_GIT_BACKEND", "unknown")
+    with pytest.raises(UserMessageError, match="Unknown Git backend"):
+        get_git_backend()